@@ -111,6 +111,14 @@ def cleaning_process_summary(metadata: dict) -> str:
     return "\n".join(summary)
 
 
+def format_bytes(size: int) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{round(size, 2)} {unit}"
+        size /= 1024
+    return f"{round(size, 2)} GB"
+
+
 def generate_cleaning_result_summary(original_df, cleaned_df) -> str:
     summary = []
 
@@ -144,6 +152,17 @@ def generate_cleaning_result_summary(original_df, cleaned_df) -> str:
             + "\n  - ".join(type_changes)
         )
 
+    # Memory compaction
+    compaction = cleaned_df.attrs.get("compaction")
+    if compaction:
+        before = compaction["before_bytes"]
+        after = compaction["after_bytes"]
+        saved_pct = round((1 - after / before) * 100, 1) if before else 0.0
+        summary.append(
+            f"- Compacted memory usage from {format_bytes(before)} "
+            f"to {format_bytes(after)} ({saved_pct}% smaller)."
+        )
+
     if len(summary) == 1:
         summary.append("- No structural changes detected.")
 
@@ -212,7 +231,7 @@ def generate_sql_summary(metadata: dict) -> str:
 
 def generate_viz_summary(df) -> str:
     numeric_cols = df.select_dtypes(include="number").columns.tolist()
-    categorical_cols = df.select_dtypes(include="object").columns.tolist()
+    categorical_cols = df.select_dtypes(include=["object", "string", "category"]).columns.tolist()
     datetime_cols = df.select_dtypes(include="datetime").columns.tolist()
 
     lines = [
@@ -1,19 +1,44 @@
+import functools
+import os
+
 import streamlit as st
-import pandas as pd
 
-from profiling.profiler import (profile_dataset, generate_profile_report)
-from cleaner.cleaner import clean_dataset
-from sql.sql_generator import generate_sql_queries
-from visualization.visual_assets import generate_visualizations
-from visualization.exporter import export_dashboard_html
+from profiling.profiler import profile_dataset
+from profiling.streaming import profile_chunks
+from profiling.fingerprint import row_fingerprints
+from profiling.incremental import profile_incremental
+from profiling.report import report_truncated
+from sql.sql_generator import (
+    DEFAULT_SAMPLE_PERCENT,
+    SQL_DIALECTS,
+    generate_sql_queries,
+    generate_sql_statements,
+)
+from sql.executor import QueryExecutor
 from ai.rule_based_summary import (
     generate_dataset_summary,
     cleaning_process_summary,
-    generate_cleaning_result_summary,
     generate_profile_summary,
     generate_sql_summary,
     generate_viz_summary,   
 )
+from storage.artifact_store import ArtifactStore
+from storage.dataset_cache import DatasetCache, hash_bytes
+from data_io.csv_reader import csv_header, dtype_hints
+from data_io.formats import (
+    CSV_COMPRESSIONS,
+    EXPORT_FORMATS,
+    UPLOAD_TYPES,
+    export_dataset,
+    file_format,
+    iter_dataframes,
+    read_dataset,
+    read_schema,
+)
+from jobs.runner import JobRunner, DONE, is_finished
+from jobs.tasks import clean_task, profile_report_task, visualization_task
+from visualization.registry import FigureRegistry
+from visualization.visual_assets import figure_specs
 
 st.set_page_config(
     page_title="Automated Data Analysis Tool",
@@ -25,23 +50,198 @@ defaults = {
     "show_cleaning_summary": False,
     "cleaning_completed": False,
     "cleaned_df": None,
+    "cleaned_metadata": None,
     "cleaning_result_summary": None,
     "current_file_name": None,
     "profile_report_html": None,
     "show_profile_summary": False,
     "profile_completed": False,
     "sql_queries": None,
+    "sql_statements": None,
+    "sql_executed": False,
+    "sql_table_name": None,
     "show_sql_summary": False,
     "sql_completed": False,
     "show_viz_summary": False,
     "viz_completed": False,
-    "viz_figures": None,
-    "viz_dashboard_html": None,
+    "viz_specs": None,
+    "viz_dashboard_path": None,
+    "dataset_file_id": None,
+    "dataset_key": None,
+    "cleaned_key": None,
+    "incremental_key": None,
+    "cleaning_reused_rows": 0,
+    "csv_hints": {},
+    "cache_keys": [],
+    "clean_job": None,
+    "profile_job": None,
+    "viz_job": None,
+    "job_error": None,
 }
 for k, v in defaults.items():
     if k not in st.session_state:
         st.session_state[k] = v
 
+
+
+@st.cache_resource
+def get_dataset_cache():
+    # Shared across sessions; optional disk tier via DATASET_CACHE_DIR
+    return DatasetCache(
+        max_bytes=int(os.environ.get("DATASET_CACHE_MAX_MB", 4096)) * 1024 ** 2,
+        disk_dir=os.environ.get("DATASET_CACHE_DIR"),
+    )
+
+
+dataset_cache = get_dataset_cache()
+
+
+@st.cache_resource
+def get_artifact_store():
+    # Reports, dashboards, SQL and cleaned data on disk, shared across sessions and restarts
+    return ArtifactStore(
+        os.environ.get("ARTIFACT_STORE_DIR", ".artifacts"),
+        max_bytes=int(os.environ.get("ARTIFACT_STORE_MAX_MB", 2048)) * 1024 ** 2,
+    )
+
+
+artifact_store = get_artifact_store()
+
+
+@st.cache_resource
+def get_job_runner():
+    # One background process pool shared by every session on the server
+    return JobRunner(max_workers=int(os.environ.get("JOB_WORKERS", 2)))
+
+
+job_runner = get_job_runner()
+
+
+@st.cache_resource
+def get_figure_registry():
+    # Built figures keyed by (dataset, column, chart type), shared across sessions
+    return FigureRegistry(max_entries=int(os.environ.get("FIGURE_CACHE_ENTRIES", 256)))
+
+
+figure_registry = get_figure_registry()
+
+
+@st.cache_resource
+def get_query_executor():
+    # DuckDB results cached per (dataset, query), shared across sessions
+    return QueryExecutor()
+
+
+query_executor = get_query_executor()
+JOB_KEYS = ("clean_job", "profile_job", "viz_job")
+
+
+def _incremental_key(df):
+    # Incremental state is shared by every upload with the same columns
+    return "incremental:" + hash_bytes("\0".join(map(str, df.columns)).encode())
+
+
+def _save_artifact(pending_key, value):
+    # Store a finished job's output under the artifact recorded at submit time
+    pending = st.session_state.pop(pending_key, None)
+    if pending is not None:
+        dataset_key, operation, params = pending
+        artifact_store.put(dataset_key, operation, value, params)
+
+
+def on_clean_done(result):
+    cleaned_df, result_summary, cleaned_metadata, cleaning_state = result
+    _save_artifact("clean_artifact", (cleaned_df, result_summary, cleaned_metadata))
+    if cleaning_state is not None:
+        # Kept outside the upload's entries so the next version of the file finds it
+        key = st.session_state["incremental_key"]
+        dataset_cache.put(key, {**(dataset_cache.get(key) or {}), "cleaning": cleaning_state})
+        st.session_state["cleaning_reused_rows"] = cleaning_state.reused_rows
+    else:
+        st.session_state["cleaning_reused_rows"] = 0
+    st.session_state["cleaned_df"] = cleaned_df
+    st.session_state["cleaned_metadata"] = cleaned_metadata
+    st.session_state["cleaning_result_summary"] = result_summary
+    st.session_state["cleaning_completed"] = True
+    st.session_state["show_cleaning_summary"] = False
+    st.toast("Dataset cleaned successfully.")
+
+
+def on_profile_done(html_report):
+    if report_truncated(html_report):
+        # What a budget-limited report contains depends on server load
+        st.session_state.pop("profile_artifact", None)
+    else:
+        _save_artifact("profile_artifact", html_report)
+    st.session_state["profile_report_html"] = html_report
+    st.session_state["profile_completed"] = True
+    st.session_state["show_profile_summary"] = False
+    st.toast("Profiling report generated successfully.")
+
+
+def _read_file(path):
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+def on_viz_done(dashboard_path):
+    # The job streamed the page into a spool file; move it into the store
+    # and serve the stored copy
+    pending = st.session_state.pop("viz_artifact", None)
+    if pending is not None:
+        dataset_key, operation, params = pending
+        if artifact_store.put_file(dataset_key, operation, dashboard_path, params) is None:
+            # Over the store's per-artifact limit; put_file deleted the file
+            st.session_state["job_error"] = (
+                "Dashboard export: the dashboard is larger than the artifact store allows"
+            )
+            return
+        dashboard_path = artifact_store.get_path(dataset_key, operation, params)
+    st.session_state["viz_dashboard_path"] = dashboard_path
+    st.toast("Visual dashboard exported successfully.")
+
+
+@st.fragment(run_every=1.0)
+def job_progress(job_key, on_done):
+    """
+    Poll a background job, show its progress with a cancel button, and hand
+    the finished artifact to on_done before rerunning the page.
+    """
+
+    job_id = st.session_state[job_key]
+    if job_id is None:
+        return
+
+    status = job_runner.status(job_id)
+    if not is_finished(status):
+        st.progress(status["progress"], text=status["message"] or status["state"])
+        if st.button("Cancel", key=f"cancel_{job_key}"):
+            job_runner.cancel(job_id)
+        return
+
+    st.session_state[job_key] = None
+    if status["state"] == DONE:
+        on_done(job_runner.result(job_id))
+    else:
+        st.session_state["job_error"] = f"{status['label']}: {status['message']}"
+    job_runner.forget(job_id)
+    st.rerun()
+
+
+# Uploads above this size are profiled out-of-core by default
+STREAMING_THRESHOLD_MB = int(os.environ.get("STREAMING_THRESHOLD_MB", 1024))
+STREAMING_CHUNK_ROWS = 100_000
+STREAMING_SAMPLE_ROWS = 200_000
+
+# Time budget (seconds) for the native profiling report, checked between steps
+PROFILE_TIME_BUDGET = float(os.environ.get("PROFILE_TIME_BUDGET", 10))
+
+# Process-pool size for per-column type inference (-1 uses every core)
+CLEANING_WORKERS = int(os.environ.get("CLEANING_WORKERS", 1))
+
+# Process-pool size for serializing charts in the dashboard export
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", 1))
+
 st.markdown(
     """
     <style>
@@ -146,35 +346,156 @@ with center:
     )
 
     uploaded_file = st.file_uploader(
-        "Upload CSV",
-        type=["csv"],
+        "Upload CSV, Parquet or Arrow/Feather",
+        type=UPLOAD_TYPES,
         label_visibility="collapsed"
     )
 
 
 if uploaded_file is not None:
     if uploaded_file.name != st.session_state["current_file_name"]:
+        # The cache is shared by every session: only drop what this session loaded
+        for key in st.session_state["cache_keys"]:
+            dataset_cache.discard(key)
+        st.session_state["cache_keys"] = []
         st.session_state["current_file_name"] = uploaded_file.name
         st.session_state["active_action"] = None
-        st.session_state["current_file_name"] = uploaded_file.name
         st.session_state["show_cleaning_summary"] = False
         st.session_state["cleaning_completed"] = False
         st.session_state["cleaned_df"] = None
+        st.session_state["cleaned_metadata"] = None
         st.session_state["cleaning_result_summary"] = None
         st.session_state["show_profile_summary"] = False
         st.session_state["profile_completed"] = False
         st.session_state["profile_report_html"] = None
         st.session_state["show_viz_summary"] = False
         st.session_state["viz_completed"] = False
-        st.session_state["viz_figures"] = None
+        st.session_state["viz_specs"] = None
+        st.session_state["viz_dashboard_path"] = None
+        st.session_state["cleaned_key"] = None
+        st.session_state["sql_executed"] = False
+        for job_key in JOB_KEYS:
+            if st.session_state[job_key] is not None:
+                # Forgotten too, or the runner would keep the result for good
+                job_runner.cancel(st.session_state[job_key])
+                job_runner.forget(st.session_state[job_key])
+                st.session_state[job_key] = None
+
+    # Hash the upload once per file; reruns reuse the key
+    if uploaded_file.file_id != st.session_state["dataset_file_id"]:
+        st.session_state["dataset_file_id"] = uploaded_file.file_id
+        st.session_state["dataset_key"] = hash_bytes(uploaded_file.getbuffer())
+
+    streaming = st.toggle(
+        "Streaming mode (profile in chunks, work on a sample)",
+        value=uploaded_file.size > STREAMING_THRESHOLD_MB * 1024 ** 2,
+    )
 
-    df = pd.read_csv(uploaded_file)
+    # Exact distinct counts and duplicate detection keep one hash per value
+    # and per row, so only sketches keep streaming memory bounded
+    sketch = st.toggle(
+        "Approximate distinct counts (HyperLogLog / top-k sketches)",
+        value=streaming,
+        help="Exact counts keep 8 bytes per distinct value and per row in memory, "
+             "even in streaming mode; sketches use a fixed amount per column.",
+    )
 
-    # Profile dataset
-    metadata = profile_dataset(df)
+    # Exact, in-memory runs only: appended rows are detected by row fingerprints
+    incremental = st.toggle(
+        "Incremental mode (only process rows appended since the last run)",
+        value=False,
+        disabled=streaming or sketch,
+    ) and not (streaming or sketch)
+
+    # Columnar files can be read column by column, so let the user project
+    upload_format = file_format(uploaded_file.name)
+    load_columns = None
+    if upload_format != "csv":
+        all_columns = read_schema(uploaded_file, upload_format)
+        selected = st.multiselect("Columns to load", all_columns, default=all_columns)
+        if selected and len(selected) < len(all_columns):
+            load_columns = selected
+
+    dataset_key = (
+        st.session_state["dataset_key"]
+        + (":stream" if streaming else "")
+        + (":sketch" if sketch else "")
+        + (":cols-" + hash_bytes("\0".join(load_columns).encode()) if load_columns else "")
+    )
+    cached = dataset_cache.get(dataset_key)
+    if dataset_key not in st.session_state["cache_keys"]:
+        st.session_state["cache_keys"].append(dataset_key)
+
+    if cached is None:
+        reused_rows = 0
+        if streaming:
+            # Metadata covers the whole file; actions run on a bounded sample
+            metadata = profile_chunks(
+                iter_dataframes(uploaded_file, upload_format, STREAMING_CHUNK_ROWS, load_columns),
+                sketch=sketch,
+            )
+            df = read_dataset(
+                uploaded_file, upload_format, columns=load_columns, nrows=STREAMING_SAMPLE_ROWS
+            )
+            fingerprints = row_fingerprints(df)
+        else:
+            # Column types from this session's earlier profile of the same
+            # file skip Arrow's type inference, if the header is unchanged
+            hints = None
+            if upload_format == "csv":
+                header = csv_header(uploaded_file)
+                previous = st.session_state["csv_hints"].get(uploaded_file.name)
+                if previous is not None and previous[0] == header:
+                    hints = previous[1]
+            df = read_dataset(
+                uploaded_file, upload_format, columns=load_columns, dtype_hints=hints,
+            )
 
-    # Generate rule-based summary
-    summary = generate_dataset_summary(metadata)
+            # Profile dataset
+            fingerprints = row_fingerprints(df)
+            if incremental:
+                incremental_key = _incremental_key(df)
+                states = dataset_cache.get(incremental_key) or {}
+                metadata, profile_state = profile_incremental(df, fingerprints, states.get("profile"))
+                dataset_cache.put(incremental_key, {**states, "profile": profile_state})
+                reused_rows = profile_state.reused_rows
+            else:
+                metadata = profile_dataset(df, sketch=sketch, fingerprints=fingerprints)
+
+        if upload_format == "csv" and not streaming:
+            st.session_state["csv_hints"][uploaded_file.name] = (header, dtype_hints(metadata))
+
+        # Generate rule-based summary
+        summary = generate_dataset_summary(metadata)
+
+        dataset_cache.put(
+            dataset_key,
+            {
+                "df": df,
+                "metadata": metadata,
+                "summary": summary,
+                "fingerprints": fingerprints,
+                "reused_rows": reused_rows,
+            },
+        )
+    else:
+        df = cached["df"]
+        metadata = cached["metadata"]
+        summary = cached["summary"]
+        fingerprints = cached.get("fingerprints")
+        reused_rows = cached.get("reused_rows", 0)
+
+    if reused_rows:
+        st.caption(
+            f"Incremental mode: profiled {len(df) - reused_rows} appended rows, "
+            f"reused the previous profile of {reused_rows} rows."
+        )
+
+    if streaming:
+        st.caption(
+            f"Streaming mode: the summary covers all {metadata['dataset']['row_count']} rows; "
+            f"cleaning, profiling reports and charts use the first {len(df)} rows."
+        )
 
     st.divider()
 
@@ -218,12 +539,18 @@ if uploaded_file is not None:
             st.session_state["active_action"] = "sql"
             st.session_state["show_sql_summary"] = True
             st.session_state["sql_completed"] = False
+            st.session_state["sql_executed"] = False
 
     with b4:
         if st.button("Visualize Data", width="stretch"):
             st.session_state["active_action"] = "visualize"
             st.session_state["show_viz_summary"] = True
             st.session_state["viz_completed"] = False
+            st.session_state["viz_dashboard_path"] = None
+
+    if st.session_state["job_error"]:
+        st.warning(st.session_state["job_error"])
+        st.session_state["job_error"] = None
 
     if st.session_state["active_action"] == "clean":
 
@@ -232,24 +559,47 @@ if uploaded_file is not None:
             st.markdown("### AI Explanation (Before Cleaning)")
             st.info(cleaning_process_summary(metadata))
 
-            if st.button("Proceed with Cleaning", width="stretch"):
-                with st.spinner("Cleaning dataset..."):
-                    cleaned_df = clean_dataset(df)
-
-                st.session_state["cleaned_df"] = cleaned_df
-                st.session_state["cleaning_completed"] = True
-                st.session_state["show_cleaning_summary"] = False
+            compact = st.checkbox(
+                "Compact memory (downcast numbers, store repeated text as categories)"
+            )
 
-                st.session_state["cleaning_result_summary"] = (
-                    generate_cleaning_result_summary(df, cleaned_df)
-                )
+            if st.session_state["clean_job"] is None:
+                if st.button("Proceed with Cleaning", width="stretch"):
+                    st.session_state["cleaned_key"] = dataset_key + (":clean-compact" if compact else ":clean")
+                    stored = artifact_store.get(dataset_key, "clean", {"compact": compact})
+                    if stored is not None:
+                        # Already stored; drop any key left by a cancelled job
+                        st.session_state["clean_artifact"] = None
+                        on_clean_done((*stored, None))
+                        st.rerun()
+
+                    previous = None
+                    if incremental:
+                        st.session_state["incremental_key"] = _incremental_key(df)
+                        previous = (dataset_cache.get(st.session_state["incremental_key"]) or {}).get("cleaning")
+                    st.session_state["clean_artifact"] = (dataset_key, "clean", {"compact": compact})
+                    st.session_state["clean_job"] = job_runner.submit(
+                        clean_task,
+                        df,
+                        n_jobs=CLEANING_WORKERS,
+                        compact=compact,
+                        incremental=incremental,
+                        previous=previous,
+                        fingerprints=fingerprints,
+                        label="Cleaning",
+                    )
 
-                st.success("Dataset cleaned successfully.")
+            job_progress("clean_job", on_clean_done)
 
         # ---- Post-clean AI log
         if st.session_state["cleaning_completed"]:
             st.markdown("### AI Cleaning Log (What Changed)")
             st.info(st.session_state["cleaning_result_summary"])
+            if st.session_state["cleaning_reused_rows"]:
+                st.caption(
+                    f"Incremental mode: reused the cleaned result of the first "
+                    f"{st.session_state['cleaning_reused_rows']} rows."
+                )
 
             st.markdown("### Preview of Cleaned Dataset")
 
@@ -258,13 +608,31 @@ if uploaded_file is not None:
                 width="stretch",
                 height=400
             )
-            csv = st.session_state["cleaned_df"].to_csv(index=False).encode("utf-8")
+            export_format = st.selectbox(
+                "Download format",
+                list(EXPORT_FORMATS),
+                help="parquet and feather keep column types and load much faster than csv",
+            )
+            extension, mime = EXPORT_FORMATS[export_format]
 
+            compression = None
+            if export_format == "csv":
+                compression = st.selectbox(
+                    "Compression", list(CSV_COMPRESSIONS), format_func=lambda option: option or "none"
+                )
+                suffix, mime = CSV_COMPRESSIONS[compression]
+                extension += suffix
+
+            # Deferred: the file is encoded in chunks when the button is clicked,
+            # not on every rerun of this page. Streamlit then serves it from
+            # memory, so the whole encoded file is held once per download
             st.download_button(
                 label="Download Cleaned Dataset",
-                data=csv,
-                file_name="cleaned_dataset.csv",
-                mime="text/csv",
+                data=functools.partial(
+                    export_dataset, st.session_state["cleaned_df"], export_format, compression
+                ),
+                file_name="cleaned_dataset" + extension,
+                mime=mime,
                 width="stretch",
             )
     
@@ -275,15 +643,38 @@ if uploaded_file is not None:
             st.markdown("### AI Explanation (Before Profiling)")
             st.info(generate_profile_summary(metadata))
 
-            if st.button("Proceed with Profiling", width="stretch"):
-                with st.spinner("Generating profiling report..."):
-                    html_report = generate_profile_report(df)
+            report_tier = st.selectbox(
+                "Report detail",
+                ["sampled", "minimal", "full", "ydata (slow, most detailed)"],
+                help="minimal: metadata only · sampled: distributions from a row sample · "
+                     "full: every row plus correlations",
+            )
 
-                st.session_state["profile_report_html"] = html_report
-                st.session_state["profile_completed"] = True
-                st.session_state["show_profile_summary"] = False
+            if st.session_state["profile_job"] is None:
+                if st.button("Proceed with Profiling", width="stretch"):
+                    if report_tier.startswith("ydata"):
+                        report_options = {"engine": "ydata"}
+                    else:
+                        report_options = {
+                            "metadata": metadata,
+                            "tier": report_tier,
+                            "time_budget": PROFILE_TIME_BUDGET,
+                        }
+                    # metadata is derived from the dataset, so it is not part of the key
+                    params = {k: v for k, v in report_options.items() if k != "metadata"}
+                    stored = artifact_store.get(dataset_key, "profile_report", params)
+                    if stored is not None:
+                        # Already stored; drop any key left by a cancelled job
+                        st.session_state["profile_artifact"] = None
+                        on_profile_done(stored)
+                        st.rerun()
+
+                    st.session_state["profile_artifact"] = (dataset_key, "profile_report", params)
+                    st.session_state["profile_job"] = job_runner.submit(
+                        profile_report_task, df, label="Profiling", **report_options
+                    )
 
-                st.success("Profiling report generated successfully.")
+            job_progress("profile_job", on_profile_done)
 
         # ---- Post-profile AI log + download
         if st.session_state["profile_completed"]:
@@ -304,20 +695,55 @@ if uploaded_file is not None:
     
     if st.session_state["active_action"] == "sql":
 
+        # Prefer the cleaned dataset, so the schema matches the CSV offered for download
+        sql_df, sql_key, sql_metadata = df, dataset_key, metadata
+        # Bulk-load statements read CSV
+        load_file = uploaded_file.name if upload_format == "csv" else None
+        if st.session_state["cleaned_df"] is not None:
+            sql_df = st.session_state["cleaned_df"]
+            sql_key = st.session_state["cleaned_key"]
+            sql_metadata = st.session_state["cleaned_metadata"]
+            load_file = "cleaned_dataset.csv"
+
         table_name = st.text_input("Table name", value="dataset")
-        sql_dialect = st.selectbox("SQL Engine", ["ANSI", "PostgreSQL", "MySQL"])
+        sql_dialect = st.selectbox("SQL Engine", SQL_DIALECTS)
+        sql_mode = st.selectbox(
+            "Query layout",
+            ["batched", "per_column", "approximate"],
+            help="batched: missing values and numeric stats for every column in a single table scan · "
+                 "per_column: one query per check, easier to read · "
+                 "approximate: the batched scan and top-k frequencies on a table sample, "
+                 "for very large tables",
+        )
+        sample_percent = DEFAULT_SAMPLE_PERCENT
+        if sql_mode == "approximate":
+            sample_percent = st.number_input(
+                "Sample percent", min_value=0.01, max_value=100.0,
+                value=float(DEFAULT_SAMPLE_PERCENT), step=0.5,
+            )
 
         if st.session_state["show_sql_summary"] and not st.session_state["sql_completed"]:
             st.markdown("### AI Explanation (Before SQL Generation)")
-            st.info(generate_sql_summary(metadata))
+            st.info(generate_sql_summary(sql_metadata))
 
             if st.button("Proceed with SQL Generation", width="stretch"):
-                sql_text = generate_sql_queries(
-                    metadata,
-                    table_name=table_name,
-                    dialect=sql_dialect
+                sql_options = {
+                    "table_name": table_name, "dialect": sql_dialect,
+                    "mode": sql_mode, "sample_percent": sample_percent,
+                }
+                statements, queries = artifact_store.get_or_compute(
+                    sql_key,
+                    "sql",
+                    lambda: (
+                        generate_sql_statements(sql_metadata, **sql_options),
+                        generate_sql_queries(sql_metadata, load_file=load_file, **sql_options),
+                    ),
+                    {**sql_options, "load_file": load_file},
                 )
-                st.session_state["sql_queries"] = sql_text
+                st.session_state["sql_statements"] = statements
+                st.session_state["sql_table_name"] = table_name
+                st.session_state["sql_queries"] = queries
+                st.session_state["sql_executed"] = False
                 st.session_state["sql_completed"] = True
                 st.session_state["show_sql_summary"] = False
 
@@ -327,7 +753,8 @@ if uploaded_file is not None:
             st.markdown("### AI SQL Log")
             st.info(
                 f"Generated SQL for **{sql_dialect}** using table name **{table_name}**. "
-                "Includes schema, missing value checks, and EDA queries."
+                "Includes schema, a bulk-load statement for PostgreSQL/MySQL/DuckDB, "
+                "missing value checks, and EDA queries."
             )
 
             st.code(st.session_state["sql_queries"], language="sql")
@@ -340,36 +767,105 @@ if uploaded_file is not None:
                 width="stretch"
             )
 
+            if st.button("Run Queries on This Dataset (DuckDB)", width="stretch"):
+                st.session_state["sql_executed"] = True
+
+            if st.session_state["sql_executed"]:
+                if streaming:
+                    st.caption(f"Results are computed on the first {len(df)} rows loaded in streaming mode.")
+
+                # The dataset stands in for the table, so the schema statement is skipped
+                with st.spinner("Running queries..."):
+                    outcomes = query_executor.run(
+                        sql_key,
+                        sql_df,
+                        st.session_state["sql_statements"][1:],
+                        table_name=st.session_state["sql_table_name"],
+                    )
+
+                for title, sql, result, error in outcomes:
+                    with st.expander(title):
+                        st.code(sql, language="sql")
+                        if error:
+                            st.error(error)
+                        elif result is not None:
+                            st.dataframe(result, width="stretch")
+
     if st.session_state["active_action"] == "visualize":
 
+        # Prefer the cleaned dataset when one exists
+        viz_df = st.session_state["cleaned_df"]
+        viz_key = st.session_state["cleaned_key"]
+        if viz_df is None:
+            viz_df, viz_key = df, dataset_key
+
         if st.session_state["show_viz_summary"] and not st.session_state["viz_completed"]:
             st.markdown("### AI Explanation (Before Visualization)")
-            st.info(generate_viz_summary(st.session_state["cleaned_df"] or df))
+            st.info(generate_viz_summary(viz_df))
 
             if st.button("Generate Visualizations", width="stretch"):
-                with st.spinner("Generating visualizations..."):
-                    figs = generate_visualizations(
-                        st.session_state["cleaned_df"] or df
-                    )
-                st.session_state["viz_figures"] = figs
-                st.session_state["viz_dashboard_html"] = export_dashboard_html(figs)
+                # Only specs are listed here; each figure is built when its panel opens
+                st.session_state["viz_specs"] = figure_specs(viz_df)
                 st.session_state["viz_completed"] = True
                 st.session_state["show_viz_summary"] = False
-
-                st.success("Visual dashboard generated successfully.")
+                st.rerun()
 
         if st.session_state["viz_completed"]:
             st.markdown("### Visual Insights")
 
-            for fig in st.session_state["viz_figures"].values():
-                st.plotly_chart(fig, width="stretch")
-            st.download_button(
-                label="Download Visualization Dashboard (HTML)",
-                data=st.session_state["viz_dashboard_html"],
-                file_name="visualization_dashboard.html",
-                mime="text/html",
-                width="stretch"
-            )
+            for position, spec in enumerate(st.session_state["viz_specs"]):
+                panel = st.expander(
+                    spec.title,
+                    expanded=position == 0,
+                    key=f"viz_panel_{spec.key}",
+                    on_change="rerun",
+                )
+                if panel.open:
+                    with panel:
+                        st.plotly_chart(
+                            figure_registry.get(viz_key, viz_df, spec),
+                            width="stretch",
+                            key=f"viz_chart_{spec.key}",
+                        )
+
+            if st.session_state["viz_dashboard_path"] is None:
+                if st.session_state["viz_job"] is None:
+                    compact_export = st.checkbox(
+                        "Compact export (shared compressed data, charts load on scroll)",
+                        value=True,
+                    )
+                    if st.button("Prepare Dashboard Export", width="stretch"):
+                        params = {"compact": compact_export}
+                        stored = artifact_store.get_path(viz_key, "dashboard", params)
+                        if stored is not None:
+                            # Already stored; drop any key left by a cancelled job
+                            st.session_state["viz_artifact"] = None
+                            on_viz_done(stored)
+                            st.rerun()
+
+                        st.session_state["viz_artifact"] = (viz_key, "dashboard", params)
+                        st.session_state["viz_job"] = job_runner.submit(
+                            visualization_task,
+                            viz_df,
+                            artifact_store.spool_path(".html"),
+                            n_jobs=EXPORT_WORKERS,
+                            compact=compact_export,
+                            label="Dashboard export",
+                        )
+
+                job_progress("viz_job", on_viz_done)
+            elif not os.path.exists(st.session_state["viz_dashboard_path"]):
+                # Evicted from the artifact store since it was exported
+                st.session_state["viz_dashboard_path"] = None
+                st.rerun()
+            else:
+                st.download_button(
+                    label="Download Visualization Dashboard (HTML)",
+                    data=functools.partial(_read_file, st.session_state["viz_dashboard_path"]),
+                    file_name="visualization_dashboard.html",
+                    mime="text/html",
+                    width="stretch"
+                )
 st.markdown(
     """
     <div class="app-footer">
@@ -0,0 +1,74 @@
+'''
+Benchmark: serial vs process-pool type inference in clean_dataset
+on a wide synthetic dataset.
+
+Run from the repository root:
+    python -m benchmarks.bench_cleaner_parallel --rows 20000 --cols 320
+'''
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from cleaner.cleaner import clean_dataset
+
+
+def make_wide_dataset(rows: int, cols: int, seed=0) -> pd.DataFrame:
+    """
+    Build a string-typed frame mixing numeric-like, date-like and text columns,
+    the way a raw CSV with no dtype hints arrives.
+    """
+
+    rng = np.random.default_rng(seed)
+    data = {}
+
+    for i in range(cols):
+        kind = i % 3
+        if kind == 0:
+            values = rng.normal(100, 15, rows).round(2).astype(str)
+        elif kind == 1:
+            days = rng.integers(0, 3650, rows)
+            values = (np.datetime64("2015-01-01") + days).astype(str)
+        else:
+            values = rng.choice(["Alpha ", "beta", " GAMMA", "delta"], rows)
+
+        values = values.astype(object)
+        values[rng.random(rows) < 0.05] = "n/a"
+        data[f"Column {i}"] = values
+
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--cols", type=int, default=320)
+    parser.add_argument("--workers", type=int, nargs="*", default=None)
+    args = parser.parse_args()
+
+    df = make_wide_dataset(args.rows, args.cols)
+    cpus = os.cpu_count() or 1
+    workers = args.workers or sorted({1, 2, 4, cpus})
+
+    print(f"Dataset: {args.rows} rows x {args.cols} columns, {cpus} CPUs")
+
+    baseline = None
+    for n_jobs in workers:
+        start = time.perf_counter()
+        cleaned = clean_dataset(df, n_jobs=n_jobs)
+        elapsed = time.perf_counter() - start
+
+        if baseline is None:
+            baseline = (elapsed, cleaned)
+            speedup = 1.0
+        else:
+            speedup = baseline[0] / elapsed
+            assert cleaned.equals(baseline[1]), "parallel output differs from serial"
+
+        print(f"n_jobs={n_jobs:<3} {elapsed:8.2f}s  speedup x{speedup:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+'''
+Benchmark: CSV parsing with pandas' C parser versus the PyArrow reader in
+data_io.csv_reader, with and without dtype hints from a previous profile.
+Each engine runs in a fresh process so its peak RSS is measured alone.
+
+Run from the repository root:
+    python -m benchmarks.bench_csv_engine --rows 2000000
+'''
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_io.csv_reader import dtype_hints, read_csv
+from profiling.profiler import profile_dataset
+
+
+def make_csv(path, rows: int, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "id": np.arange(rows),
+        "amount": rng.normal(100, 25, rows).round(2),
+        "quantity": rng.integers(1, 20, rows),
+        "city": rng.choice(["Delhi", "Mumbai", "Pune", "Chennai", "Kolkata"], rows),
+        "status": rng.choice(["paid", "refunded", "pending", ""], rows),
+        "note": [f"order-{i % 50_000}" for i in range(rows)],
+        "active": rng.choice([True, False], rows),
+    })
+    df.to_csv(path, index=False)
+
+
+def _peak_rss_mb():
+    # VmHWM starts fresh in a spawned child; ru_maxrss survives exec and
+    # would report the parent's peak instead
+    if sys.platform.startswith("linux"):
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    # ru_maxrss is in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 ** 2
+
+
+def run_engine(path, engine, hints):
+    # Child process: import cost is paid before the baseline is taken
+    import pyarrow  # noqa: F401
+
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    df = read_csv(path, hints=hints, engine=engine)
+    elapsed = time.perf_counter() - start
+    memory = df.memory_usage(deep=True).sum() / 1024 ** 2
+    return elapsed, _peak_rss_mb() - baseline, memory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.csv")
+        make_csv(path, args.rows)
+        print(f"CSV: {args.rows} rows, {os.path.getsize(path) / 1024 ** 2:.0f} MB")
+
+        hints = dtype_hints(profile_dataset(pd.read_csv(path, nrows=10_000)))
+
+        for label, engine, engine_hints in (
+            ("c", "c", None),
+            ("pyarrow", "pyarrow", None),
+            ("pyarrow+hints", "pyarrow", hints),
+        ):
+            with context.Pool(1) as pool:
+                elapsed, peak, memory = pool.apply(run_engine, (path, engine, engine_hints))
+            print(
+                f"{label:14s}: parse {elapsed:6.2f}s  "
+                f"peak RSS +{peak:7.0f} MB  DataFrame {memory:6.0f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+'''
+Benchmark: per-column EDA queries versus the batched single-scan mode,
+executed against local SQLite and DuckDB stand-ins for a warehouse table.
+Reports the number of table scans and wall time for each mode.
+
+Run from the repository root:
+    python -m benchmarks.bench_sql_batched --rows 50000 --columns 400
+'''
+import argparse
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from profiling.profiler import profile_dataset
+from sql.sql_generator import generate_sql_statements
+
+
+def make_wide_table(rows: int, columns: int, seed=0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.integers(0, 1000, size=(rows, columns)).astype("float64")
+    values[rng.random(values.shape) < 0.05] = np.nan
+    return pd.DataFrame(values, columns=[f"col_{i}" for i in range(columns)])
+
+
+def profile_statements(metadata, mode):
+    # Only the statements that scan the table: no schema, preview or GROUP BY
+    return [
+        sql for title, sql in generate_sql_statements(metadata, dialect="ANSI", mode=mode)
+        if title.startswith(("Row count", "Missing values", "Stats for"))
+    ]
+
+
+def run_sqlite(df, statements):
+    connection = sqlite3.connect(":memory:")
+    df.to_sql("dataset", connection, index=False)
+
+    start = time.perf_counter()
+    for sql in statements:
+        connection.execute(sql).fetchall()
+    elapsed = time.perf_counter() - start
+
+    connection.close()
+    return elapsed
+
+
+def run_duckdb(df, statements):
+    import duckdb
+
+    connection = duckdb.connect()
+    connection.execute("CREATE TABLE dataset AS SELECT * FROM df")
+
+    start = time.perf_counter()
+    for sql in statements:
+        connection.execute(sql).fetchall()
+    elapsed = time.perf_counter() - start
+
+    connection.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--columns", type=int, default=400)
+    args = parser.parse_args()
+
+    df = make_wide_table(args.rows, args.columns)
+    metadata = profile_dataset(df)
+    print(f"Dataset: {df.shape[0]} rows x {df.shape[1]} columns")
+
+    for mode in ("per_column", "batched"):
+        statements = profile_statements(metadata, mode)
+        sqlite_time = run_sqlite(df, statements)
+        duckdb_time = run_duckdb(df, statements)
+        print(
+            f"{mode:10s}: {len(statements):4d} scans  "
+            f"sqlite {sqlite_time:7.2f}s  duckdb {duckdb_time:6.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
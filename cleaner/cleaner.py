@@ -1,63 +1,311 @@
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
 import numpy as np
+from pandas.tseries.api import guess_datetime_format
+
+from cleaner.compaction import compact_dtypes
+from jobs.runner import resolve_workers
+from profiling.fingerprint import drop_duplicate_rows
+
+
+# Share of values that must parse for a column to take a type
+INFERENCE_THRESHOLD = 0.8
+
+# Columns longer than this are screened on a stratified sample first
+INFERENCE_SAMPLE_SIZE = 2_000
+
+# A type is only ruled out when its sample parse rate misses the threshold
+# by more than this (about 9 standard errors at the default sample size)
+INFERENCE_SAMPLE_MARGIN = 0.1
+
 
+# Tokens treated as missing, matched after trimming whitespace and lowercasing
+MISSING_VALUES = [
+    "", "na", "n/a", "null", "--", "none", "nan",
+    "undefined", " ", "?", "-"
+]
+MISSING_TOKENS = frozenset(token.strip().lower() for token in MISSING_VALUES)
 
-def clean_dataset(df: pd.DataFrame) -> pd.DataFrame:
+
+def missing_token_mask(series: pd.Series) -> np.ndarray:
     """
-    Clean a dataset using rule-based transformations.
-    Returns a cleaned DataFrame.
+    Boolean mask of the string values in series that are missing tokens.
+    Each distinct value is normalized once, then mapped back through the
+    factorized codes, so the lookup is a single vectorized take.
     """
 
-    df = df.copy()
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return np.zeros(len(series), dtype=bool)
 
-    
-    # Normalize column names
-    df.columns = (
-        df.columns.astype(str)
+    is_token = np.fromiter(
+        (isinstance(u, str) and u.strip().lower() in MISSING_TOKENS for u in uniques),
+        dtype=bool,
+        count=len(uniques),
+    )
+    # Append False so NaN (code -1) maps to "not a token"
+    return np.append(is_token, False)[codes]
+
+
+def normalize_missing_values(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replace missing-value tokens ("N/A ", "null", "?", ...) with NaN in place.
+    Only object and string columns are scanned, and only columns that
+    actually contain a token are rewritten.
+    """
+
+    for position, dtype in enumerate(df.dtypes):
+        if not (dtype == object or pd.api.types.is_string_dtype(dtype)):
+            continue
+
+        series = df.iloc[:, position]
+        mask = missing_token_mask(series)
+        if mask.any():
+            df.isetitem(position, series.mask(mask, np.nan))
+
+    return df
+
+
+def stratified_sample(series: pd.Series, size=None) -> pd.Series:
+    """
+    Pick one row from each of `size` equal-width strata (by default
+    INFERENCE_SAMPLE_SIZE), so the sample covers the whole column even
+    when the file is sorted or grouped.
+    """
+
+    if size is None:
+        size = INFERENCE_SAMPLE_SIZE
+    if len(series) <= size:
+        return series
+
+    edges = np.linspace(0, len(series), size + 1).astype(np.int64)
+    offsets = np.random.default_rng(0).random(size)
+    positions = edges[:-1] + (offsets * (edges[1:] - edges[:-1])).astype(np.int64)
+    return series.iloc[positions]
+
+
+def detect_datetime_format(series: pd.Series):
+    """
+    Guess the strptime format pandas would infer for a column, i.e. from its
+    first non-null string. Returns None when no single format applies.
+    """
+
+    first = series.first_valid_index()
+    if first is None:
+        return None
+
+    value = series.loc[first]
+    if isinstance(value, pd.Series):
+        value = value.iloc[0]
+    if not isinstance(value, str):
+        return None
+
+    # str() because the Cython signature rejects subclasses such as numpy.str_
+    return guess_datetime_format(str(value), dayfirst=False)
+
+
+def parse_datetimes(values: pd.Series, datetime_format=None) -> pd.Series:
+    """
+    pd.to_datetime with unparseable values coerced to NaT. With an explicit
+    format pandas rejects str subclasses such as numpy.str_, so those are
+    converted to str and parsed again.
+    """
+
+    try:
+        return pd.to_datetime(values, errors="coerce", format=datetime_format)
+    except TypeError:
+        values = values.map(lambda v: str(v) if isinstance(v, str) else v)
+        return pd.to_datetime(values, errors="coerce", format=datetime_format)
+
+
+def infer_column(series: pd.Series, datetime_format=None) -> pd.Series:
+    """
+    Convert a single column to its inferred type: numeric, datetime,
+    or normalized text.
+
+    Long columns are screened on a stratified sample and a conversion is only
+    run on the full column when the sample makes that type plausible. The
+    datetime format is detected once and reused for the full conversion;
+    pass datetime_format to skip detection.
+    """
+
+    return _infer_column_with_plan(series, datetime_format)[0]
+
+
+def _infer_column_with_plan(series: pd.Series, datetime_format=None):
+    # Returns the converted series and {"type": ..., "format": ...}. The plan
+    # also records how many values parsed in each full conversion that ran
+    # (None when the sample ruled it out), which cleaner.incremental uses
+    # to extend the decision to appended rows.
+    if len(series) == 0:
+        return series, {"type": None, "format": None}
+
+    # Arrow-backed text (see data_io.csv_reader) converts to nullable
+    # dtypes; infer on objects so results match C-parser input
+    if isinstance(series.dtype, pd.StringDtype):
+        series = series.astype(object)
+
+    sample = stratified_sample(series)
+    sampled = len(sample) < len(series)
+
+    def plausible(converted_sample):
+        rate = converted_sample.notna().mean()
+        return not sampled or rate + INFERENCE_SAMPLE_MARGIN > INFERENCE_THRESHOLD
+
+    counts = {"rows": len(series), "numeric_ok": None}
+
+    # Numeric conversion
+    if plausible(pd.to_numeric(sample, errors="coerce")):
+        numeric = pd.to_numeric(series, errors="coerce")
+        counts["numeric_ok"] = int(numeric.notna().sum())
+        if counts["numeric_ok"] / len(series) > INFERENCE_THRESHOLD:
+            return numeric, {"type": "numeric", "format": None, **counts}
+
+    # Datetime conversion
+    if datetime_format is None:
+        datetime_format = detect_datetime_format(series)
+    counts.update(detected_format=datetime_format, datetime_ok=None)
+
+    if plausible(parse_datetimes(sample, datetime_format)):
+        datetime = parse_datetimes(series, datetime_format)
+        counts["datetime_ok"] = int(datetime.notna().sum())
+        if counts["datetime_ok"] / len(series) > INFERENCE_THRESHOLD:
+            return datetime, {"type": "datetime", "format": datetime_format, **counts}
+
+    # Categorical cleanup (ONLY for non-numeric, non-datetime)
+    return normalize_text(series), {"type": "text", "format": None, **counts}
+
+
+def normalize_text(series: pd.Series) -> pd.Series:
+    """
+    Trimmed, lowercased text with missing values kept as NaN.
+    """
+
+    return (
+        series.astype(str)
         .str.strip()
         .str.lower()
-        .str.replace(" ", "_")
+        .replace("nan", np.nan)
+        .where(series.notna(), np.nan)
     )
 
 
-    # Normalize missing values
-    missing_values = [
-        "", "na", "n/a", "null", "--", "none", "nan",
-        "undefined", " ", "?", "-"
+def _infer_block(block: pd.DataFrame, formats: list) -> list:
+    # Worker entry point: infer a contiguous block of columns
+    return [
+        _infer_column_with_plan(block.iloc[:, i], formats[i])
+        for i in range(block.shape[1])
     ]
-    df.replace(missing_values, np.nan, inplace=True)
 
-    # Drop fully empty columns
-    df.dropna(axis=1, how="all", inplace=True)
 
-    # type inference 
-    for col in df.columns:
-        series = df[col]
+def infer_column_types(df: pd.DataFrame, n_jobs=1, column_types=None,
+                       progress=None) -> pd.DataFrame:
+    """
+    Run type inference on every column of df in place and return it.
+    With n_jobs > 1 (or -1 for all cores) columns are split into blocks
+    and inferred in a process pool; the result matches the serial path.
 
-        if len(series) == 0:
-            continue
+    The inferred type and datetime format of each column are cached in
+    df.attrs["column_types"]; pass a previous result as column_types to
+    reuse detected datetime formats.
+    progress, if given, is called as progress(fraction, message) before
+    each column (serially) or after each finished block (in the pool), so a
+    job can be cancelled part way through.
+    """
 
-        # Numeric conversion
-        numeric = pd.to_numeric(series, errors="coerce")
-        if numeric.notna().mean() > 0.8:
-            df[col] = numeric
-            continue
+    if progress is None:
+        progress = lambda fraction, message: None
 
-        # Datetime conversion
-        datetime = pd.to_datetime(series, errors="coerce")
-        if datetime.notna().mean() > 0.8:
-            df[col] = datetime
-            continue
+    column_types = column_types or {}
+    formats = [column_types.get(col, {}).get("format") for col in df.columns]
+    workers = min(resolve_workers(n_jobs), df.shape[1])
+
+    if workers <= 1:
+        results = []
+        for position in range(df.shape[1]):
+            progress(position / df.shape[1], f"Inferring type of {df.columns[position]}")
+            results.append(_infer_column_with_plan(df.iloc[:, position], formats[position]))
+    else:
+        # A few blocks per worker keeps the pool busy when columns differ in cost
+        positions = [
+            block for block in np.array_split(np.arange(df.shape[1]), workers * 4)
+            if len(block)
+        ]
+        blocks = [df.iloc[:, block] for block in positions]
+        block_formats = [[formats[i] for i in block] for block in positions]
+
+        results = []
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            try:
+                for done, part in enumerate(pool.map(_infer_block, blocks, block_formats), 1):
+                    results.extend(part)
+                    progress(done / len(blocks), f"Inferred {done} of {len(blocks)} column blocks")
+            except BaseException:
+                # Cancelled: drop the blocks not yet started instead of waiting for them
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    plans = {}
+    for position, (series, plan) in enumerate(results):
+        df.isetitem(position, series)
+        plans[df.columns[position]] = plan
+
+    df.attrs["column_types"] = plans
+    return df
 
-        # Categorical cleanup (ONLY for non-numeric, non-datetime)
-        df[col] = (
-            series.astype(str)
-            .str.strip()
-            .str.lower()
-            .replace("nan", np.nan)
-        )
 
-    df.drop_duplicates(inplace=True)
+def normalize_column_names(columns: pd.Index) -> pd.Index:
+    return (
+        columns.astype(str)
+        .str.strip()
+        .str.lower()
+        .str.replace(" ", "_")
+    )
+
+
+def clean_dataset(df: pd.DataFrame, n_jobs=1, column_types=None, compact=False,
+                  progress=None) -> pd.DataFrame:
+    """
+    Clean a dataset using rule-based transformations.
+    Returns a cleaned DataFrame.
+    n_jobs > 1 runs per-column type inference in a process pool; column_types
+    reuses the cached plan from a previous result's attrs["column_types"].
+    compact=True downcasts numbers and stores low-cardinality text as category.
+    progress, if given, is called as progress(fraction, message) per stage.
+    """
+
+    if progress is None:
+        progress = lambda fraction, message: None
+
+    # Shallow copy: every step below swaps whole columns instead of writing
+    # into shared arrays, so the caller's frame is never modified
+    df = df.copy(deep=False)
+
+    # Normalize column names
+    df.columns = normalize_column_names(df.columns)
+
+
+    # Normalize missing values
+    progress(0.1, "Normalizing missing values")
+    normalize_missing_values(df)
+
+    # Drop fully empty columns
+    df.dropna(axis=1, how="all", inplace=True)
+
+    # type inference 
+    progress(0.2, "Inferring column types")
+    infer_column_types(
+        df, n_jobs=n_jobs, column_types=column_types,
+        progress=lambda fraction, message: progress(0.2 + 0.6 * fraction, message),
+    )
+
+    progress(0.8, "Removing duplicate rows")
+    df = drop_duplicate_rows(df)
     df.reset_index(drop=True, inplace=True)
 
+    if compact:
+        progress(0.9, "Compacting memory")
+        compact_dtypes(df)
+
     return df
@@ -0,0 +1,62 @@
+'''
+Memory compaction for cleaned datasets.
+Numeric columns are downcast to the smallest lossless type and low-cardinality
+text becomes pandas category, which typically shrinks a cleaned frame several
+times over.
+'''
+import numpy as np
+import pandas as pd
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+def downcast_numeric(series: pd.Series) -> pd.Series:
+    """
+    Downcast an integer or float column without changing any value.
+    Floats only move to float32 when every value survives the round trip.
+    """
+
+    if pd.api.types.is_bool_dtype(series):
+        return series
+
+    if pd.api.types.is_integer_dtype(series):
+        if len(series) and series.min() >= 0:
+            return pd.to_numeric(series, downcast="unsigned")
+        return pd.to_numeric(series, downcast="integer")
+
+    if pd.api.types.is_float_dtype(series) and series.dtype != np.float32:
+        values = series.to_numpy()
+        narrowed = values.astype(np.float32)
+        if np.array_equal(narrowed.astype(values.dtype), values, equal_nan=True):
+            return pd.Series(narrowed, index=series.index, name=series.name)
+
+    return series
+
+
+def compact_dtypes(df: pd.DataFrame, category_ratio=0.5, max_categories=10_000) -> pd.DataFrame:
+    """
+    Downcast numeric columns and convert low-cardinality text to category, in place.
+
+    A text column becomes categorical when its distinct values are at most
+    category_ratio of its non-null rows and no more than max_categories.
+    Memory before and after is recorded in df.attrs["compaction"].
+    """
+
+    before = memory_bytes(df)
+
+    for position, dtype in enumerate(df.dtypes):
+        series = df.iloc[:, position]
+
+        if pd.api.types.is_numeric_dtype(dtype):
+            df.isetitem(position, downcast_numeric(series))
+
+        elif dtype == object:
+            non_null = series.notna().sum()
+            unique = series.nunique(dropna=True)
+            if non_null and unique <= max_categories and unique <= category_ratio * non_null:
+                df.isetitem(position, series.astype("category"))
+
+    df.attrs["compaction"] = {"before_bytes": before, "after_bytes": memory_bytes(df)}
+    return df
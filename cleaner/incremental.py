@@ -0,0 +1,246 @@
+'''
+Incremental cleaning for datasets that grow by appended rows.
+A full clean keeps its per-column inference plans (including how many values
+parsed as each type), the fingerprints of the cleaned rows and, without
+compaction, a profile accumulator of the cleaned frame. When a later upload
+is that file with rows appended, each type decision is replayed on the whole
+column's sample and the combined parse counts, only the appended rows are
+converted, and they are deduplicated against the rows kept before. Whenever
+a decision could come out differently from a full run (a column changing
+type, a datetime format guessed per batch, an empty column filling up), the
+dataset is cleaned from scratch instead, so the result always matches
+clean_dataset.
+'''
+import copy
+
+import numpy as np
+import pandas as pd
+
+from cleaner.cleaner import (
+    INFERENCE_SAMPLE_MARGIN,
+    INFERENCE_THRESHOLD,
+    clean_dataset,
+    normalize_column_names,
+    normalize_missing_values,
+    normalize_text,
+    parse_datetimes,
+    stratified_sample,
+)
+from cleaner.compaction import compact_dtypes
+from profiling.fingerprint import DuplicateTracker, row_fingerprints
+from profiling.incremental import appended_rows
+from profiling.profiler import profile_dataset
+from profiling.streaming import ProfileAccumulator
+
+
+class CleaningState:
+    """
+    A cleaned frame with what is needed to extend it: the raw frame's row
+    fingerprints and dtypes, the tracker of cleaned row fingerprints and,
+    for uncompacted results, the cleaned profile accumulator.
+    """
+
+    def __init__(self, raw_fingerprints, raw_dtypes, cleaned, duplicates, compact, profile=None):
+        self.raw_fingerprints = raw_fingerprints
+        self.raw_dtypes = raw_dtypes
+        self.cleaned = cleaned
+        self.duplicates = duplicates
+        self.compact = compact
+        self.profile = profile
+        # Raw rows taken over from the previous state in the run that built this one
+        self.reused_rows = 0
+
+    @property
+    def nbytes(self) -> int:
+        size = self.raw_fingerprints.nbytes + self.duplicates.fingerprints.nbytes
+        size += int(self.cleaned.memory_usage(deep=True).sum())
+        if self.profile is not None:
+            size += self.profile.nbytes
+        return size
+
+
+def _extend_column(series: pd.Series, rows: int, plan: dict):
+    # series is the whole raw column, of which the first `rows` values were
+    # inferred with `plan`. Returns the appended values converted the way a
+    # full inference would and the plan for the whole column, or None when
+    # the column has to be inferred again.
+    if plan.get("rows") != rows or plan["type"] is None:
+        return None
+
+    def normalized(part):
+        if isinstance(part.dtype, pd.StringDtype):
+            part = part.astype(object)
+        return normalize_missing_values(part.to_frame()).iloc[:, 0]
+
+    # Missing tokens and type conversions are row by row, so the sample of
+    # the whole column can be normalized on its own
+    sample = normalized(stratified_sample(series))
+    sampled = len(sample) < len(series)
+    new = normalized(series.iloc[rows:])
+
+    def plausible(converted_sample):
+        rate = converted_sample.notna().mean()
+        return not sampled or rate + INFERENCE_SAMPLE_MARGIN > INFERENCE_THRESHOLD
+
+    counts = {"rows": len(series), "numeric_ok": None}
+    decided = None
+
+    if plausible(pd.to_numeric(sample, errors="coerce")):
+        if plan["numeric_ok"] is None:
+            return None
+        numeric = pd.to_numeric(new, errors="coerce")
+        counts["numeric_ok"] = plan["numeric_ok"] + int(numeric.notna().sum())
+        if counts["numeric_ok"] / len(series) > INFERENCE_THRESHOLD:
+            decided = numeric, {"type": "numeric", "format": None}
+
+    if decided is None:
+        if "datetime_ok" not in plan:
+            return None
+        # Detected from the first valid value, which lies in the earlier rows
+        datetime_format = plan["detected_format"]
+        counts.update(detected_format=datetime_format, datetime_ok=None)
+
+        if plausible(parse_datetimes(sample, datetime_format)):
+            # Without a format pandas guesses one per call, so the appended
+            # rows alone could parse differently
+            if plan["datetime_ok"] is None or datetime_format is None:
+                return None
+            datetime = parse_datetimes(new, datetime_format)
+            counts["datetime_ok"] = plan["datetime_ok"] + int(datetime.notna().sum())
+            if counts["datetime_ok"] / len(series) > INFERENCE_THRESHOLD:
+                decided = datetime, {"type": "datetime", "format": datetime_format}
+
+    if decided is None:
+        decided = normalize_text(new), {"type": "text", "format": None}
+
+    converted, decision = decided
+    if decision["type"] != plan["type"]:
+        return None
+    return converted, {**decision, **counts}
+
+
+def _common_dtype(left, right):
+    # dtype of a column converted in one piece, from its two converted parts
+    if left == right:
+        return left
+    if all(
+        pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+        for d in (left, right)
+    ):
+        return np.result_type(left, right)
+    return np.dtype(object)
+
+
+def _full_clean(df, fingerprints, n_jobs, compact, progress):
+    cleaned = clean_dataset(df, n_jobs=n_jobs, progress=progress)
+
+    progress(0.85, "Fingerprinting cleaned rows")
+    cleaned_fingerprints = row_fingerprints(cleaned)
+    duplicates = DuplicateTracker()
+    duplicates.mask(cleaned, cleaned_fingerprints)
+
+    profile = None
+    if compact:
+        progress(0.9, "Compacting memory")
+        compact_dtypes(cleaned)
+    else:
+        profile = ProfileAccumulator()
+        profile.update(cleaned, cleaned_fingerprints)
+
+    state = CleaningState(fingerprints, df.dtypes.to_dict(), cleaned, duplicates, compact, profile)
+    return cleaned, state
+
+
+def _extend(df, fingerprints, state, start, compact, progress):
+    # Returns (cleaned, new state) or None when a full clean is needed
+    progress(0.1, "Normalizing appended rows")
+    new = df.iloc[start:].copy(deep=False)
+    new.columns = normalize_column_names(new.columns)
+
+    # Columns dropped as empty must still be empty
+    dropped = [col for col in new.columns if col not in state.cleaned.columns]
+    if dropped and normalize_missing_values(new[dropped].copy()).notna().any().any():
+        return None
+
+    progress(0.2, "Inferring types of appended rows")
+    plans = state.cleaned.attrs["column_types"]
+    converted = {}
+    new_plans = {}
+    for position, col in enumerate(new.columns):
+        if col in dropped:
+            continue
+        progress(0.2 + 0.4 * position / len(new.columns), f"Inferring type of {col}")
+        extended = _extend_column(df.iloc[:, position], start, plans[col])
+        if extended is None:
+            return None
+        converted[col], new_plans[col] = extended
+
+    chunk = pd.DataFrame(converted, index=new.index)
+    dtypes = {col: _common_dtype(state.cleaned[col].dtype, chunk[col].dtype) for col in chunk.columns}
+
+    progress(0.6, "Removing duplicate rows")
+    chunk_fingerprints = row_fingerprints(chunk)
+    duplicates = copy.deepcopy(state.duplicates)
+    kept = ~duplicates.mask(chunk, chunk_fingerprints)
+
+    progress(0.8, "Appending cleaned rows")
+    # Cast to the dtypes of a one-piece conversion: rows dropped as
+    # duplicates still widen it (e.g. "1.0" after "1")
+    appended = chunk[kept].astype(dtypes)
+    cleaned = pd.concat([state.cleaned.astype(dtypes), appended], ignore_index=True)
+    cleaned.attrs = {"column_types": new_plans}
+
+    profile = None
+    if compact:
+        progress(0.9, "Compacting memory")
+        compact_dtypes(cleaned)
+    elif state.profile is not None and (cleaned.dtypes == state.cleaned.dtypes).all():
+        profile = copy.deepcopy(state.profile)
+        profile.update(appended, chunk_fingerprints[kept])
+
+    new_state = CleaningState(
+        fingerprints, df.dtypes.to_dict(), cleaned, duplicates, compact, profile
+    )
+    new_state.reused_rows = start
+    return cleaned, new_state
+
+
+def clean_incremental(df: pd.DataFrame, fingerprints=None, state=None, n_jobs=1,
+                      compact=False, progress=None):
+    """
+    Clean df like clean_dataset(df, n_jobs, compact=compact), extending
+    state from an earlier run when df is that run's raw frame with rows
+    appended. Returns (cleaned, new CleaningState).
+    fingerprints are row_fingerprints(df) if already computed.
+    """
+
+    if progress is None:
+        progress = lambda fraction, message: None
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df)
+
+    result = None
+    if state is not None and state.compact == compact:
+        appended = appended_rows(state.raw_fingerprints, state.raw_dtypes, df, fingerprints)
+        if appended == 0:
+            # The same rows again; the raw dtypes may still have widened
+            same = copy.copy(state)
+            same.raw_dtypes = df.dtypes.to_dict()
+            same.reused_rows = len(df)
+            result = state.cleaned, same
+        elif appended is not None:
+            result = _extend(df, fingerprints, state, len(df) - appended, compact, progress)
+
+    if result is None:
+        result = _full_clean(df, fingerprints, n_jobs, compact, progress)
+    return result
+
+
+def cleaned_profile(cleaned: pd.DataFrame, state: CleaningState) -> dict:
+    """
+    profile_dataset(cleaned), from the state's accumulator when it has one.
+    """
+
+    if state.profile is not None:
+        return state.profile.finalize(cleaned.index)
+    return profile_dataset(cleaned)
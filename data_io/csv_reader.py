@@ -0,0 +1,172 @@
+'''
+CSV ingestion on PyArrow's multi-threaded parser.
+Text columns come back as Arrow-backed pandas strings instead of one Python
+object per value, and column types from an earlier profile of the same file
+are handed to the parser where that cannot change the result. Files the
+Arrow parser rejects are read with pandas' C parser.
+'''
+import csv
+import io
+import os
+
+import pandas as pd
+
+
+CSV_ENGINES = ("auto", "pyarrow", "c")
+
+# pandas' default missing-value and boolean tokens, so both engines agree
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+TRUE_VALUES = ["True", "TRUE", "true"]
+FALSE_VALUES = ["False", "FALSE", "false"]
+
+# Profile dtypes whose Arrow type is also what the parser would infer
+# whenever the hinted parse succeeds; a float or text hint would instead turn
+# "10" into 10.0 or "00123" into text in a file where that differs
+HINT_TYPES = {"int64": "int64", "bool": "bool_"}
+
+
+class ArrowParseError(ValueError):
+    pass
+
+
+def dtype_hints(metadata: dict) -> dict:
+    """
+    Arrow column types for the parser from a profile_dataset result of an
+    earlier version of the same file. Only apply them to a file with the
+    same header (see csv_header).
+    """
+
+    import pyarrow as pa
+
+    return {
+        str(col["name"]): getattr(pa, HINT_TYPES[col["dtype"]])()
+        for col in metadata["columns"]
+        if col["dtype"] in HINT_TYPES
+    }
+
+
+def csv_header(source) -> list:
+    """
+    Column names on the first line of a CSV (path or file-like), read
+    without parsing the rest of the file.
+    """
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as fh:
+            line = fh.readline()
+    elif hasattr(source, "getbuffer"):
+        line = io.BytesIO(source.getbuffer()).readline()
+    else:
+        source.seek(0)
+        line = source.readline()
+        source.seek(0)
+
+    if isinstance(line, bytes):
+        line = line.decode("utf-8", errors="replace")
+    return next(csv.reader([line.lstrip("\ufeff").rstrip("\r\n")]), [])
+
+
+def _arrow_input(source):
+    import pyarrow as pa
+
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if hasattr(source, "getbuffer"):
+        return pa.BufferReader(pa.py_buffer(source.getbuffer()))
+    source.seek(0)
+    return pa.BufferReader(source.read())
+
+
+def _parse(source, column_types, include_columns=None):
+    import pyarrow.csv as pacsv
+
+    return pacsv.read_csv(
+        _arrow_input(source),
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=include_columns,
+            null_values=NA_VALUES,
+            true_values=TRUE_VALUES,
+            false_values=FALSE_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _parse_hinted(source, hints, columns):
+    # The hinted parse, or None when it could differ from an unhinted one
+    import pyarrow as pa
+
+    try:
+        table = _parse(source, hints, columns)
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+        # Values that no longer fit the hinted type
+        return None
+
+    # A hinted column without values would come back typed instead of null
+    if any(table[name].null_count == table.num_rows for name in hints if name in table.column_names):
+        return None
+    return table
+
+
+def read_csv_arrow(source, hints=None, columns=None) -> pd.DataFrame:
+    """
+    Parse a CSV (path or file-like) with pyarrow.csv into a DataFrame with
+    numpy numeric columns and string[pyarrow] text columns. Hints that do
+    not fit the file are dropped and the types inferred.
+    Raises ArrowParseError when the file needs pandas' parser.
+    """
+
+    import pyarrow as pa
+
+    try:
+        table = _parse_hinted(source, hints, columns) if hints else None
+        if table is None:
+            table = _parse(source, {}, columns)
+
+        names = table.column_names
+        if len(set(names)) < len(names) or "" in names:
+            # pandas renames these ("a.1", "Unnamed: 0"); leave that to it
+            raise ArrowParseError("Duplicate or empty column names")
+
+        # Like pandas without parse_dates, keep dates as text for the cleaner
+        temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+        if temporal:
+            text = _parse(source, {name: pa.string() for name in temporal}, temporal)
+            for name in temporal:
+                table = table.set_column(names.index(name), name, text[name])
+
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as error:
+        raise ArrowParseError(str(error).splitlines()[0]) from error
+
+    strings = pd.StringDtype("pyarrow")
+    return table.to_pandas(
+        types_mapper={pa.string(): strings, pa.large_string(): strings}.get,
+        self_destruct=True,
+    )
+
+
+def read_csv(source, hints=None, columns=None, engine="auto") -> pd.DataFrame:
+    """
+    Read a CSV with the given engine: "pyarrow", "c" (pandas' default parser)
+    or "auto", which tries pyarrow and falls back to the C parser on any
+    file it cannot handle (ragged rows, quoted newlines, ...).
+    """
+
+    if engine not in CSV_ENGINES:
+        raise ValueError(f"engine must be one of {CSV_ENGINES}")
+
+    if engine != "c":
+        try:
+            return read_csv_arrow(source, hints, columns)
+        except ArrowParseError:
+            if engine == "pyarrow":
+                raise
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    return pd.read_csv(source, usecols=columns)
@@ -0,0 +1,277 @@
+'''
+Reading and writing datasets as CSV, Parquet or Arrow IPC (Feather v2).
+Columnar files are read through PyArrow: paths are memory-mapped and uploads
+are wrapped without copying, only the requested columns are decoded, and
+Parquet row groups whose statistics cannot match a filter are skipped.
+'''
+import gzip
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from data_io.csv_reader import read_csv
+
+
+FILE_FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "ipc",
+    ".feather": "ipc",
+    ".ipc": "ipc",
+}
+
+# Extensions accepted by the uploader
+UPLOAD_TYPES = [ext.lstrip(".") for ext in FILE_FORMATS]
+
+# Download formats for the cleaned dataset: (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+    "feather": (".feather", "application/vnd.apache.arrow.file"),
+}
+
+# Optional compression of CSV downloads: (file suffix, MIME type)
+CSV_COMPRESSIONS = {
+    None: ("", "text/csv"),
+    "gzip": (".gz", "application/gzip"),
+    "zstd": (".zst", "application/zstd"),
+}
+
+DEFAULT_BATCH_ROWS = 100_000
+
+# Exports stay in memory up to this size, then spill to a temporary file
+SPOOL_MAX_BYTES = 64 * 1024 ** 2
+
+
+def file_format(file_name: str) -> str:
+    """
+    Format of a file from its extension: "csv", "parquet" or "ipc".
+    """
+
+    ext = os.path.splitext(file_name)[1].lower()
+    if ext not in FILE_FORMATS:
+        raise ValueError(f"Unsupported file type: {ext or file_name}")
+    return FILE_FORMATS[ext]
+
+
+def _arrow_source(source):
+    # Paths are memory-mapped; in-memory uploads are wrapped without a copy
+    import pyarrow as pa
+
+    if isinstance(source, (str, os.PathLike)):
+        return pa.memory_map(os.fspath(source))
+    if hasattr(source, "getbuffer"):
+        return pa.py_buffer(source.getbuffer())
+    source.seek(0)
+    return pa.py_buffer(source.read())
+
+
+def _fragment(source, fmt):
+    import pyarrow.dataset as ds
+
+    if fmt == "parquet":
+        file_format = ds.ParquetFileFormat()
+    elif fmt == "ipc":
+        file_format = ds.IpcFileFormat()
+    else:
+        raise ValueError(f"Expected a columnar format, got {fmt!r}")
+    return file_format.make_fragment(_arrow_source(source))
+
+
+def _filter_expression(filters):
+    import pyarrow.parquet as pq
+
+    return pq.filters_to_expression(filters) if filters else None
+
+
+def read_schema(source, fmt: str) -> list:
+    """
+    Column names of a columnar file, read from its footer or schema only.
+    """
+
+    return _fragment(source, fmt).physical_schema.names
+
+
+def iter_batches(source, fmt: str, batch_rows=DEFAULT_BATCH_ROWS, columns=None, filters=None):
+    """
+    Yield pyarrow RecordBatches of at most batch_rows rows.
+
+    columns projects the read to those columns. filters uses the
+    pyarrow.parquet DNF form, e.g. [("year", ">=", 2020)]; for Parquet,
+    row groups whose min/max statistics rule the filter out are never
+    decoded, for IPC (no statistics) it is applied to memory-mapped batches.
+    """
+
+    yield from _fragment(source, fmt).to_batches(
+        columns=columns, filter=_filter_expression(filters), batch_size=batch_rows
+    )
+
+
+def read_table(source, fmt: str, columns=None, filters=None, nrows=None):
+    """
+    Read a Parquet or Arrow IPC file into a pyarrow Table, with the same
+    projection and filtering as iter_batches. nrows stops reading once
+    that many matching rows have been decoded.
+    """
+
+    fragment = _fragment(source, fmt)
+    expression = _filter_expression(filters)
+
+    if nrows is None:
+        return fragment.to_table(columns=columns, filter=expression)
+    return fragment.head(nrows, columns=columns, filter=expression)
+
+
+def read_dataset(source, fmt: str, columns=None, filters=None, nrows=None,
+                 dtype_hints=None, csv_engine="auto") -> pd.DataFrame:
+    """
+    Load a dataset into a DataFrame. Parquet and IPC go through read_table.
+    Whole CSV files go through data_io.csv_reader with optional Arrow
+    dtype_hints; CSV heads (nrows) through pandas, since the Arrow parser
+    cannot stop early.
+    """
+
+    if fmt == "csv":
+        if filters:
+            raise ValueError("Row filters need a columnar format")
+        if nrows is None:
+            return read_csv(source, hints=dtype_hints, columns=columns, engine=csv_engine)
+        if hasattr(source, "seek"):
+            source.seek(0)
+        return pd.read_csv(source, usecols=columns, nrows=nrows)
+
+    return read_table(source, fmt, columns=columns, filters=filters, nrows=nrows).to_pandas()
+
+
+def iter_dataframes(source, fmt: str, batch_rows=DEFAULT_BATCH_ROWS, columns=None):
+    """
+    Yield the dataset as DataFrame chunks of at most batch_rows rows, for
+    out-of-core profiling of any supported format.
+    """
+
+    if fmt == "csv":
+        if hasattr(source, "seek"):
+            source.seek(0)
+        yield from pd.read_csv(source, chunksize=batch_rows, usecols=columns)
+        return
+
+    for batch in iter_batches(source, fmt, batch_rows=batch_rows, columns=columns):
+        yield batch.to_pandas()
+
+
+def _datetime_units(df):
+    # pandas prints a naive datetime column with the coarsest unit that holds
+    # every value (dates only, whole seconds, or 3/6/9 fractional digits),
+    # decided over the values it is given. Decide once over the whole frame
+    # so every chunk is written like the one-shot to_csv
+    units = {}
+    for position, dtype in enumerate(df.dtypes):
+        if not pd.api.types.is_datetime64_dtype(dtype):
+            continue
+        values = df.iloc[:, position].dropna().to_numpy()
+        units[position] = next(
+            (unit for unit in ("D", "s", "ms", "us")
+             if (values == values.astype(f"datetime64[{unit}]")).all()),
+            "ns",
+        )
+    return units
+
+
+def _format_datetimes(series, unit):
+    text = np.char.replace(np.datetime_as_string(series.to_numpy(), unit=unit), "T", " ")
+    return pd.Series(text, index=series.index, dtype=object).where(series.notna())
+
+
+def _csv_chunks(df, chunk_rows):
+    units = _datetime_units(df)
+
+    for start in range(0, max(len(df), 1), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        if units:
+            chunk = chunk.copy(deep=False)
+            for position, unit in units.items():
+                chunk.isetitem(position, _format_datetimes(chunk.iloc[:, position], unit))
+        yield chunk.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def _compress(data, compression):
+    # Every chunk is its own gzip member / zstd frame; concatenated members
+    # and frames decompress as one stream
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    if compression == "zstd":
+        import pyarrow as pa
+
+        return pa.Codec("zstd").compress(data, asbytes=True)
+    return data
+
+
+def write_dataset(df: pd.DataFrame, fh, fmt="csv", compression=None,
+                  chunk_rows=DEFAULT_BATCH_ROWS):
+    """
+    Write df to the binary file object fh in one of EXPORT_FORMATS,
+    chunk_rows rows at a time, so only one chunk is ever encoded in memory.
+    CSV can be gzip or zstd compressed; Parquet is written with zstd and
+    one row group per chunk, Feather as Arrow IPC with lz4.
+    """
+
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"fmt must be one of {tuple(EXPORT_FORMATS)}")
+    if compression not in CSV_COMPRESSIONS:
+        raise ValueError(f"compression must be one of {tuple(CSV_COMPRESSIONS)}")
+    if compression and fmt != "csv":
+        raise ValueError("Parquet and Feather are compressed internally")
+
+    if fmt == "csv":
+        for data in _csv_chunks(df, chunk_rows):
+            fh.write(_compress(data, compression))
+        return
+
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(fh, schema, compression="zstd")
+    else:
+        writer = ipc.new_file(fh, schema, options=ipc.IpcWriteOptions(compression="lz4"))
+
+    with writer:
+        for start in range(0, len(df), chunk_rows):
+            chunk = df.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def spool_dataset(df: pd.DataFrame, fmt="csv", compression=None,
+                  chunk_rows=DEFAULT_BATCH_ROWS, max_memory=SPOOL_MAX_BYTES):
+    """
+    Export df into a SpooledTemporaryFile (see write_dataset) that moves to
+    disk once it grows past max_memory. Returned rewound; the caller closes it.
+    """
+
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    try:
+        write_dataset(df, spool, fmt, compression, chunk_rows)
+    except BaseException:
+        spool.close()
+        raise
+
+    spool.seek(0)
+    return spool
+
+
+def export_dataset(df: pd.DataFrame, fmt="csv", compression=None,
+                   chunk_rows=DEFAULT_BATCH_ROWS) -> bytes:
+    """
+    Serialized download of df as bytes. Encoding goes chunk by chunk through
+    spool_dataset, so no whole-file str is built, but the result is still the
+    full encoded file in memory: st.download_button keeps its data in memory
+    whether it is given bytes or a file handle. Compression shrinks it.
+    """
+
+    with spool_dataset(df, fmt, compression, chunk_rows) as spool:
+        return spool.read()
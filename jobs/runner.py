@@ -0,0 +1,180 @@
+'''
+Background job runner for long-running analysis work.
+Jobs run in a shared process pool so a slow profiling, cleaning or
+visualization run never blocks the Streamlit script thread. The UI polls
+job status and progress, and can cancel jobs that are queued or running.
+'''
+import multiprocessing
+import os
+import threading
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker when its job has been cancelled."""
+
+
+def resolve_workers(n_jobs) -> int:
+    """
+    Process count for an n_jobs argument: None means 1, negative values
+    every core.
+    """
+
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return os.cpu_count() or 1
+    return max(int(n_jobs), 1)
+
+
+# Set in the worker process while a job is executing
+_current_job = None
+
+
+def report_progress(fraction: float, message: str = ""):
+    """
+    Publish progress from inside a running job. Outside a job this is a no-op.
+    Raises JobCancelled if the job was cancelled, so tasks stop at the next
+    progress checkpoint.
+    """
+
+    if _current_job is None:
+        return
+
+    job_id, progress, cancelled = _current_job
+    if cancelled.get(job_id):
+        raise JobCancelled(job_id)
+    progress[job_id] = (min(max(float(fraction), 0.0), 1.0), message)
+
+
+def _run_job(job_id, progress, cancelled, func, args, kwargs):
+    # Worker entry point: install the progress channel, then run the task
+    global _current_job
+    _current_job = (job_id, progress, cancelled)
+
+    try:
+        report_progress(0.0, "Started")
+        result = func(*args, **kwargs)
+        progress[job_id] = (1.0, "Finished")
+        return result
+    finally:
+        _current_job = None
+
+
+class JobRunner:
+    """
+    Process-pool job runner shared by every session on the server.
+
+    submit() returns a job id; status() reports state, progress and message;
+    result() returns the finished value; cancel() stops a job before it starts
+    or at its next progress checkpoint.
+    """
+
+    def __init__(self, max_workers=2):
+        context = multiprocessing.get_context("spawn")
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        self._manager = context.Manager()
+        self._progress = self._manager.dict()
+        self._cancelled = self._manager.dict()
+        self._futures = {}
+        self._labels = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, label="", **kwargs) -> str:
+        job_id = uuid.uuid4().hex
+        self._progress[job_id] = (0.0, "Queued")
+
+        future = self._executor.submit(
+            _run_job, job_id, self._progress, self._cancelled, func, args, kwargs
+        )
+
+        with self._lock:
+            self._futures[job_id] = future
+            self._labels[job_id] = label
+
+        return job_id
+
+    def status(self, job_id) -> dict:
+        with self._lock:
+            future = self._futures.get(job_id)
+            label = self._labels.get(job_id, "")
+
+        if future is None:
+            return {"state": None, "progress": 0.0, "message": "Unknown job", "label": label}
+
+        fraction, message = self._progress.get(job_id, (0.0, ""))
+
+        if future.cancelled():
+            state, message = CANCELLED, "Cancelled"
+        elif future.done():
+            error = future.exception()
+            if isinstance(error, JobCancelled):
+                state, message = CANCELLED, "Cancelled"
+            elif error is not None:
+                state, message = FAILED, f"{type(error).__name__}: {error}"
+            else:
+                state = DONE
+        elif self._cancelled.get(job_id):
+            state, message = RUNNING, "Cancelling..."
+        elif future.running():
+            state = RUNNING
+        else:
+            state = PENDING
+
+        return {"state": state, "progress": fraction, "message": message, "label": label}
+
+    def result(self, job_id):
+        with self._lock:
+            future = self._futures[job_id]
+        return future.result()
+
+    def cancel(self, job_id):
+        """
+        Cancel a queued job immediately, or flag a running one to stop
+        at its next progress checkpoint.
+        """
+
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is None:
+            return
+
+        self._cancelled[job_id] = True
+        future.cancel()
+
+    def forget(self, job_id):
+        """
+        Drop bookkeeping for a job whose result is no longer wanted, e.g.
+        once it has been collected or right after cancel(). A job still
+        running keeps its cancel flag until it stops.
+        """
+
+        with self._lock:
+            future = self._futures.pop(job_id, None)
+            self._labels.pop(job_id, None)
+
+        if future is not None and not future.done():
+            future.add_done_callback(lambda _: self._drop_flags(job_id))
+        else:
+            self._drop_flags(job_id)
+
+    def _drop_flags(self, job_id):
+        self._progress.pop(job_id, None)
+        self._cancelled.pop(job_id, None)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._manager.shutdown()
+
+
+def is_finished(status: dict) -> bool:
+    return status["state"] in (DONE, FAILED, CANCELLED)
+
@@ -0,0 +1,70 @@
+'''
+Job entry points run by the background JobRunner.
+Each task wraps an existing pipeline step, publishes progress through
+report_progress and returns picklable artifacts for the session to cache.
+'''
+from ai.rule_based_summary import generate_cleaning_result_summary
+from cleaner.cleaner import clean_dataset
+from cleaner.incremental import clean_incremental, cleaned_profile
+from jobs.runner import report_progress
+from profiling.profiler import generate_profile_report, profile_dataset
+from visualization.exporter import iter_dashboard_compact, write_dashboard_html
+from visualization.visual_assets import build_figure, figure_specs
+
+
+def profile_report_task(df, metadata=None, engine="native", tier="sampled", time_budget=10.0):
+    return generate_profile_report(
+        df,
+        engine=engine,
+        metadata=metadata,
+        tier=tier,
+        time_budget=time_budget,
+        progress=report_progress,
+    )
+
+
+def clean_task(df, n_jobs=1, compact=False, incremental=False, previous=None, fingerprints=None):
+    """
+    Returns (cleaned_df, cleaning result summary, cleaned profile metadata,
+    incremental CleaningState or None).
+    With incremental=True only rows appended since the previous
+    CleaningState are cleaned (see cleaner.incremental).
+    """
+
+    if not incremental:
+        cleaned_df = clean_dataset(df, n_jobs=n_jobs, compact=compact, progress=report_progress)
+        state = None
+    else:
+        cleaned_df, state = clean_incremental(
+            df, fingerprints, previous, n_jobs=n_jobs, compact=compact, progress=report_progress
+        )
+
+    report_progress(0.9, "Summarizing changes")
+    summary = generate_cleaning_result_summary(df, cleaned_df)
+
+    report_progress(0.95, "Profiling cleaned data")
+    metadata = profile_dataset(cleaned_df) if state is None else cleaned_profile(cleaned_df, state)
+    return cleaned_df, summary, metadata, state
+
+
+def visualization_task(df, path, n_jobs=1, compact=False):
+    """
+    Build every figure and stream the exported dashboard html into the
+    file at path, which is returned; the page is never held in memory.
+    n_jobs is the number of processes serializing charts; compact=True
+    exports the shared-payload format whose charts load on scroll.
+    """
+
+    specs = figure_specs(df)
+    figures = {}
+    for position, spec in enumerate(specs):
+        report_progress(0.8 * position / max(len(specs), 1), f"Building {spec.title}")
+        figures[spec.key] = build_figure(df, spec)
+
+    report_progress(0.8, "Exporting dashboard")
+    with open(path, "w", encoding="utf-8") as fh:
+        if compact:
+            fh.writelines(iter_dashboard_compact(figures))
+        else:
+            write_dashboard_html(figures, fh, n_jobs=n_jobs)
+    return path
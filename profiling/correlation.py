@@ -0,0 +1,191 @@
+'''
+Correlation analysis for wide numeric datasets.
+Pairwise-complete Pearson correlations come from mergeable co-moment sums,
+so they can be built from a row sample or streamed chunk by chunk in float32.
+Spearman uses ranks of the sample. Top-k pairs and threshold clusters pick
+the block worth showing instead of the full N x N matrix.
+'''
+import time
+
+import numpy as np
+import pandas as pd
+
+
+CORRELATION_METHODS = ("pearson", "spearman")
+
+DEFAULT_SAMPLE_ROWS = 200_000
+DEFAULT_CHUNK_ROWS = 50_000
+
+
+class CorrelationAccumulator:
+    """
+    Mergeable pairwise-complete Pearson correlation over numeric chunks.
+
+    For every column pair it keeps the count of rows where both are present
+    and the sums needed for covariance. Chunk products run in float32; the
+    running sums are float64. Values are shifted by the first chunk's means
+    so float32 products do not lose precision on large offsets.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        k = len(self.columns)
+        self.shift = None
+        self.n = np.zeros((k, k))
+        self.sum_x = np.zeros((k, k))
+        self.sum_xx = np.zeros((k, k))
+        self.sum_xy = np.zeros((k, k))
+
+    def update(self, chunk: pd.DataFrame):
+        values = chunk[self.columns].to_numpy(dtype="float64", na_value=np.nan)
+        if self.shift is None:
+            with np.errstate(all="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(len(self.columns))
+
+        present = np.isfinite(values)
+        shifted = np.where(present, values - self.shift, 0).astype(np.float32)
+        mask = present.astype(np.float32)
+
+        # sum_x[i, j] is the sum of column i over rows where column j is present
+        self.n += mask.T @ mask
+        self.sum_x += shifted.T @ mask
+        self.sum_xx += (shifted * shifted).T @ mask
+        self.sum_xy += shifted.T @ shifted
+
+    def merge(self, other: "CorrelationAccumulator"):
+        if other.shift is None:
+            return
+        if self.shift is None:
+            self.shift = other.shift
+            self.n, self.sum_x = other.n.copy(), other.sum_x.copy()
+            self.sum_xx, self.sum_xy = other.sum_xx.copy(), other.sum_xy.copy()
+            return
+
+        # Re-express the other side's sums around this accumulator's shift
+        delta = (other.shift - self.shift)[:, None]
+        delta_t = delta.T
+        sum_x = other.sum_x + delta * other.n
+
+        self.sum_xy += (
+            other.sum_xy + delta * other.sum_x.T + other.sum_x * delta_t
+            + delta * delta_t * other.n
+        )
+        self.sum_xx += other.sum_xx + 2 * delta * other.sum_x + delta ** 2 * other.n
+        self.sum_x += sum_x
+        self.n += other.n
+
+    def finalize(self) -> pd.DataFrame:
+        n = self.n
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = n * self.sum_xy - self.sum_x * self.sum_x.T
+            var = n * self.sum_xx - self.sum_x ** 2
+            corr = cov / np.sqrt(var * var.T)
+
+        corr[(n < 2) | ~np.isfinite(corr)] = np.nan
+        corr = np.clip(corr, -1, 1)
+        np.fill_diagonal(corr, np.where(np.diag(n) >= 2, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
+
+
+def row_sample(df: pd.DataFrame, n: int) -> pd.DataFrame:
+    """
+    n rows of df drawn without replacement, in their original order.
+    Costs O(n) rather than a permutation of every row like df.sample.
+    """
+
+    positions = np.random.default_rng(0).choice(len(df), size=n, replace=False)
+    return df.take(np.sort(positions))
+
+
+def correlation_matrix(df: pd.DataFrame, method="pearson", sample_rows=DEFAULT_SAMPLE_ROWS,
+                       chunk_rows=DEFAULT_CHUNK_ROWS, deadline=None):
+    """
+    Correlation matrix of the numeric columns of df.
+
+    At most sample_rows rows are used (None for every row), processed in
+    chunks of chunk_rows. method="spearman" ranks the sampled rows first.
+    Returns None when time.perf_counter() passes deadline between chunks.
+    """
+
+    if method not in CORRELATION_METHODS:
+        raise ValueError(f"method must be one of {CORRELATION_METHODS}")
+
+    numeric = df.select_dtypes(include="number")
+    numeric = numeric.loc[:, [not pd.api.types.is_bool_dtype(d) for d in numeric.dtypes]]
+
+    if sample_rows is not None and len(numeric) > sample_rows:
+        numeric = row_sample(numeric, sample_rows)
+    if method == "spearman":
+        numeric = numeric.rank()
+
+    accumulator = CorrelationAccumulator(numeric.columns)
+    for start in range(0, len(numeric), chunk_rows):
+        if deadline is not None and time.perf_counter() > deadline:
+            return None
+        accumulator.update(numeric.iloc[start:start + chunk_rows])
+    return accumulator.finalize()
+
+
+def top_pairs(corr: pd.DataFrame, k=20, min_abs=0.0) -> list:
+    """
+    The k strongest column pairs as (column, column, r), strongest first.
+    """
+
+    values = corr.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    strength = np.abs(values[rows, cols])
+    keep = np.isfinite(strength) & (strength >= min_abs)
+    rows, cols, strength = rows[keep], cols[keep], strength[keep]
+
+    order = np.argsort(-strength, kind="stable")[:k]
+    names = corr.columns
+    return [(names[rows[i]], names[cols[i]], float(values[rows[i], cols[i]])) for i in order]
+
+
+def correlation_clusters(corr: pd.DataFrame, threshold=0.5) -> list:
+    """
+    Groups of columns linked by |r| >= threshold (connected components),
+    largest first. Columns without a strong partner are left out.
+    """
+
+    linked = np.abs(corr.to_numpy()) >= threshold
+    np.fill_diagonal(linked, False)
+
+    labels = np.full(len(linked), -1)
+    clusters = []
+    for start in np.flatnonzero(linked.any(axis=1)):
+        if labels[start] >= 0:
+            continue
+        labels[start] = len(clusters)
+        members, frontier = [start], [start]
+        while len(frontier):
+            neighbours = np.flatnonzero(linked[frontier].any(axis=0) & (labels < 0))
+            labels[neighbours] = len(clusters)
+            members.extend(neighbours)
+            frontier = neighbours
+        clusters.append([corr.columns[i] for i in sorted(members)])
+
+    return sorted(clusters, key=len, reverse=True)
+
+
+def focus_block(corr: pd.DataFrame, max_columns=20, threshold=0.5) -> pd.DataFrame:
+    """
+    Sub-matrix with at most max_columns columns worth plotting.
+
+    Columns from strong clusters come first, grouped together, then the
+    remaining columns of the strongest pairs.
+    """
+
+    if len(corr) <= max_columns:
+        return corr
+
+    selected = []
+    for cluster in correlation_clusters(corr, threshold):
+        selected.extend(cluster)
+    for a, b, _ in top_pairs(corr, k=max_columns):
+        selected.extend([a, b])
+
+    columns = list(dict.fromkeys(selected))[:max_columns]
+    if len(columns) < 2:
+        columns = list(corr.columns[:max_columns])
+    return corr.loc[columns, columns]
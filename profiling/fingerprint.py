@@ -0,0 +1,182 @@
+'''
+Row fingerprints: one vectorized 64-bit hash per row.
+A single hashing pass serves the duplicate count (profiling), the duplicate
+mask and deduplication (cleaning), and incremental dedup across streamed chunks.
+'''
+import numpy as np
+import pandas as pd
+
+
+# Integers up to this magnitude survive a round trip through float64
+FLOAT_EXACT_INT = 2 ** 53
+
+
+def numeric_keys(series: pd.Series) -> np.ndarray:
+    """
+    One uint64 key per value of a numeric series that depends on the value,
+    not the dtype: the float64 bit pattern when the value is exactly a
+    float64 (so 1 and 1.0 agree across chunks), and a hash of the integer
+    itself otherwise.
+    """
+
+    missing = series.isna().to_numpy()
+
+    if pd.api.types.is_integer_dtype(series.dtype):
+        unsigned = pd.api.types.is_unsigned_integer_dtype(series.dtype)
+        ints = series.to_numpy(dtype=np.uint64 if unsigned else np.int64, na_value=0)
+        floats = ints.astype(np.float64)
+        exact = (ints <= FLOAT_EXACT_INT) if unsigned else (ints >= -FLOAT_EXACT_INT) & (ints <= FLOAT_EXACT_INT)
+    else:
+        floats = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        exact = None
+
+    # +0.0 for -0.0 and a single NaN pattern, so equal values share a key
+    floats = floats + 0.0
+    floats[missing | np.isnan(floats)] = np.nan
+    keys = floats.view(np.uint64).copy()
+
+    if exact is not None and not exact.all():
+        inexact = ~exact & ~missing
+        keys[inexact] = pd.util.hash_array(ints[inexact])
+    return keys
+
+
+def row_fingerprints(df: pd.DataFrame) -> np.ndarray:
+    """
+    Hash every row of df to a uint64 fingerprint.
+    Numbers are keyed by value, so the same row read as int in one chunk and
+    as float in another gets the same fingerprint, while integers too large
+    for float64 (e.g. 64-bit IDs above 2**53) stay distinct.
+    """
+
+    numeric = [
+        position for position, dtype in enumerate(df.dtypes)
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+    ]
+    if numeric:
+        df = df.copy(deep=False)
+        for position in numeric:
+            df.isetitem(position, numeric_keys(df.iloc[:, position]))
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def duplicate_mask(fingerprints: np.ndarray) -> np.ndarray:
+    """
+    True for every row whose fingerprint already appeared earlier,
+    matching DataFrame.duplicated(keep="first").
+    """
+
+    return pd.Series(fingerprints).duplicated().to_numpy()
+
+
+def count_duplicates(fingerprints: np.ndarray) -> int:
+    return int(duplicate_mask(fingerprints).sum())
+
+
+def drop_duplicate_rows(df: pd.DataFrame, fingerprints=None) -> pd.DataFrame:
+    """
+    Return df without duplicate rows, using precomputed fingerprints if given.
+    """
+
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df)
+    return df[~duplicate_mask(fingerprints)]
+
+
+class HashSet:
+    """
+    Mergeable set of 64-bit hashes backed by sorted NumPy arrays.
+
+    Uses 8 bytes per distinct value instead of a Python object per value.
+    Values live in a few disjoint sorted levels whose sizes shrink
+    geometrically, so inserts and membership tests stay cheap as it grows.
+    """
+
+    def __init__(self):
+        self._levels = []
+
+    def add(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+        new = np.unique(np.asarray(hashes, dtype=np.uint64))
+        self._insert(new[~self.contains(new)])
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """
+        Vectorized membership test for an array of hashes.
+        """
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        found = np.zeros(len(hashes), dtype=bool)
+
+        for level in self._levels:
+            positions = np.searchsorted(level, hashes)
+            positions[positions == len(level)] = 0
+            found |= level[positions] == hashes
+
+        return found
+
+    def merge(self, other: "HashSet"):
+        for level in other._levels:
+            self.add(level)
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self._levels)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(level.nbytes for level in self._levels)
+
+    def _insert(self, new: np.ndarray):
+        # new must be sorted and disjoint from every existing level
+        if len(new) == 0:
+            return
+
+        self._levels.append(new)
+        while len(self._levels) > 1 and len(self._levels[-2]) <= 2 * len(self._levels[-1]):
+            top = self._levels.pop()
+            below = self._levels.pop()
+            self._levels.append(np.sort(np.concatenate([below, top]), kind="stable"))
+
+
+class DuplicateTracker:
+    """
+    Incremental dedup across streamed chunks.
+
+    Each call to filter() returns the chunk without rows seen in this chunk
+    or any earlier one; rows and duplicates hold the running totals.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.duplicates = 0
+        self.fingerprints = HashSet()
+
+    def mask(self, chunk: pd.DataFrame, fingerprints=None) -> np.ndarray:
+        """
+        Duplicate mask for a chunk against itself and all earlier chunks.
+        The chunk's fingerprints are recorded as seen.
+        """
+
+        if fingerprints is None:
+            fingerprints = row_fingerprints(chunk)
+
+        mask = duplicate_mask(fingerprints) | self.fingerprints.contains(fingerprints)
+        self.fingerprints._insert(np.sort(fingerprints[~mask]))
+
+        self.rows += len(fingerprints)
+        self.duplicates += int(mask.sum())
+        return mask
+
+    def filter(self, chunk: pd.DataFrame, fingerprints=None) -> pd.DataFrame:
+        return chunk[~self.mask(chunk, fingerprints)]
+
+    def merge(self, other: "DuplicateTracker"):
+        """
+        Combine trackers built on separate partitions; duplicates between
+        the partitions are counted from the merged fingerprint set.
+        """
+
+        self.rows += other.rows
+        self.fingerprints.merge(other.fingerprints)
+        self.duplicates = self.rows - len(self.fingerprints)
@@ -0,0 +1,96 @@
+'''
+Incremental profiling for datasets that grow by appended rows.
+A profile keeps its accumulators and the row fingerprints of the frame it
+described. When a later upload starts with exactly those rows, only the
+appended rows are folded into a copy of the accumulators; the result equals
+profile_dataset on the whole frame.
+'''
+import copy
+
+import numpy as np
+import pandas as pd
+
+from profiling.fingerprint import row_fingerprints
+from profiling.streaming import ProfileAccumulator
+
+
+def compatible_dtypes(old, new) -> bool:
+    """
+    True when a column read as old earlier and as new now can hold the same
+    values in the shared rows: the same dtype, or numbers that were widened
+    (int to float when appended rows bring missing values).
+    """
+
+    if old == new:
+        return True
+    return all(
+        pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+        for d in (old, new)
+    )
+
+
+def appended_rows(previous_fingerprints: np.ndarray, previous_dtypes: dict,
+                  df: pd.DataFrame, fingerprints: np.ndarray):
+    """
+    Number of rows df appends to the frame that had previous_fingerprints
+    and previous_dtypes, or None when df is not that frame plus new rows.
+    """
+
+    rows = len(previous_fingerprints)
+    if list(df.columns) != list(previous_dtypes) or len(df) < rows:
+        return None
+    if not all(compatible_dtypes(previous_dtypes[col], df[col].dtype) for col in df.columns):
+        return None
+    if not np.array_equal(fingerprints[:rows], previous_fingerprints):
+        return None
+    return len(df) - rows
+
+
+class ProfileState:
+    """
+    Profile accumulator of a frame together with its row fingerprints and
+    dtypes, so a longer version of the frame can be profiled incrementally.
+    """
+
+    def __init__(self, accumulator: ProfileAccumulator, fingerprints: np.ndarray, dtypes: dict):
+        self.accumulator = accumulator
+        self.fingerprints = fingerprints
+        self.dtypes = dtypes
+        # Rows taken over from the previous state in the run that built this one
+        self.reused_rows = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self.fingerprints.nbytes + self.accumulator.nbytes
+
+
+def profile_incremental(df: pd.DataFrame, fingerprints=None, state=None):
+    """
+    Profile df like profile_dataset, reusing state from an earlier run when
+    df is that run's frame with rows appended.
+    Returns (metadata, new ProfileState); new_state.reused_rows tells how
+    many rows were not profiled again.
+    """
+
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df)
+
+    start = None
+    if state is not None:
+        appended = appended_rows(state.fingerprints, state.dtypes, df, fingerprints)
+        if appended is not None:
+            start = len(df) - appended
+
+    if start is None:
+        accumulator = ProfileAccumulator()
+        start = 0
+    else:
+        # The previous state stays valid for other versions of the file
+        accumulator = copy.deepcopy(state.accumulator)
+
+    if start < len(df) or start == 0:
+        accumulator.update(df.iloc[start:], fingerprints[start:])
+
+    new_state = ProfileState(accumulator, fingerprints, df.dtypes.to_dict())
+    new_state.reused_rows = start
+    return accumulator.finalize(df.index), new_state
@@ -4,18 +4,33 @@ by providing dictionary with json data.
 '''
 import pandas as pd
 import numpy as np
-from ydata_profiling import ProfileReport
 
-def profile_dataset(df: pd.DataFrame) -> dict:
- 
+from profiling.fingerprint import count_duplicates, row_fingerprints
+from profiling.sketches import HyperLogLog, SpaceSaving, hash_series, sketch_metadata
+
+# Rows fed to the heavy-hitter sketch at a time in sketch mode
+SKETCH_BATCH_ROWS = 65_536
+
+
+def profile_dataset(df: pd.DataFrame, sketch=False, distinct_error=0.01, top_k=10,
+                    fingerprints=None) -> dict:
+    """
+    Profile a DataFrame into a metadata dictionary.
+    With sketch=True, distinct counts come from HyperLogLog and sample_values
+    from a Space-Saving heavy-hitter summary instead of exact hashing.
+    Pass cached row fingerprints to skip rehashing rows for the duplicate count.
+    """
 
     row_count = df.shape[0]
 
+    if fingerprints is None:
+        fingerprints = row_fingerprints(df)
+
     profile_data = {
         "dataset": {
             "row_count": row_count,
             "column_count": df.shape[1],
-            "duplicate_rows": int(df.duplicated().sum()),
+            "duplicate_rows": count_duplicates(fingerprints),
             "memory_usage_mb": round(df.memory_usage(deep=True).sum() / (1024 ** 2), 2),
         },
         "columns": [],
@@ -26,11 +41,33 @@ def profile_dataset(df: pd.DataFrame) -> dict:
         },
     }
 
+    if sketch:
+        profile_data["sketch"] = {
+            "distinct_relative_error": distinct_error,
+            "top_k": top_k,
+        }
+
     for col in df.columns:
         series = df[col]
 
         missing_pct = round(series.isnull().mean() * 100, 2)
-        unique_values = int(series.nunique(dropna=True))
+
+        if sketch:
+            values = series.dropna()
+            hashes = hash_series(values, dropna=False)
+
+            distinct = HyperLogLog.from_error(distinct_error)
+            distinct.add(hashes)
+            heavy = SpaceSaving(top_k)
+            for start in range(0, len(values), SKETCH_BATCH_ROWS):
+                stop = start + SKETCH_BATCH_ROWS
+                heavy.add(values.iloc[start:stop], hashes[start:stop])
+
+            unique_values = min(distinct.estimate(), len(values))
+            sample_values = [value for value, _, _ in heavy.top(3)]
+        else:
+            unique_values = int(series.nunique(dropna=True))
+            sample_values = series.dropna().unique()[:3].tolist()
 
         # Semantic type detection
         is_numeric = pd.api.types.is_numeric_dtype(series)
@@ -42,28 +79,105 @@ def profile_dataset(df: pd.DataFrame) -> dict:
             "dtype": str(series.dtype),
             "missing_pct": missing_pct,
             "unique_values": unique_values,
-            "sample_values": series.dropna().unique()[:3].tolist(),
+            "sample_values": sample_values,
             "is_numeric": is_numeric,
             "is_categorical": is_categorical,
             "is_datetime": is_datetime,
         }
+        column_metadata.update(value_stats(series))
+
+        if sketch:
+            column_metadata["sketch"] = sketch_metadata(distinct, heavy)
 
-        profile_data["columns"].append(column_metadata)
+        add_column_metadata(profile_data, column_metadata, row_count)
 
-        # Flags
-        if missing_pct > 30:
-            profile_data["flags"]["high_missing_columns"].append(col)
+    return profile_data
 
-        if unique_values <= 1:
-            profile_data["flags"]["constant_columns"].append(col)
 
-        if unique_values >= 0.95 * row_count:
-            profile_data["flags"]["possible_id_columns"].append(col)
+def value_stats(series: pd.Series) -> dict:
+    """
+    Storage-relevant statistics for one column: min and max for numbers,
+    the longest text length for text, and whether any datetime carries a
+    time of day.
+    """
 
-    return profile_data
+    values = series.dropna()
+    if values.empty:
+        return {}
+
+    if pd.api.types.is_bool_dtype(series):
+        return {}
+
+    if pd.api.types.is_numeric_dtype(series):
+        # Plain Python numbers; Arrow-backed columns return them already,
+        # NumPy columns return NumPy scalars
+        scalar = int if pd.api.types.is_integer_dtype(series) else float
+        return {"min": scalar(values.min()), "max": scalar(values.max())}
+
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return {"has_time": bool((values != values.dt.normalize()).any())}
+
+    return {"max_length": int(values.astype(str).str.len().max())}
+
+
+def merge_value_stats(left: dict, right: dict) -> dict:
+    """
+    Combine value_stats from two partitions of the same column.
+    Statistics that only one side has are dropped, since they no longer
+    describe every value.
+    """
+
+    merged = {}
+    if "min" in left and "min" in right:
+        merged["min"] = min(left["min"], right["min"])
+        merged["max"] = max(left["max"], right["max"])
+    if "max_length" in left and "max_length" in right:
+        merged["max_length"] = max(left["max_length"], right["max_length"])
+    if "has_time" in left and "has_time" in right:
+        merged["has_time"] = left["has_time"] or right["has_time"]
+    return merged
+
+
+def add_column_metadata(profile_data: dict, column_metadata: dict, row_count: int):
+    """
+    Append one column's metadata to a profile and raise its quality flags.
+    """
+
+    col = column_metadata["name"]
+    missing_pct = column_metadata["missing_pct"]
+    unique_values = column_metadata["unique_values"]
+
+    profile_data["columns"].append(column_metadata)
+
+    # Flags
+    if missing_pct > 30:
+        profile_data["flags"]["high_missing_columns"].append(col)
+
+    if unique_values <= 1:
+        profile_data["flags"]["constant_columns"].append(col)
+
+    if unique_values >= 0.95 * row_count:
+        profile_data["flags"]["possible_id_columns"].append(col)
+
+
+
+def generate_profile_report(df, engine="native", metadata=None, tier="sampled",
+                            time_budget=10.0, progress=None):
+    """
+    Build the HTML profiling report.
+    engine="native" renders the fast tiered report from profiling.report;
+    engine="ydata" builds the full ydata-profiling report (slow on large data).
+    """
+
+    if engine == "ydata":
+        # Optional heavy dependency, only imported when explicitly requested
+        from ydata_profiling import ProfileReport
 
+        profile = ProfileReport(df, explorative=True)
+        return profile.to_html()
 
+    from profiling.report import generate_native_report
 
-def generate_profile_report(df):
-    profile = ProfileReport(df, explorative=True)
-    return profile.to_html()
+    return generate_native_report(
+        df, metadata=metadata, tier=tier, time_budget=time_budget, progress=progress
+    )
@@ -0,0 +1,305 @@
+'''
+Native HTML profiling report.
+Builds on profile_dataset metadata plus vectorized NumPy histograms and
+quantiles, and renders from string templates. A tier selector trades detail
+for speed and a time budget keeps large datasets responsive.
+'''
+import html
+import time
+from string import Template
+
+import numpy as np
+import pandas as pd
+
+from profiling.correlation import correlation_matrix, focus_block, row_sample
+from profiling.profiler import profile_dataset
+
+
+REPORT_TIERS = ("minimal", "sampled", "full")
+
+DEFAULT_TIME_BUDGET = 10.0
+DEFAULT_SAMPLE_ROWS = 100_000
+HISTOGRAM_BINS = 30
+TOP_CATEGORIES = 10
+
+# Wider datasets show only the most strongly correlated block of columns
+MAX_CORRELATION_COLUMNS = 30
+
+# Written into reports cut short by the time budget; data values are always
+# escaped, so only the report itself can produce this comment
+TRUNCATED_MARKER = "<!-- truncated by time budget -->"
+
+
+PAGE_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+$truncated
+<head>
+    <meta charset="utf-8">
+    <title>Data Profiling Report</title>
+    <style>
+        body { font-family: "Segoe UI", Arial, sans-serif; background-color: #f4f6f9;
+               margin: 0; padding: 40px; color: #2c3e50; }
+        h1 { text-align: center; color: #1f4fd8; }
+        .report { max-width: 1200px; margin: auto; }
+        .card { background-color: #ffffff; padding: 25px; margin-bottom: 30px;
+                border-radius: 12px; box-shadow: 0 4px 12px rgba(0, 0, 0, 0.08); }
+        .meta { color: #7f8c8d; font-size: 0.9rem; text-align: center; }
+        table { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+        th, td { border-bottom: 1px solid #e0e0e0; padding: 6px 10px; text-align: left; }
+        .flag { color: #d62728; font-weight: 600; }
+        .grid { display: flex; gap: 30px; flex-wrap: wrap; }
+        .grid > div { flex: 1; min-width: 280px; }
+        svg rect { fill: #1f77b4; }
+    </style>
+</head>
+<body>
+    <h1>Data Profiling Report</h1>
+    <p class="meta">$meta</p>
+    <div class="report">
+        $overview
+        $flags
+        $columns
+        $correlations
+    </div>
+</body>
+</html>
+""")
+
+OVERVIEW_TEMPLATE = Template("""
+<div class="card">
+    <h2>Overview</h2>
+    <table>
+        <tr><th>Rows</th><td>$rows</td></tr>
+        <tr><th>Columns</th><td>$columns</td></tr>
+        <tr><th>Duplicate rows</th><td>$duplicates</td></tr>
+        <tr><th>Memory usage</th><td>$memory MB</td></tr>
+    </table>
+</div>
+""")
+
+COLUMN_TEMPLATE = Template("""
+<div class="card">
+    <h3>$name <small>($dtype)</small></h3>
+    <div class="grid">
+        <div><table>$summary</table></div>
+        <div>$details</div>
+    </div>
+</div>
+""")
+
+
+def _row(label, value) -> str:
+    return f"<tr><th>{html.escape(str(label))}</th><td>{html.escape(str(value))}</td></tr>"
+
+
+def _histogram_svg(counts: np.ndarray, width=360, height=120) -> str:
+    """
+    Render histogram counts as a static inline SVG bar chart.
+    """
+
+    if len(counts) == 0 or counts.max() == 0:
+        return ""
+
+    bar_width = width / len(counts)
+    scale = height / counts.max()
+    bars = "".join(
+        f"<rect x='{i * bar_width:.1f}' y='{height - c * scale:.1f}' "
+        f"width='{max(bar_width - 1, 1):.1f}' height='{c * scale:.1f}'></rect>"
+        for i, c in enumerate(counts)
+    )
+    return f"<svg width='{width}' height='{height}'>{bars}</svg>"
+
+
+def numeric_details(series: pd.Series, bins=HISTOGRAM_BINS):
+    """
+    Quantiles, moments and a histogram for one numeric column.
+    Returns (summary rows, details html).
+    """
+
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return "", ""
+
+    quantiles = np.quantile(values, [0, 0.25, 0.5, 0.75, 1])
+    rows = [
+        _row("Mean", round(float(values.mean()), 4)),
+        _row("Std", round(float(values.std()), 4)),
+        _row("Min", round(float(quantiles[0]), 4)),
+        _row("25%", round(float(quantiles[1]), 4)),
+        _row("Median", round(float(quantiles[2]), 4)),
+        _row("75%", round(float(quantiles[3]), 4)),
+        _row("Max", round(float(quantiles[4]), 4)),
+        _row("Zeros", int((values == 0).sum())),
+    ]
+
+    counts, _ = np.histogram(values, bins=bins)
+    return "".join(rows), _histogram_svg(counts)
+
+
+def categorical_details(series: pd.Series, top=TOP_CATEGORIES):
+    """
+    Most frequent values for one categorical column.
+    """
+
+    counts = series.value_counts(dropna=True).head(top)
+    if counts.empty:
+        return "", ""
+
+    total = len(series)
+    rows = "".join(
+        _row(value, f"{count} ({count / total * 100:.1f}%)")
+        for value, count in counts.items()
+    )
+    return "", f"<table><tr><th>Top values</th><th>Count</th></tr>{rows}</table>"
+
+
+def datetime_details(series: pd.Series, bins=HISTOGRAM_BINS):
+    values = series.dropna()
+    if values.empty:
+        return "", ""
+
+    counts, _ = np.histogram(values.to_numpy().astype("datetime64[ns]").astype(np.int64), bins=bins)
+    rows = _row("First", values.min()) + _row("Last", values.max())
+    return rows, _histogram_svg(counts)
+
+
+def correlation_table(df: pd.DataFrame, deadline=None):
+    """
+    Correlation card html, or None when deadline passed while computing it.
+    """
+
+    corr = correlation_matrix(df, deadline=deadline)
+    if corr is None:
+        return None
+    if len(corr) < 2:
+        return ""
+
+    corr = focus_block(corr, max_columns=MAX_CORRELATION_COLUMNS).round(2)
+    header = "".join(f"<th>{html.escape(str(c))}</th>" for c in corr.columns)
+    body = "".join(
+        f"<tr><th>{html.escape(str(name))}</th>"
+        + "".join(f"<td>{value}</td>" for value in row)
+        + "</tr>"
+        for name, row in zip(corr.index, corr.to_numpy())
+    )
+    return (
+        "<div class='card'><h2>Correlations</h2>"
+        f"<table><tr><th></th>{header}</tr>{body}</table></div>"
+    )
+
+
+def generate_native_report(df: pd.DataFrame, metadata=None, tier="sampled",
+                           time_budget=DEFAULT_TIME_BUDGET,
+                           sample_rows=DEFAULT_SAMPLE_ROWS, progress=None) -> str:
+    """
+    Render a standalone HTML profiling report.
+
+    tier="minimal" renders only the profile_dataset metadata, "sampled"
+    adds distributions computed on at most sample_rows rows, and "full"
+    uses every row and adds a correlation table. Column details stop once
+    time_budget seconds have passed; remaining columns keep their metadata.
+    The budget is soft: it is checked before each column's details and
+    between correlation chunks, so computing metadata (when not given) or
+    one column's details still runs to completion once started.
+    progress, if given, is called as progress(fraction, message) per column.
+    """
+
+    if tier not in REPORT_TIERS:
+        raise ValueError(f"tier must be one of {REPORT_TIERS}")
+
+    started = time.perf_counter()
+    deadline = started + time_budget
+
+    if metadata is None:
+        metadata = profile_dataset(df)
+
+    data = df
+    if tier == "sampled" and len(df) > sample_rows:
+        data = row_sample(df, sample_rows)
+
+    dataset = metadata["dataset"]
+    flags = metadata["flags"]
+
+    overview = OVERVIEW_TEMPLATE.substitute(
+        rows=dataset["row_count"],
+        columns=dataset["column_count"],
+        duplicates=dataset["duplicate_rows"],
+        memory=dataset["memory_usage_mb"],
+    )
+
+    flag_rows = "".join(
+        _row(name.replace("_", " ").capitalize(), ", ".join(map(str, cols)))
+        for name, cols in flags.items() if cols
+    )
+    flags_html = (
+        f"<div class='card'><h2>Data Quality Flags</h2><table class='flag'>{flag_rows}</table></div>"
+        if flag_rows else ""
+    )
+
+    column_parts = []
+    skipped = 0
+    for position, col in enumerate(metadata["columns"]):
+        if progress is not None:
+            progress(position / max(len(metadata["columns"]), 1), f"Profiling {col['name']}")
+
+        summary = (
+            _row("Missing", f"{col['missing_pct']}%")
+            + _row("Unique values", col["unique_values"])
+            + _row("Sample values", ", ".join(map(str, col["sample_values"])))
+        )
+        details = ""
+
+        if tier != "minimal" and col["name"] in data.columns:
+            if time.perf_counter() > deadline:
+                skipped += 1
+            else:
+                series = data[col["name"]]
+                if col["is_numeric"] and not pd.api.types.is_bool_dtype(series):
+                    extra, details = numeric_details(series)
+                elif col["is_datetime"]:
+                    extra, details = datetime_details(series)
+                else:
+                    extra, details = categorical_details(series)
+                summary += extra
+
+        column_parts.append(COLUMN_TEMPLATE.substitute(
+            name=html.escape(str(col["name"])),
+            dtype=html.escape(col["dtype"]),
+            summary=summary,
+            details=details,
+        ))
+
+    correlations = ""
+    correlations_skipped = False
+    if tier == "full":
+        correlations = correlation_table(data, deadline=deadline)
+        if correlations is None:
+            correlations, correlations_skipped = "", True
+
+    meta = f"Tier: {tier}"
+    if data is not df:
+        meta += f" · distributions from a {len(data)}-row sample"
+    if skipped:
+        meta += f" · time budget reached, details skipped for {skipped} columns"
+    if correlations_skipped:
+        meta += " · time budget reached, correlations skipped"
+    meta += f" · generated in {time.perf_counter() - started:.2f}s"
+
+    return PAGE_TEMPLATE.substitute(
+        truncated=TRUNCATED_MARKER if skipped or correlations_skipped else "",
+        meta=html.escape(meta),
+        overview=overview,
+        flags=flags_html,
+        columns="".join(column_parts),
+        correlations=correlations,
+    )
+
+
+def report_truncated(report_html: str) -> bool:
+    """
+    Whether a native report left out details because of its time budget.
+    Such a report depends on server load, so it should not be stored.
+    """
+
+    return TRUNCATED_MARKER in report_html
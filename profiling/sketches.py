@@ -0,0 +1,195 @@
+'''
+Mergeable approximate sketches used by the profiler's sketch mode.
+HyperLogLog estimates distinct counts and Space-Saving tracks heavy hitters,
+both in fixed memory and both mergeable across chunks or partitions.
+'''
+import math
+
+import numpy as np
+import pandas as pd
+
+from profiling.fingerprint import numeric_keys
+
+
+def hash_series(series: pd.Series, dropna=True) -> np.ndarray:
+    """
+    Hash non-null values of a series to uint64.
+    Numbers are hashed by value (see fingerprint.numeric_keys), so 1 and 1.0
+    from different chunks collide while 64-bit IDs above 2**53 stay distinct.
+    Pass dropna=False when the series is already known to hold no nulls.
+    """
+
+    values = series.dropna() if dropna else series
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        values = pd.Series(numeric_keys(values), copy=False)
+
+    # categorize=False hashes values directly instead of factorizing them first
+    return pd.util.hash_pandas_object(values, index=False, categorize=False).to_numpy()
+
+
+def precision_for_error(relative_error: float) -> int:
+    """
+    Smallest HyperLogLog precision whose standard error is <= relative_error.
+    """
+
+    precision = math.ceil(math.log2((1.04 / relative_error) ** 2))
+    return min(max(precision, 4), 18)
+
+
+def _leading_zeros(values: np.ndarray) -> np.ndarray:
+    # Vectorized count of leading zero bits in uint64 values
+    values = values.copy()
+    zeros = np.zeros(len(values), dtype=np.uint8)
+
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = values < np.uint64(1 << (64 - shift))
+        zeros[mask] += shift
+        values[mask] <<= np.uint64(shift)
+
+    zeros[values == 0] = 64
+    return zeros
+
+
+class HyperLogLog:
+    """
+    HyperLogLog distinct-count sketch over 64-bit hashes.
+    Uses 2 ** precision one-byte registers; standard error is 1.04 / sqrt(m).
+    """
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @classmethod
+    def from_error(cls, relative_error: float) -> "HyperLogLog":
+        return cls(precision_for_error(relative_error))
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def add(self, hashes: np.ndarray):
+        if len(hashes) == 0:
+            return
+
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.int64)
+        remainder = hashes << np.uint64(self.precision)
+
+        rank = np.minimum(_leading_zeros(remainder), 64 - self.precision) + 1
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def __len__(self) -> int:
+        return self.estimate()
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+
+        # Small-range correction via linear counting
+        empty = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and empty:
+            return int(round(m * math.log(m / empty)))
+
+        return int(round(raw))
+
+
+class SpaceSaving:
+    """
+    Mergeable Space-Saving summary of the k most frequent values.
+
+    Values are tracked by their 64-bit hash with one representative value kept
+    per tracked hash. Every reported count overestimates the true count by at
+    most the value in errors, and by at most total / k overall.
+    """
+
+    def __init__(self, k=10):
+        self.k = k
+        self.counts = {}
+        self.errors = {}
+        self.values = {}
+        self.total = 0
+
+        # Upper bound on the count of any value not currently tracked
+        self.floor = 0
+
+    def add(self, series: pd.Series, hashes=None):
+        """
+        Fold a batch of values in. When hashes from hash_series are passed,
+        series must be the matching non-null values.
+        """
+
+        if hashes is None:
+            values = series.dropna()
+            hashes = hash_series(values, dropna=False)
+        else:
+            values = series
+        if len(hashes) == 0:
+            return
+
+        counts = pd.Series(hashes).value_counts(sort=True)
+
+        # Keep the batch's top-k exactly; the rest is bounded by the (k+1)th count
+        chunk = SpaceSaving(self.k)
+        chunk.total = int(counts.sum())
+        chunk.counts = {int(h): int(c) for h, c in counts.head(self.k).items()}
+        chunk.floor = int(counts.iloc[self.k]) if len(counts) > self.k else 0
+        chunk.errors = {h: chunk.floor for h in chunk.counts}
+
+        for h in chunk.counts:
+            position = int(np.argmax(hashes == np.uint64(h)))
+            chunk.values[h] = values.iloc[position:position + 1].tolist()[0]
+
+        self.merge(chunk)
+
+    def merge(self, other: "SpaceSaving"):
+        floor_self = self.floor
+        floor_other = other.floor
+
+        counts, errors = {}, {}
+        for h in set(self.counts) | set(other.counts):
+            counts[h] = self.counts.get(h, floor_self) + other.counts.get(h, floor_other)
+            errors[h] = self.errors.get(h, floor_self) + other.errors.get(h, floor_other)
+
+        top = sorted(counts, key=counts.get, reverse=True)
+        kept = top[:self.k]
+
+        spill = counts[top[self.k]] if len(top) > self.k else 0
+        self.floor = max(floor_self + floor_other, spill)
+        self.counts = {h: counts[h] for h in kept}
+        self.errors = {h: errors[h] for h in kept}
+        self.values = {h: self.values.get(h, other.values.get(h)) for h in kept}
+        self.total += other.total
+
+    @property
+    def max_error(self) -> int:
+        return self.total // self.k if self.k else self.total
+
+    def top(self, n=None) -> list:
+        """
+        Return (value, estimated_count, max_overestimate) sorted by count.
+        """
+
+        ranked = sorted(self.counts, key=self.counts.get, reverse=True)
+        return [(self.values[h], self.counts[h], self.errors[h]) for h in ranked[:n]]
+
+
+def sketch_metadata(distinct: HyperLogLog, heavy: SpaceSaving) -> dict:
+    """
+    Error bounds and heavy hitters reported alongside a sketched column.
+    """
+
+    return {
+        "distinct_relative_error": round(distinct.relative_error, 4),
+        "top_values": [[value, count] for value, count, _ in heavy.top()],
+        "top_count_max_error": heavy.max_error,
+    }
@@ -0,0 +1,238 @@
+'''
+Out-of-core profiling for files that do not fit in memory.
+The file is read in fixed-size chunks and every chunk is folded into mergeable
+accumulators, so the raw data never has to fit in memory. With sketch=True the
+accumulators are fixed-size and peak memory follows the chunk size; exact mode
+still keeps an 8-byte hash per distinct value of each column and per row (for
+duplicate detection), so its memory grows with the file.
+The finalized output has the same shape as profile_dataset.
+'''
+import numpy as np
+import pandas as pd
+
+from profiling.fingerprint import DuplicateTracker, HashSet
+from profiling.profiler import add_column_metadata, merge_value_stats, value_stats
+from profiling.sketches import HyperLogLog, SpaceSaving, hash_series, sketch_metadata
+
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def _merged_dtype(dtypes: list):
+    # dtype object behind merge_dtypes; pandas extension dtypes (Arrow
+    # strings, category, Int64) are kept as they are, not passed to np.dtype
+    unique = list(dict.fromkeys(dtypes))
+    if len(unique) == 1:
+        return unique[0]
+
+    if all(
+        pd.api.types.is_numeric_dtype(d) and not pd.api.types.is_bool_dtype(d)
+        for d in unique
+    ):
+        return np.result_type(*unique)
+
+    return np.dtype(object)
+
+
+def merge_dtypes(dtypes: list) -> str:
+    """
+    Resolve the dtype a single read_csv call would have produced for a column
+    that was read with different dtypes across chunks.
+    """
+
+    return str(_merged_dtype(dtypes))
+
+
+class ColumnAccumulator:
+    """
+    Running per-column statistics: row and missing counts, distinct values,
+    first sample values, value ranges and the dtypes seen in each chunk.
+    """
+
+    def __init__(self, name, sketch=False, distinct_error=0.01, top_k=10):
+        self.name = name
+        self.rows = 0
+        self.missing = 0
+        self.distinct = HyperLogLog.from_error(distinct_error) if sketch else HashSet()
+        self.heavy = SpaceSaving(top_k) if sketch else None
+        self.sample_values = []
+        self.dtypes = []
+        self.is_datetime = True
+        self.stats = None
+
+    def update(self, series: pd.Series):
+        self.rows += len(series)
+        self.missing += int(series.isnull().sum())
+        values = series.dropna()
+        hashes = hash_series(values, dropna=False)
+        self.distinct.add(hashes)
+        self.dtypes.append(series.dtype)
+
+        if self.heavy is not None:
+            self.heavy.add(values, hashes)
+
+        if len(values):
+            stats = value_stats(values)
+            self.stats = stats if self.stats is None else merge_value_stats(self.stats, stats)
+
+        if not pd.api.types.is_datetime64_any_dtype(series):
+            self.is_datetime = False
+
+        if len(self.sample_values) < 3:
+            for value in series.dropna().unique()[:3].tolist():
+                if value not in self.sample_values and len(self.sample_values) < 3:
+                    self.sample_values.append(value)
+
+    def merge(self, other: "ColumnAccumulator"):
+        self.rows += other.rows
+        self.missing += other.missing
+        self.distinct.merge(other.distinct)
+        self.dtypes.extend(other.dtypes)
+
+        if self.heavy is not None:
+            self.heavy.merge(other.heavy)
+        if self.stats is None or other.stats is None:
+            self.stats = self.stats or other.stats
+        else:
+            self.stats = merge_value_stats(self.stats, other.stats)
+        self.is_datetime = self.is_datetime and other.is_datetime
+
+        for value in other.sample_values:
+            if value not in self.sample_values and len(self.sample_values) < 3:
+                self.sample_values.append(value)
+
+    def finalize(self) -> dict:
+        merged = _merged_dtype(self.dtypes) if self.dtypes else np.dtype(object)
+        is_datetime = bool(self.dtypes) and self.is_datetime
+        is_numeric = not is_datetime and pd.api.types.is_numeric_dtype(merged)
+
+        column_metadata = {
+            "name": self.name,
+            "dtype": str(merged),
+            "missing_pct": round(self.missing / self.rows * 100, 2) if self.rows else 0.0,
+            "unique_values": min(len(self.distinct), self.rows - self.missing),
+            "sample_values": list(self.sample_values),
+            "is_numeric": is_numeric,
+            "is_categorical": not is_numeric and not is_datetime,
+            "is_datetime": is_datetime,
+        }
+        column_metadata.update(self.stats or {})
+
+        if self.heavy is not None:
+            column_metadata["sample_values"] = [v for v, _, _ in self.heavy.top(3)]
+            column_metadata["sketch"] = sketch_metadata(self.distinct, self.heavy)
+
+        return column_metadata
+
+
+class ProfileAccumulator:
+    """
+    Mergeable accumulator producing the profile_dataset metadata dict.
+
+    Chunks can be folded in with update() in any order, and accumulators built
+    on separate partitions can be combined with merge().
+    """
+
+    def __init__(self, sketch=False, distinct_error=0.01, top_k=10):
+        self.rows = 0
+        self.memory_bytes = 0
+        self.columns = {}
+        self.duplicates = DuplicateTracker()
+
+        self.sketch = sketch
+        self.distinct_error = distinct_error
+        self.top_k = top_k
+
+    def update(self, chunk: pd.DataFrame, fingerprints=None):
+        self.rows += len(chunk)
+        self.memory_bytes += int(chunk.memory_usage(deep=True, index=False).sum())
+        self.duplicates.mask(chunk, fingerprints)
+
+        for col in chunk.columns:
+            if col not in self.columns:
+                self.columns[col] = ColumnAccumulator(
+                    col, self.sketch, self.distinct_error, self.top_k
+                )
+            self.columns[col].update(chunk[col])
+
+    @property
+    def nbytes(self) -> int:
+        # Fingerprint and distinct-value sets; sketches are fixed and small
+        return self.duplicates.fingerprints.nbytes + sum(
+            acc.distinct.nbytes for acc in self.columns.values()
+            if isinstance(acc.distinct, HashSet)
+        )
+
+    def merge(self, other: "ProfileAccumulator"):
+        self.rows += other.rows
+        self.memory_bytes += other.memory_bytes
+        self.duplicates.merge(other.duplicates)
+
+        for col, acc in other.columns.items():
+            if col in self.columns:
+                self.columns[col].merge(acc)
+            else:
+                self.columns[col] = acc
+
+    def finalize(self, index=None) -> dict:
+        """
+        The profile_dataset metadata of the accumulated rows. Like
+        profile_dataset, memory_usage_mb counts the frame's index: pass it
+        as index, or a RangeIndex is assumed (as for CSV chunks read in order).
+        """
+
+        if index is None:
+            index = pd.RangeIndex(self.rows)
+        memory_bytes = self.memory_bytes + int(index.memory_usage(deep=True))
+
+        profile_data = {
+            "dataset": {
+                "row_count": self.rows,
+                "column_count": len(self.columns),
+                "duplicate_rows": self.duplicates.duplicates,
+                "memory_usage_mb": round(memory_bytes / (1024 ** 2), 2),
+            },
+            "columns": [],
+            "flags": {
+                "high_missing_columns": [],
+                "constant_columns": [],
+                "possible_id_columns": [],
+            },
+        }
+
+        if self.sketch:
+            profile_data["sketch"] = {
+                "distinct_relative_error": self.distinct_error,
+                "top_k": self.top_k,
+            }
+
+        for acc in self.columns.values():
+            add_column_metadata(profile_data, acc.finalize(), self.rows)
+
+        return profile_data
+
+
+def profile_chunks(chunks, sketch=False, distinct_error=0.01, top_k=10) -> dict:
+    """
+    Profile an iterable of DataFrame chunks (e.g. CSV chunks or Parquet
+    record batches) into the profile_dataset metadata structure.
+    """
+
+    accumulator = ProfileAccumulator(sketch, distinct_error, top_k)
+
+    for chunk in chunks:
+        accumulator.update(chunk)
+
+    return accumulator.finalize()
+
+
+def profile_csv_in_chunks(source, chunksize=DEFAULT_CHUNK_SIZE, sketch=False,
+                          distinct_error=0.01, top_k=10, **read_csv_kwargs) -> dict:
+    """
+    Profile a CSV file (path or file-like) without loading it into memory.
+    Returns the same metadata structure as profile_dataset; sketch=True bounds
+    per-column memory with HyperLogLog and Space-Saving summaries.
+    """
+
+    chunks = pd.read_csv(source, chunksize=chunksize, **read_csv_kwargs)
+    return profile_chunks(chunks, sketch, distinct_error, top_k)
@@ -0,0 +1,121 @@
+'''
+In-process execution of the generated EDA queries.
+The DataFrame is converted to Arrow once per dataset and registered in an
+in-memory DuckDB connection, which scans the Arrow buffers without copying
+them. Results are cached per (dataset key, table name, query), so reopening
+the SQL view or re-running the same statements is instant.
+'''
+import re
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+DEFAULT_MAX_RESULT_ROWS = 1000
+
+# Warehouse sampling in the generated SQL, rewritten to DuckDB syntax. Rows are
+# sampled individually: DuckDB's SYSTEM sampling keeps whole 2048-row vectors,
+# which returns nothing at 1% of a small uploaded dataset.
+TABLESAMPLE_PATTERN = re.compile(r"TABLESAMPLE SYSTEM \(([\d.]+)\)")
+RAND_PATTERN = re.compile(r"\bRAND\(\)")
+
+
+def duckdb_sql(sql: str) -> str:
+    sql = TABLESAMPLE_PATTERN.sub(r"TABLESAMPLE \1% (bernoulli)", sql)
+    return RAND_PATTERN.sub("random()", sql)
+
+
+class QueryExecutor:
+    """
+    DuckDB runner with an LRU result cache shared across sessions.
+
+    Each run opens a fresh in-memory connection, so concurrent sessions
+    never share a connection; the Arrow tables and results are shared.
+    """
+
+    def __init__(self, max_results=512, max_tables=4, max_result_rows=DEFAULT_MAX_RESULT_ROWS):
+        self.max_results = max_results
+        self.max_tables = max_tables
+        self.max_result_rows = max_result_rows
+
+        self._results = OrderedDict()
+        self._tables = OrderedDict()
+        self._lock = threading.Lock()
+
+    def run(self, dataset_key, df: pd.DataFrame, statements, table_name="dataset") -> list:
+        """
+        Execute statements (a list of (title, sql) pairs) against df.
+
+        Returns (title, sql, result, error) tuples in order; result is a
+        DataFrame of at most max_result_rows rows, or None when the
+        statement failed with error.
+        """
+
+        outcomes = [None] * len(statements)
+        pending = []
+
+        with self._lock:
+            for position, (title, sql) in enumerate(statements):
+                key = (dataset_key, table_name, sql)
+                if key in self._results:
+                    self._results.move_to_end(key)
+                    outcomes[position] = (title, sql) + self._results[key]
+                else:
+                    pending.append(position)
+
+        if pending:
+            import duckdb
+
+            connection = duckdb.connect()
+            try:
+                connection.register(table_name, self._arrow_table(dataset_key, df))
+                for position in pending:
+                    title, sql = statements[position]
+                    outcome = self._execute(connection, sql)
+                    outcomes[position] = (title, sql) + outcome
+                    self._store((dataset_key, table_name, sql), outcome)
+            finally:
+                connection.close()
+
+        return outcomes
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self._tables.clear()
+
+    # ---------- internals ----------
+
+    def _arrow_table(self, dataset_key, df):
+        import pyarrow as pa
+
+        with self._lock:
+            if dataset_key in self._tables:
+                self._tables.move_to_end(dataset_key)
+                return self._tables[dataset_key]
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+
+        with self._lock:
+            self._tables[dataset_key] = table
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        return table
+
+    def _execute(self, connection, sql):
+        import duckdb
+
+        try:
+            relation = connection.sql(duckdb_sql(sql.strip().rstrip(";")))
+            if relation is None:
+                return None, None
+            return relation.limit(self.max_result_rows).df(), None
+        except duckdb.Error as error:
+            return None, str(error).splitlines()[0]
+
+    def _store(self, key, outcome):
+        with self._lock:
+            self._results[key] = outcome
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
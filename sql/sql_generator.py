@@ -1,11 +1,117 @@
-def sql_type(dtype, dialect="ANSI"):
-    if "int" in dtype:
-        return "INTEGER"
+SQL_DIALECTS = ("ANSI", "PostgreSQL", "MySQL", "DuckDB")
+
+SMALLINT_RANGE = (-2 ** 15, 2 ** 15 - 1)
+INTEGER_RANGE = (-2 ** 31, 2 ** 31 - 1)
+BIGINT_RANGE = (-2 ** 63, 2 ** 63 - 1)
+
+# Declared VARCHAR widths: the observed max length is rounded up to the next
+# step so small growth in later loads still fits
+VARCHAR_STEPS = (16, 32, 64, 128, 255, 512, 1024, 2048, 4000)
+
+# Longest VARCHAR per dialect before switching to a large-text type
+# (MySQL rows are capped at 65535 bytes, so wide text goes to TEXT there;
+# DuckDB ignores VARCHAR widths, so text is always plain VARCHAR)
+MAX_VARCHAR = {"ANSI": 4000, "PostgreSQL": 4000, "MySQL": 255, "DuckDB": 0}
+
+DIALECT_TYPES = {
+    "ANSI": {
+        "double": "DOUBLE PRECISION", "real": "REAL", "boolean": "BOOLEAN",
+        "date": "DATE", "timestamp": "TIMESTAMP", "timestamptz": "TIMESTAMP WITH TIME ZONE",
+        "text": "CLOB",
+    },
+    "PostgreSQL": {
+        "double": "DOUBLE PRECISION", "real": "REAL", "boolean": "BOOLEAN",
+        "date": "DATE", "timestamp": "TIMESTAMP", "timestamptz": "TIMESTAMPTZ",
+        "text": "TEXT",
+    },
+    "MySQL": {
+        "double": "DOUBLE", "real": "FLOAT", "boolean": "BOOLEAN",
+        # MySQL TIMESTAMP stops in 2038; DATETIME covers years 1000-9999
+        "date": "DATE", "timestamp": "DATETIME", "timestamptz": "DATETIME",
+        "text": "MEDIUMTEXT",
+    },
+    "DuckDB": {
+        "double": "DOUBLE", "real": "REAL", "boolean": "BOOLEAN",
+        "date": "DATE", "timestamp": "TIMESTAMP", "timestamptz": "TIMESTAMPTZ",
+        "text": "VARCHAR",
+    },
+}
+
+
+def _integer_type(low, high):
+    for name, (min_value, max_value) in (
+        ("SMALLINT", SMALLINT_RANGE),
+        ("INTEGER", INTEGER_RANGE),
+        ("BIGINT", BIGINT_RANGE),
+    ):
+        if low >= min_value and high <= max_value:
+            return name
+    return "DECIMAL(20, 0)"
+
+
+def _varchar_type(max_length, dialect):
+    types = DIALECT_TYPES[dialect]
+    if max_length is None:
+        return types["text"]
+
+    width = next((step for step in VARCHAR_STEPS if step >= max_length), None)
+    if width is None or width > MAX_VARCHAR[dialect]:
+        if dialect == "MySQL" and max_length <= 16383:
+            return "TEXT"
+        return types["text"]
+    return f"VARCHAR({width})"
+
+
+ARROW_TYPE_NAMES = {"double": "float64", "float": "float32", "halffloat": "float16"}
+
+
+def _is_bool(dtype) -> bool:
+    return dtype in ("bool", "boolean", "bool[pyarrow]")
+
+
+def sql_type(dtype, dialect="ANSI", stats=None):
+    """
+    Map a pandas dtype to a column type for the given dialect.
+
+    stats is the column's profile metadata; when it carries value ranges,
+    text lengths or time-of-day information the narrowest safe type is
+    used (SMALLINT/INTEGER/BIGINT, VARCHAR(n), DATE vs TIMESTAMP).
+    """
+
+    if dialect not in DIALECT_TYPES:
+        raise ValueError(f"dialect must be one of {SQL_DIALECTS}")
+
+    types = DIALECT_TYPES[dialect]
+    stats = stats or {}
+
+    # Arrow-backed columns ("int64[pyarrow]", "double[pyarrow]") by their NumPy names
+    if dtype.endswith("[pyarrow]"):
+        dtype = dtype[:-len("[pyarrow]")]
+        dtype = ARROW_TYPE_NAMES.get(dtype, dtype)
+
+    if _is_bool(dtype):
+        return types["boolean"]
+
+    if "int" in dtype.lower():
+        if "min" in stats:
+            return _integer_type(stats["min"], stats["max"])
+        if dtype.lower() in ("int8", "int16", "uint8"):
+            return "SMALLINT"
+        if dtype.lower() in ("int32", "uint16"):
+            return "INTEGER"
+        return "BIGINT"
+
     if "float" in dtype:
-        return "FLOAT"
+        return types["real"] if dtype.endswith("32") else types["double"]
+
     if "datetime" in dtype:
-        return "TIMESTAMP"
-    return "VARCHAR(255)"
+        if "," in dtype:
+            return types["timestamptz"]
+        if stats.get("has_time") is False:
+            return types["date"]
+        return types["timestamp"]
+
+    return _varchar_type(stats.get("max_length"), dialect)
 
 
 def generate_create_table(metadata, table_name, dialect="ANSI"):
@@ -16,7 +122,7 @@ def generate_create_table(metadata, table_name, dialect="ANSI"):
 
     for col in cols:
         col_defs.append(
-            f"  {col['name']} {sql_type(col['dtype'], dialect)}"
+            f"  {col['name']} {sql_type(col['dtype'], dialect, col)}"
         )
 
     lines.append(",\n".join(col_defs))
@@ -25,13 +131,240 @@ def generate_create_table(metadata, table_name, dialect="ANSI"):
     return "\n".join(lines)
 
 
-def generate_sql_queries(metadata, table_name="dataset", dialect="ANSI"):
+def generate_bulk_load(metadata, table_name, file_name, dialect="ANSI"):
+    """
+    Bulk-load statement for a CSV written by DataFrame.to_csv(index=False):
+    COPY for PostgreSQL and DuckDB, LOAD DATA for MySQL. Returns None for
+    ANSI, which has no standard bulk loader.
+    """
+
+    names = [col["name"] for col in metadata["columns"]]
+
+    if dialect == "DuckDB":
+        return (
+            f"COPY {table_name} ({', '.join(map(str, names))})\n"
+            f"FROM '{file_name}'\n"
+            f"(FORMAT csv, HEADER true, NULLSTR '');"
+        )
+
+    if dialect == "PostgreSQL":
+        # Server-side path; use \copy with the same options from psql on a client machine
+        return (
+            f"COPY {table_name} ({', '.join(map(str, names))})\n"
+            f"FROM '{file_name}'\n"
+            f"WITH (FORMAT csv, HEADER true, NULL '');"
+        )
+
+    if dialect == "MySQL":
+        # Read every field into a variable so empty fields become NULL, not 0 or ''
+        assignments = []
+        for position, col in enumerate(metadata["columns"]):
+            field = f"@v{position}"
+            if position == len(names) - 1:
+                # CRLF files leave the carriage return on the last field
+                field = f"TRIM(TRAILING '\\r' FROM {field})"
+            if _is_bool(col["dtype"]):
+                # Every spelling the Arrow CSV reader parses as a boolean
+                flag = f"LOWER(TRIM({field}))"
+                value = f"CASE WHEN {flag} IN ('true', '1') THEN 1 WHEN {flag} IN ('false', '0') THEN 0 END"
+            else:
+                value = f"NULLIF({field}, '')"
+            assignments.append(f"  {col['name']} = {value}")
+
+        variables = ", ".join(f"@v{position}" for position in range(len(names)))
+        return (
+            f"LOAD DATA LOCAL INFILE '{file_name}'\n"
+            f"INTO TABLE {table_name}\n"
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"'\n"
+            "LINES TERMINATED BY '\\n'\n"
+            "IGNORE 1 LINES\n"
+            f"({variables})\n"
+            "SET\n" + ",\n".join(assignments) + ";"
+        )
+
+    return None
+
+
+SQL_MODES = ("per_column", "batched", "approximate")
+
+# Aggregate expressions per batched SELECT; PostgreSQL allows at most 1664
+# target-list entries, SQLite 2000 result columns
+MAX_SELECT_EXPRESSIONS = 1000
+
+# Approximate mode: percent of the table sampled, rows per frequency query
+DEFAULT_SAMPLE_PERCENT = 1
+TOP_K_FREQUENCIES = 20
+
+# Median expression per dialect; standard SQL and MySQL have none
+MEDIAN = {
+    "PostgreSQL": "PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY {col})",
+    "DuckDB": "MEDIAN({col})",
+}
+
+# Approximate mode only: sketch-based aggregates, which are engine extensions
+# rather than standard SQL. PostgreSQL and MySQL have none without extensions.
+APPROX_MEDIAN = {"DuckDB": "APPROX_QUANTILE({col}, 0.5)"}
+APPROX_COUNT_DISTINCT = {"DuckDB": "APPROX_COUNT_DISTINCT({col})"}
+
+
+def _numeric_aggregates(col, dialect, approximate=False):
+    aggregates = [
+        f"MIN({col}) AS min_{col}",
+        f"MAX({col}) AS max_{col}",
+        f"AVG({col}) AS avg_{col}",
+    ]
+    median = (approximate and APPROX_MEDIAN.get(dialect)) or MEDIAN.get(dialect)
+    if median:
+        aggregates.append(f"{median.format(col=col)} AS median_{col}")
+    return aggregates
+
+
+def _per_column_profile(columns, numeric_cols, table_name, dialect):
+    statements = [("Row count", f"SELECT COUNT(*) AS row_count FROM {table_name};")]
+
+    # Missing values
+    for col in columns:
+        statements.append((
+            f"Missing values in {col['name']}",
+            f"SELECT COUNT(*) AS missing_{col['name']} "
+            f"FROM {table_name} WHERE {col['name']} IS NULL;",
+        ))
+
+    # Numeric stats
+    for col in numeric_cols:
+        if dialect in MEDIAN:
+            statements.append((
+                f"Stats for {col}",
+                f"SELECT "
+                f"MIN({col}), MAX({col}), AVG({col}), "
+                f"{MEDIAN[dialect].format(col=col)} AS median "
+                f"FROM {table_name};",
+            ))
+        else:
+            statements.append((
+                f"Stats for {col}",
+                f"SELECT MIN({col}), MAX({col}), AVG({col}) "
+                f"FROM {table_name};",
+            ))
+
+    return statements
+
+
+def _batched_selects(expressions, source, label=""):
+    batches = [
+        expressions[start:start + MAX_SELECT_EXPRESSIONS]
+        for start in range(0, len(expressions), MAX_SELECT_EXPRESSIONS)
+    ]
+
+    statements = []
+    for number, batch in enumerate(batches, start=1):
+        scan = "single scan" if len(batches) == 1 else f"scan {number} of {len(batches)}"
+        title = f"Missing values and numeric stats ({label}{scan})"
+        select_list = ",\n  ".join(batch)
+        statements.append((title, f"SELECT\n  {select_list}\nFROM {source};"))
+
+    return statements
+
+
+def generate_batched_profile(columns, numeric_cols, table_name, dialect="ANSI"):
+    """
+    Missing-value counts and numeric stats for every column in as few table
+    scans as possible: one SELECT per MAX_SELECT_EXPRESSIONS aggregates.
+    COUNT(*) - COUNT(col) counts NULLs without a WHERE clause per column.
+    """
+
+    expressions = ["COUNT(*) AS row_count"]
+    expressions += [
+        f"COUNT(*) - COUNT({col['name']}) AS missing_{col['name']}" for col in columns
+    ]
+    for col in numeric_cols:
+        expressions += _numeric_aggregates(col, dialect)
+
+    return _batched_selects(expressions, table_name)
+
+
+def sampled_source(table_name, dialect="ANSI", sample_percent=DEFAULT_SAMPLE_PERCENT):
+    """
+    FROM-clause source reading about sample_percent of the table.
+    TABLESAMPLE SYSTEM samples whole storage blocks, so unread blocks are
+    never scanned; MySQL has no TABLESAMPLE and filters rows with RAND().
+    DuckDB samples rows, as its SYSTEM method keeps whole 2048-row vectors.
+    """
+
+    if dialect == "DuckDB":
+        return f"{table_name} TABLESAMPLE {sample_percent:g}% (bernoulli)"
+    if dialect == "MySQL":
+        return f"{table_name} WHERE RAND() < {sample_percent / 100:g}"
+    return f"{table_name} TABLESAMPLE SYSTEM ({sample_percent:g})"
+
+
+def generate_approximate_profile(columns, numeric_cols, categorical_cols, table_name,
+                                 dialect="ANSI", sample_percent=DEFAULT_SAMPLE_PERCENT,
+                                 top_k=TOP_K_FREQUENCIES):
+    """
+    Profile queries for very large tables, all computed on a block sample:
+    one scan for missing values, numeric stats and distinct counts, then a
+    LIMIT-bounded top-k query per categorical column. Counts are sample
+    counts and the median (where the dialect has one) is that of the
+    sample. DuckDB uses its approximate median and distinct count; other
+    dialects count distinct values exactly, as standard SQL has no sketches.
+    """
+
+    source = sampled_source(table_name, dialect, sample_percent)
+    label = f"{sample_percent:g}% sample, "
+
+    expressions = ["COUNT(*) AS sampled_rows"]
+    expressions += [
+        f"COUNT(*) - COUNT({col['name']}) AS missing_{col['name']}" for col in columns
+    ]
+    for col in numeric_cols:
+        expressions += _numeric_aggregates(col, dialect, approximate=True)
+
+    distinct = APPROX_COUNT_DISTINCT.get(dialect, "COUNT(DISTINCT {col})")
+    expressions += [f"{distinct.format(col=col)} AS distinct_{col}" for col in categorical_cols]
+
+    statements = _batched_selects(expressions, source, label)
+
+    for col in categorical_cols:
+        statements.append((
+            f"Top {top_k} values of {col} ({sample_percent:g}% sample)",
+            f"SELECT {col}, COUNT(*) AS frequency "
+            f"FROM {source} "
+            f"GROUP BY {col} "
+            f"ORDER BY frequency DESC "
+            f"LIMIT {top_k};",
+        ))
+
+    return statements
+
+
+def generate_sql_statements(metadata, table_name="dataset", dialect="ANSI", mode="per_column",
+                            sample_percent=DEFAULT_SAMPLE_PERCENT):
+    """
+    Build the EDA statements as a list of (title, sql) pairs.
+    The first statement is always the schema definition.
+
+    mode="per_column" emits one query per missing-value check and numeric
+    column; mode="batched" folds the row count, all missing-value counts
+    and numeric stats into a single scan (or a few on very wide tables).
+    mode="approximate" runs the batched scan and top-k frequency queries on
+    a sample_percent block sample and skips possible ID columns entirely.
+    """
+
+    if mode not in SQL_MODES:
+        raise ValueError(f"mode must be one of {SQL_MODES}")
+    if not 0 < sample_percent <= 100:
+        raise ValueError("sample_percent must be in (0, 100]")
+
     columns = metadata["columns"]
     flags = metadata["flags"]
 
+    # Booleans count as numeric in the profile but are declared BOOLEAN,
+    # which has no AVG (and no MIN/MAX in PostgreSQL)
     numeric_cols = [
         c["name"] for c in columns
-        if c["is_numeric"] and c["name"] not in flags["possible_id_columns"]
+        if c["is_numeric"] and not _is_bool(c["dtype"])
+        and c["name"] not in flags["possible_id_columns"]
     ]
 
     categorical_cols = [
@@ -39,53 +372,58 @@ def generate_sql_queries(metadata, table_name="dataset", dialect="ANSI"):
         if c["is_categorical"]
     ]
 
-    queries = []
+    statements = []
 
     # CREATE TABLE
-    queries.append("-- Schema definition")
-    queries.append(generate_create_table(metadata, table_name, dialect))
+    statements.append(("Schema definition", generate_create_table(metadata, table_name, dialect)))
 
     # Basic inspection
-    queries.append("\n-- Preview data")
-    queries.append(f"SELECT * FROM {table_name} LIMIT 10;")
-
-    queries.append("\n-- Row count")
-    queries.append(f"SELECT COUNT(*) AS row_count FROM {table_name};")
+    statements.append(("Preview data", f"SELECT * FROM {table_name} LIMIT 10;"))
 
-    # Missing values
-    for col in columns:
-        queries.append(
-            f"\n-- Missing values in {col['name']}\n"
-            f"SELECT COUNT(*) AS missing_{col['name']} "
-            f"FROM {table_name} WHERE {col['name']} IS NULL;"
+    if mode == "approximate":
+        # High-cardinality ID columns make GROUP BY as large as the table
+        categorical_cols = [
+            col for col in categorical_cols if col not in flags["possible_id_columns"]
+        ]
+        statements += generate_approximate_profile(
+            columns, numeric_cols, categorical_cols, table_name, dialect, sample_percent
         )
+        return statements
 
-    # Numeric stats
-    for col in numeric_cols:
-        if dialect == "PostgreSQL":
-            queries.append(
-                f"\n-- Stats for {col}\n"
-                f"SELECT "
-                f"MIN({col}), MAX({col}), AVG({col}), "
-                f"PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY {col}) AS median "
-                f"FROM {table_name};"
-            )
-        else:
-            queries.append(
-                f"\n-- Stats for {col}\n"
-                f"SELECT MIN({col}), MAX({col}), AVG({col}) "
-                f"FROM {table_name};"
-            )
+    if mode == "batched":
+        # Row count, missing values and numeric stats in one scan
+        statements += generate_batched_profile(columns, numeric_cols, table_name, dialect)
+    else:
+        statements += _per_column_profile(columns, numeric_cols, table_name, dialect)
 
     # Categorical frequencies
     for col in categorical_cols:
-        queries.append(
-            f"\n-- Frequency distribution for {col}\n"
+        statements.append((
+            f"Frequency distribution for {col}",
             f"SELECT {col}, COUNT(*) AS frequency "
             f"FROM {table_name} "
             f"GROUP BY {col} "
-            f"ORDER BY frequency DESC;"
-        )
+            f"ORDER BY frequency DESC;",
+        ))
+
+    return statements
+
+
+def format_statements(statements) -> str:
+    return "\n\n".join(f"-- {title}\n{sql}" for title, sql in statements)
+
+
+def generate_sql_queries(metadata, table_name="dataset", dialect="ANSI", mode="per_column",
+                         load_file=None, sample_percent=DEFAULT_SAMPLE_PERCENT):
+    """
+    EDA queries as one SQL script. With load_file, a bulk-load statement for
+    that CSV follows the schema definition.
+    """
+
+    statements = generate_sql_statements(metadata, table_name, dialect, mode, sample_percent)
 
-    return "\n".join(queries)
+    load = generate_bulk_load(metadata, table_name, load_file, dialect) if load_file else None
+    if load:
+        statements.insert(1, (f"Bulk load {load_file}", load))
 
+    return format_statements(statements)
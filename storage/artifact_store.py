@@ -0,0 +1,358 @@
+'''
+Persistent store for expensive artifacts, shared by every session and server
+restart. Profile reports, dashboards, generated SQL and cleaned data are kept
+as content-addressed blob files, indexed in SQLite by dataset hash, operation
+and parameters. Identical outputs share one blob, and the least recently used
+artifacts are evicted once the store grows past its size quota.
+'''
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+
+from storage.dataset_cache import estimate_entry_size, hash_bytes, hash_file
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    operation TEXT NOT NULL,
+    params TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS artifacts_last_used ON artifacts (last_used);
+CREATE INDEX IF NOT EXISTS artifacts_blob ON artifacts (blob);
+CREATE INDEX IF NOT EXISTS artifacts_dataset ON artifacts (dataset);
+"""
+
+# Spool files older than this belong to jobs that never finished (cancelled
+# or killed) and are removed when a store is opened
+SPOOL_MAX_AGE = 24 * 3600
+
+
+def artifact_key(dataset_key: str, operation: str, params=None) -> str:
+    """
+    Index key of an artifact: a hash of the dataset key, the operation name
+    and the parameters as canonical JSON.
+    """
+
+    canonical = json.dumps(params or {}, sort_keys=True, default=str)
+    return hash_bytes("\0".join((dataset_key, operation, canonical)).encode("utf-8"))
+
+
+def _encode(value):
+    # Text and bytes are stored as is, so blobs can be inspected on disk
+    if isinstance(value, str):
+        return "text", value.encode("utf-8")
+    if isinstance(value, bytes):
+        return "bytes", value
+    return "pickle", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _estimated_size(value) -> int:
+    # In-memory size of a value about to be pickled, e.g. a cleaned frame
+    # with its summaries; a lower bound for objects it cannot measure
+    parts = value if isinstance(value, (tuple, list)) else (value,)
+    return estimate_entry_size(dict(enumerate(parts)))
+
+
+def _decode(kind, data):
+    if kind == "text":
+        return data.decode("utf-8")
+    if kind == "bytes":
+        return data
+    return pickle.loads(data)
+
+
+class ArtifactStore:
+    """
+    SQLite-indexed, content-addressed artifact store with a size quota.
+
+    Blobs live under root/blobs/<2 hex>/<hash> and are written atomically;
+    the index in root/index.sqlite maps artifact keys to blobs and records
+    when each artifact was last read. Writers are serialized by SQLite, so
+    several sessions and processes can share one store. Artifacts larger
+    than max_artifact_bytes are not stored. Large outputs can be written to
+    a spool_path() file and moved in with put_file, never held in memory;
+    spool files left behind are removed after SPOOL_MAX_AGE seconds.
+    """
+
+    def __init__(self, root, max_bytes=2 * 1024 ** 3, max_artifact_bytes=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_artifact_bytes = max_artifact_bytes or max_bytes // 4
+
+        self._local = threading.local()
+        os.makedirs(os.path.join(root, "blobs"), exist_ok=True)
+        os.makedirs(os.path.join(root, "spool"), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+        self._remove_stale_spool()
+
+    @property
+    def current_bytes(self) -> int:
+        # A blob shared by several artifacts is counted once
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT blob, size FROM artifacts)"
+            ).fetchone()
+        return row[0]
+
+    def __contains__(self, key) -> bool:
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM artifacts WHERE key = ?", (key,)).fetchone() is not None
+
+    def get(self, dataset_key, operation, params=None):
+        """
+        The stored artifact, or None. A hit marks it as recently used.
+        """
+
+        key = artifact_key(dataset_key, operation, params)
+        with self._connect() as conn:
+            row = conn.execute("SELECT blob, kind FROM artifacts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        blob, kind = row
+        try:
+            with open(self._blob_path(blob), "rb") as fh:
+                value = _decode(kind, fh.read())
+        except (OSError, pickle.UnpicklingError, EOFError, UnicodeDecodeError):
+            # Blob removed or damaged outside the store: forget the artifact
+            self.discard(key)
+            return None
+
+        with self._connect() as conn:
+            conn.execute("UPDATE artifacts SET last_used = ? WHERE key = ?", (time.time(), key))
+        return value
+
+    def put(self, dataset_key, operation, value, params=None):
+        """
+        Store value (str, bytes or any picklable object) and evict least
+        recently used artifacts beyond the quota. Returns the artifact key,
+        or None when the value exceeds max_artifact_bytes.
+        """
+
+        # Checked before pickling, so an oversized frame is not serialized
+        # only to be thrown away
+        if not isinstance(value, (str, bytes)) and _estimated_size(value) > self.max_artifact_bytes:
+            return None
+        kind, data = _encode(value)
+        if len(data) > self.max_artifact_bytes:
+            return None
+
+        blob = hash_bytes(data)
+        return self._add(dataset_key, operation, params, blob, kind, len(data),
+                         lambda: self._write_blob(blob, data))
+
+    def put_file(self, dataset_key, operation, path, params=None, kind="text"):
+        """
+        Move the file at path (e.g. a spool_path()) into the store as an
+        artifact of the given kind without reading it into memory. Returns
+        the artifact key, or None when the file exceeds max_artifact_bytes;
+        the file is then deleted.
+        """
+
+        size = os.path.getsize(path)
+        if size > self.max_artifact_bytes:
+            os.remove(path)
+            return None
+
+        blob = hash_file(path)
+        return self._add(dataset_key, operation, params, blob, kind, size,
+                         lambda: self._move_blob(blob, path))
+
+    def get_path(self, dataset_key, operation, params=None):
+        """
+        Path of the stored artifact's blob file, or None. A hit marks it as
+        recently used; the file can be evicted later, so open it promptly.
+        """
+
+        key = artifact_key(dataset_key, operation, params)
+        with self._connect() as conn:
+            row = conn.execute("SELECT blob FROM artifacts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+
+        path = self._blob_path(row[0])
+        if not os.path.exists(path):
+            self.discard(key)
+            return None
+
+        with self._connect() as conn:
+            conn.execute("UPDATE artifacts SET last_used = ? WHERE key = ?", (time.time(), key))
+        return path
+
+    def spool_path(self, suffix=".tmp"):
+        """
+        A fresh file path inside the store, for outputs to pass to put_file.
+        """
+
+        return os.path.join(self.root, "spool", uuid.uuid4().hex + suffix)
+
+    def _remove_stale_spool(self):
+        # Only old files: other sessions and processes may still be writing
+        # to recent ones
+        spool = os.path.join(self.root, "spool")
+        cutoff = time.time() - SPOOL_MAX_AGE
+        for entry in os.scandir(spool):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                pass
+
+    def get_or_compute(self, dataset_key, operation, compute, params=None):
+        """
+        The stored artifact, or compute() stored under the same key.
+        """
+
+        value = self.get(dataset_key, operation, params)
+        if value is None:
+            value = compute()
+            self.put(dataset_key, operation, value, params)
+        return value
+
+    def discard(self, key):
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT blob FROM artifacts WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+                self._release_blob(conn, row[0])
+
+    def discard_dataset(self, dataset_key):
+        """
+        Drop every artifact stored for dataset_key.
+        """
+
+        with self._connect() as conn:
+            keys = [
+                row[0] for row in
+                conn.execute("SELECT key FROM artifacts WHERE dataset = ?", (dataset_key,))
+            ]
+        for key in keys:
+            self.discard(key)
+
+    def clear(self):
+        with self._connect() as conn:
+            keys = [row[0] for row in conn.execute("SELECT key FROM artifacts")]
+        for key in keys:
+            self.discard(key)
+
+        # Spool files left by cancelled jobs or too large to store
+        spool = os.path.join(self.root, "spool")
+        for name in os.listdir(spool):
+            os.remove(os.path.join(spool, name))
+
+    # ---------- internals ----------
+
+    def _connect(self):
+        # One connection per thread; "with conn" commits or rolls back
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                os.path.join(self.root, "index.sqlite"), timeout=30, isolation_level=None
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return _Transaction(conn)
+
+    def _blob_path(self, blob):
+        return os.path.join(self.root, "blobs", blob[:2], blob)
+
+    def _add(self, dataset_key, operation, params, blob, kind, size, write):
+        # Index a blob created by write() and evict beyond the quota
+        key = artifact_key(dataset_key, operation, params)
+        now = time.time()
+
+        with self._connect() as conn:
+            # Holding the write lock while the blob is written keeps a
+            # concurrent eviction from removing it before it is indexed
+            conn.execute("BEGIN IMMEDIATE")
+            write()
+            previous = conn.execute("SELECT blob FROM artifacts WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, dataset_key, operation,
+                    json.dumps(params or {}, sort_keys=True, default=str),
+                    blob, kind, size, now, now,
+                ),
+            )
+            if previous is not None and previous[0] != blob:
+                self._release_blob(conn, previous[0])
+            self._evict(conn, keep=key)
+        return key
+
+    def _write_blob(self, blob, data):
+        path = self._blob_path(blob)
+        if os.path.exists(path):
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+
+    def _move_blob(self, blob, source):
+        # The spool is inside root, so the move is a rename
+        path = self._blob_path(blob)
+        if os.path.exists(path):
+            os.remove(source)
+            return
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(source, path)
+
+    def _release_blob(self, conn, blob):
+        # Delete the blob file once no artifact refers to it
+        if conn.execute("SELECT 1 FROM artifacts WHERE blob = ? LIMIT 1", (blob,)).fetchone() is None:
+            try:
+                os.remove(self._blob_path(blob))
+            except FileNotFoundError:
+                pass
+
+    def _evict(self, conn, keep):
+        # Least recently used first; the artifact just written always stays
+        total = conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT blob, size FROM artifacts)"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = conn.execute(
+            "SELECT key, blob, size FROM artifacts WHERE key != ? ORDER BY last_used", (keep,)
+        ).fetchall()
+        for key, blob, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            if conn.execute("SELECT 1 FROM artifacts WHERE blob = ? LIMIT 1", (blob,)).fetchone() is None:
+                total -= size
+                self._release_blob(conn, blob)
+
+
+class _Transaction:
+    # Context manager committing an explicit transaction on success and
+    # rolling it back on error; plain statements run in autocommit mode
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.conn.in_transaction:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        return False
@@ -0,0 +1,215 @@
+'''
+Content-addressed cache for uploaded datasets.
+Streamlit reruns the whole script on every interaction, so the parsed DataFrame,
+its profile metadata and the dataset summary are kept here, keyed by a hash of
+the upload bytes, instead of being rebuilt on every click.
+'''
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def hash_bytes(data) -> str:
+    """
+    Return a stable content hash for raw upload bytes.
+    """
+
+    hasher = hashlib.blake2b(digest_size=16)
+    view = memoryview(data)
+
+    for start in range(0, len(view), HASH_CHUNK_SIZE):
+        hasher.update(view[start:start + HASH_CHUNK_SIZE])
+
+    return hasher.hexdigest()
+
+
+def hash_file(path) -> str:
+    """
+    hash_bytes of a file's contents, read in chunks.
+    """
+
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+
+    return hasher.hexdigest()
+
+
+def estimate_entry_size(entry: dict) -> int:
+    """
+    Estimate the in-memory size of a cache entry in bytes.
+    """
+
+    size = 0
+    for value in entry.values():
+        if isinstance(value, pd.DataFrame):
+            size += int(value.memory_usage(deep=True).sum())
+        elif isinstance(value, np.ndarray):
+            size += value.nbytes
+        elif isinstance(value, (str, bytes)):
+            size += len(value)
+        elif hasattr(value, "nbytes"):
+            # e.g. the incremental profiling and cleaning states
+            size += int(value.nbytes)
+    return size
+
+
+class DatasetCache:
+    """
+    Size-bounded LRU cache of dataset artifacts with an optional on-disk tier.
+
+    Each entry is a dict (e.g. {"df": ..., "metadata": ..., "summary": ...})
+    stored under the content hash of the upload. When the in-memory budget is
+    exceeded the least recently used entries are evicted; if a disk directory
+    is configured they are pickled there on eviction (once, outside the lock)
+    and promoted back on the next hit.
+    """
+
+    def __init__(self, max_bytes=2 * 1024 ** 3, disk_dir=None, max_disk_bytes=20 * 1024 ** 3):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+
+        self._entries = OrderedDict()
+        self._sizes = {}
+        # Keys whose current entry also has an up-to-date pickle on disk
+        self._on_disk = set()
+        self._lock = threading.RLock()
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @property
+    def current_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def __contains__(self, key) -> bool:
+        with self._lock:
+            return key in self._entries or os.path.exists(self._disk_path(key) or "")
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+
+        entry = self._load_from_disk(key)
+        if entry is not None:
+            self._store(key, entry, on_disk=True)
+        return entry
+
+    def put(self, key, entry: dict):
+        # A pickle of an earlier entry under this key is now stale
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            os.remove(path)
+        self._store(key, entry, on_disk=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._sizes.pop(key, None)
+            self._on_disk.discard(key)
+
+        path = self._disk_path(key)
+        if path and os.path.exists(path):
+            os.remove(path)
+
+    def clear(self):
+        with self._lock:
+            keys = list(self._entries)
+
+        for key in keys:
+            self.discard(key)
+
+    # ---------- internals ----------
+
+    def _store(self, key, entry: dict, on_disk: bool):
+        size = estimate_entry_size(entry)
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            if on_disk:
+                self._on_disk.add(key)
+            else:
+                self._on_disk.discard(key)
+            evicted = self._evict()
+
+        # Pickling can take seconds for large frames; other sessions keep
+        # using the cache meanwhile
+        for evicted_key, evicted_entry in evicted:
+            self._write_to_disk(evicted_key, evicted_entry)
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it alone exceeds the budget.
+        # Returns the evicted entries that still need a copy on disk.
+        evicted = []
+        while len(self._entries) > 1 and self.current_bytes > self.max_bytes:
+            key, entry = self._entries.popitem(last=False)
+            self._sizes.pop(key, None)
+            if key in self._on_disk:
+                self._on_disk.discard(key)
+            elif self.disk_dir:
+                evicted.append((key, entry))
+        return evicted
+
+    def _disk_path(self, key):
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _load_from_disk(self, key):
+        path = self._disk_path(key)
+        if not path or not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, "rb") as fh:
+                entry = pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+
+        # Touch the file so disk eviction is also least-recently-used
+        os.utime(path)
+        return entry
+
+    def _write_to_disk(self, key, entry: dict):
+        path = self._disk_path(key)
+        if not path:
+            return
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(entry, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        self._evict_disk()
+
+    def _evict_disk(self):
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".pkl"):
+                path = os.path.join(self.disk_dir, name)
+                stat = os.stat(path)
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        files.sort()
+        total = sum(size for _, size, _ in files)
+
+        # Oldest first, but never remove the file that was just written
+        for _, size, path in files[:-1]:
+            if total <= self.max_disk_bytes:
+                break
+            os.remove(path)
+            total -= size
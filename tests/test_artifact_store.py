@@ -0,0 +1,112 @@
+import os
+import time
+
+import pandas as pd
+
+from storage.artifact_store import SPOOL_MAX_AGE, ArtifactStore, artifact_key
+
+
+def test_artifacts_survive_a_new_store_instance(tmp_path):
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", None]})
+    store = ArtifactStore(str(tmp_path))
+    store.put("data", "report", "<html>report</html>", {"tier": "sampled"})
+    store.put("data", "clean", (df, "summary"), {"compact": False})
+
+    reopened = ArtifactStore(str(tmp_path))
+    assert reopened.get("data", "report", {"tier": "sampled"}) == "<html>report</html>"
+    assert reopened.get("data", "report", {"tier": "full"}) is None
+
+    cleaned, summary = reopened.get("data", "clean", {"compact": False})
+    pd.testing.assert_frame_equal(cleaned, df)
+    assert summary == "summary"
+
+
+def test_identical_artifacts_share_one_blob(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put("one", "dashboard", b"x" * 1000)
+    store.put("two", "dashboard", b"x" * 1000)
+
+    assert store.current_bytes == 1000
+    store.discard(artifact_key("one", "dashboard"))
+    assert store.get("two", "dashboard") == b"x" * 1000
+
+
+def test_least_recently_used_artifacts_are_evicted(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_bytes=2500, max_artifact_bytes=1000)
+    for name in ("a", "b"):
+        store.put(name, "report", name * 1000)
+    store.get("a", "report")
+    store.put("c", "report", "c" * 1000)
+
+    assert store.get("b", "report") is None
+    assert store.get("a", "report") == "a" * 1000
+    assert store.current_bytes <= 2500
+    # Evicted blobs are deleted from disk
+    assert sum(len(files) for _, _, files in os.walk(tmp_path / "blobs")) == 2
+
+    assert store.put("d", "report", "d" * 1001) is None
+
+
+def test_missing_blob_is_a_miss(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    calls = []
+    compute = lambda: calls.append(1) or "sql"
+
+    assert store.get_or_compute("data", "sql", compute) == "sql"
+    for root, _, files in os.walk(tmp_path / "blobs"):
+        for name in files:
+            os.remove(os.path.join(root, name))
+
+    assert store.get_or_compute("data", "sql", compute) == "sql"
+    assert len(calls) == 2
+
+
+def test_oversized_frames_are_rejected_before_pickling(tmp_path, monkeypatch):
+    store = ArtifactStore(str(tmp_path), max_artifact_bytes=10_000)
+    df = pd.DataFrame({"a": range(5000)})
+
+    def fail(*args, **kwargs):
+        raise AssertionError("pickled an oversized artifact")
+
+    monkeypatch.setattr("storage.artifact_store.pickle.dumps", fail)
+    assert store.put("data", "clean", (df, "summary", {})) is None
+    assert store.current_bytes == 0
+
+
+def test_spooled_files_are_moved_into_the_store(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    store.put("one", "dashboard", "<html>page</html>", {"compact": True})
+
+    path = store.spool_path(".html")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("<html>page</html>")
+    store.put_file("two", "dashboard", path, {"compact": True})
+
+    # Moved, not copied, and deduplicated against the identical text artifact
+    assert not os.path.exists(path)
+    assert store.current_bytes == len("<html>page</html>")
+    assert store.get("two", "dashboard", {"compact": True}) == "<html>page</html>"
+    stored = store.get_path("two", "dashboard", {"compact": True})
+    assert stored == store.get_path("one", "dashboard", {"compact": True})
+    assert store.get_path("two", "dashboard") is None
+
+
+def test_rejected_and_stale_spool_files_are_removed(tmp_path):
+    store = ArtifactStore(str(tmp_path), max_artifact_bytes=10)
+
+    path = store.spool_path(".html")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("<html>too large</html>")
+    assert store.put_file("one", "dashboard", path) is None
+    assert not os.path.exists(path)
+
+    # Left behind by a cancelled job: removed once it is old enough
+    stale, recent = store.spool_path(), store.spool_path()
+    for spool in (stale, recent):
+        open(spool, "wb").close()
+    old = time.time() - SPOOL_MAX_AGE - 60
+    os.utime(stale, (old, old))
+
+    ArtifactStore(str(tmp_path))
+    assert not os.path.exists(stale)
+    assert os.path.exists(recent)
@@ -0,0 +1,129 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from cleaner.cleaner import clean_dataset
+
+
+def _raw_frame(rows=400):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "Amount": rng.normal(100, 10, rows).round(2).astype(str),
+        "Order Date": (np.datetime64("2020-01-01") + rng.integers(0, 900, rows)).astype(str),
+        "City": rng.choice([" Delhi", "MUMBAI ", "pune", "N/A"], rows),
+        "Mixed": rng.choice(["1", "x", "y", "2"], rows),
+    })
+
+
+def test_parallel_inference_matches_serial():
+    df = _raw_frame()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        serial = clean_dataset(df)
+        parallel = clean_dataset(df, n_jobs=2)
+
+    assert parallel.equals(serial)
+    assert str(serial["amount"].dtype) == "float64"
+    assert str(serial["order_date"].dtype).startswith("datetime64")
+    assert serial["city"].dtype == object
+
+
+def test_sampled_inference_matches_full_conversion(monkeypatch):
+    import cleaner.cleaner as cleaner_module
+
+    rng = np.random.default_rng(1)
+    rows = 20_000
+    df = pd.DataFrame({
+        "mostly_numeric": np.where(rng.random(rows) < 0.85, rng.integers(0, 99, rows).astype(str), "x"),
+        "borderline": np.where(rng.random(rows) < 0.75, rng.integers(0, 99, rows).astype(str), "x"),
+        "day_first": pd.Series(
+            pd.Timestamp("2021-01-01") + pd.to_timedelta(rng.integers(0, 500, rows), unit="D")
+        ).dt.strftime("%d/%m/%Y %H:%M"),
+        "text": rng.choice(["Alpha", " beta "], rows),
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        sampled = clean_dataset(df)
+        monkeypatch.setattr(cleaner_module, "INFERENCE_SAMPLE_SIZE", rows)
+        # The reference really screens every row
+        assert len(cleaner_module.stratified_sample(df["text"])) == rows
+        full = clean_dataset(df)
+
+    assert sampled.equals(full)
+    assert sampled.attrs["column_types"]["mostly_numeric"]["type"] == "numeric"
+    assert sampled.attrs["column_types"]["borderline"]["type"] == "text"
+    assert sampled.attrs["column_types"]["day_first"]["type"] == "datetime"
+    assert sampled.attrs["column_types"]["day_first"]["format"] is not None
+
+
+def test_missing_tokens_are_case_and_whitespace_insensitive():
+    df = pd.DataFrame({
+        "Code": ["A1", "N/A ", " null", "?", "B2"],
+        "Score": [1.0, 2.0, 3.0, 4.0, 5.0],
+    })
+    original = df.copy(deep=True)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        cleaned = clean_dataset(df)
+
+    assert cleaned["code"].isna().tolist() == [False, True, True, True, False]
+    # The caller's frame is left untouched despite the shallow copy
+    assert df.equals(original)
+    assert list(df.columns) == ["Code", "Score"]
+
+
+def test_compaction_shrinks_memory_without_changing_values():
+    rng = np.random.default_rng(2)
+    rows = 5_000
+    df = pd.DataFrame({
+        "count": rng.integers(0, 200, rows).astype(str),
+        "price": (rng.integers(0, 1000, rows) / 4).astype(str),
+        "ratio": rng.random(rows).astype(str),
+        "segment": rng.choice(["retail", "wholesale", "online"], rows),
+    })
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        plain = clean_dataset(df)
+        compact = clean_dataset(df, compact=True)
+
+    assert str(compact["count"].dtype) == "uint8"
+    assert str(compact["price"].dtype) == "float32"
+    assert str(compact["ratio"].dtype) == "float64"
+    assert str(compact["segment"].dtype) == "category"
+    assert compact.astype(plain.dtypes.to_dict()).equals(plain)
+
+    stats = compact.attrs["compaction"]
+    assert stats["after_bytes"] < stats["before_bytes"]
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_inference_reports_progress_and_can_be_cancelled(n_jobs):
+    df = _raw_frame()
+    calls = []
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        clean_dataset(df, n_jobs=n_jobs, progress=lambda fraction, message: calls.append(fraction))
+
+        def cancel(fraction, message):
+            if 0.2 < fraction < 0.8:
+                raise KeyboardInterrupt
+        with pytest.raises(KeyboardInterrupt):
+            clean_dataset(df, n_jobs=n_jobs, progress=cancel)
+
+    inference = [f for f in calls if 0.2 < f < 0.8]
+    assert inference and inference == sorted(inference)
+
+
+def test_numpy_string_values_are_inferred():
+    df = pd.DataFrame({
+        "day": pd.Series([np.str_("2024-01-02"), np.str_("2024-02-03")], dtype=object),
+        "code": pd.Series([np.str_("a"), np.str_("b")], dtype=object),
+    })
+    cleaned = clean_dataset(df)
+
+    assert str(cleaned["day"].dtype).startswith("datetime64")
+    assert list(cleaned["code"]) == ["a", "b"]
@@ -0,0 +1,67 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.correlation import (
+    CorrelationAccumulator,
+    correlation_clusters,
+    correlation_matrix,
+    focus_block,
+    top_pairs,
+)
+from visualization.visual_assets import MAX_HEATMAP_COLUMNS, generate_visualizations
+
+
+def _frame(rows=5000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(rows, 6)) + 1e6, columns=list("abcdef"))
+    df["b"] = df["a"] * 2 + rng.normal(size=rows) * 0.1
+    df["d"] = -df["b"] + rng.normal(size=rows)
+    df.iloc[::7, 2] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("method", ["pearson", "spearman"])
+def test_chunked_matrix_matches_pandas(method):
+    df = _frame()
+    result = correlation_matrix(df, method=method, chunk_rows=700)
+    assert np.allclose(result, df.corr(method=method), atol=1e-3)
+
+
+def test_merged_accumulators_match_single_pass():
+    df = _frame()
+    left, right = CorrelationAccumulator(df.columns), CorrelationAccumulator(df.columns)
+    left.update(df.iloc[:1000])
+    right.update(df.iloc[1000:] - 5)
+    right.update(df.iloc[:0])
+    left.merge(right)
+
+    shifted = pd.concat([df.iloc[:1000], df.iloc[1000:] - 5])
+    assert np.allclose(left.finalize(), shifted.corr(), atol=1e-5)
+
+
+def test_pairs_clusters_and_focus_block():
+    corr = correlation_matrix(_frame())
+
+    assert {top_pairs(corr, k=1)[0][0], top_pairs(corr, k=1)[0][1]} == {"a", "b"}
+    assert correlation_clusters(corr) == [["a", "b", "d"]]
+    assert list(focus_block(corr, max_columns=3).columns) == ["a", "b", "d"]
+
+
+def test_heatmap_is_limited_on_wide_frames():
+    rng = np.random.default_rng(0)
+    wide = pd.DataFrame(rng.normal(size=(500, 60)), columns=[f"c{i}" for i in range(60)])
+    wide["c59"] = wide["c0"] + 0.01
+
+    heatmap = generate_visualizations(wide)["correlation"]
+    assert len(heatmap.data[0].z) == MAX_HEATMAP_COLUMNS
+    assert "c0" in heatmap.data[0].x and "c59" in heatmap.data[0].x
+
+
+def test_deadline_abandons_the_matrix_between_chunks():
+    df = pd.DataFrame(np.random.default_rng(0).normal(size=(1000, 3)), columns=list("abc"))
+
+    assert correlation_matrix(df, chunk_rows=100, deadline=time.perf_counter() - 1) is None
+    assert correlation_matrix(df, chunk_rows=100, deadline=time.perf_counter() + 60) is not None
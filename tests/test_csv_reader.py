@@ -0,0 +1,82 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from cleaner.cleaner import clean_dataset
+from data_io.csv_reader import ArrowParseError, csv_header, dtype_hints, read_csv
+from profiling.profiler import profile_dataset
+
+
+def _csv():
+    rng = np.random.default_rng(0)
+    n = 3000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": rng.normal(size=n),
+        "city": rng.choice(["Delhi", "Pune", None, "N/A"], n),
+        "active": rng.choice([True, False], n),
+        "flag": rng.choice(["True", "False", ""], n),
+        "day": pd.date_range("2024-01-01", periods=n).astype(str),
+        "maybe": rng.choice([1, None], n),
+    })
+    return df.to_csv(index=False).encode()
+
+
+def _values(series):
+    return series.astype(object).where(series.notna(), None).tolist()
+
+
+def test_arrow_engine_matches_c_parser():
+    data = _csv()
+    expected = pd.read_csv(io.BytesIO(data), float_precision="round_trip")
+    result = read_csv(io.BytesIO(data), engine="pyarrow")
+
+    assert list(result.columns) == list(expected.columns)
+    for col in expected.columns:
+        assert _values(result[col]) == _values(expected[col]), col
+
+    # Text is Arrow-backed; dates stay text like pandas without parse_dates
+    assert result["city"].dtype == pd.StringDtype("pyarrow")
+    assert result["day"].dtype == pd.StringDtype("pyarrow")
+    assert result["id"].dtype == np.int64
+
+
+def test_profile_hints_round_trip_and_cleaning_matches():
+    data = _csv()
+    c_parsed = read_csv(io.BytesIO(data), engine="c")
+    hints = dtype_hints(profile_dataset(c_parsed))
+
+    assert hints == {"id": pa.int64(), "active": pa.bool_()}
+
+    hinted = read_csv(io.BytesIO(data), hints=hints, engine="pyarrow")
+    assert hinted.dtypes.equals(read_csv(io.BytesIO(data), engine="pyarrow").dtypes)
+
+    pd.testing.assert_frame_equal(clean_dataset(hinted), clean_dataset(c_parsed), check_exact=False)
+
+
+def test_hints_from_another_file_do_not_change_types():
+    old = b"code,amount,id,flag\nA1,1.5,1,true\nB2,2.5,2,false\n"
+    new = b"code,amount,id,flag\n00123,10,,\n00124,11,,\n"
+    hints = dtype_hints(profile_dataset(read_csv(io.BytesIO(old))))
+
+    assert csv_header(io.BytesIO(new)) == ["code", "amount", "id", "flag"]
+    hinted = read_csv(io.BytesIO(new), hints=hints, engine="pyarrow")
+    pd.testing.assert_frame_equal(hinted, read_csv(io.BytesIO(new), engine="pyarrow"))
+    assert hinted["code"].dtype == np.int64 and hinted["amount"].dtype == np.int64
+
+    # Hints the values no longer fit are dropped instead of failing
+    stale = {"amount": pa.int64()}
+    assert read_csv(io.BytesIO(_csv()), hints=stale, engine="pyarrow")["amount"].dtype == np.float64
+
+
+def test_falls_back_to_c_parser():
+    with pytest.raises(ArrowParseError):
+        read_csv(io.BytesIO(b"a,b\n1,2\n3\n"), engine="pyarrow")
+
+    # Quoted newlines and duplicate headers are left to pandas
+    quoted = read_csv(io.BytesIO(b'a,b\n1,"x\ny"\n'))
+    assert quoted.loc[0, "b"] == "x\ny"
+    assert list(read_csv(io.BytesIO(b"a,a\n1,2\n")).columns) == ["a", "a.1"]
@@ -0,0 +1,58 @@
+import os
+
+import pandas as pd
+from storage.dataset_cache import DatasetCache, hash_bytes
+
+
+def _entry(rows):
+    df = pd.DataFrame({"a": range(rows), "b": ["x"] * rows})
+    return {"df": df, "metadata": {"rows": rows}, "summary": "summary"}
+
+
+def test_hash_is_content_based():
+    assert hash_bytes(b"a,b\n1,2\n") == hash_bytes(bytearray(b"a,b\n1,2\n"))
+    assert hash_bytes(b"a,b\n1,2\n") != hash_bytes(b"a,b\n1,3\n")
+
+
+def test_lru_eviction_respects_budget():
+    cache = DatasetCache(max_bytes=150_000)
+    cache.put("k1", _entry(1000))
+    cache.put("k2", _entry(1000))
+    cache.get("k1")
+    cache.put("k3", _entry(1000))
+
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None
+    assert cache.current_bytes <= 150_000
+
+
+def test_discard_removes_memory_and_disk_copies(tmp_path):
+    cache = DatasetCache(max_bytes=1, disk_dir=str(tmp_path))
+    cache.put("k1", _entry(10))
+    cache.put("k2", _entry(10))
+    cache.discard("k1")
+
+    assert cache.get("k1") is None
+    assert cache.get("k2") is not None
+
+
+def test_entries_are_pickled_only_on_eviction(tmp_path):
+    cache = DatasetCache(max_bytes=10 ** 9, disk_dir=str(tmp_path))
+    cache.put("k1", _entry(10))
+    assert os.listdir(tmp_path) == []
+
+    cache.max_bytes = 1
+    cache.put("k2", _entry(10))
+    assert os.listdir(tmp_path) == ["k1.pkl"]
+
+
+def test_disk_tier_round_trip(tmp_path):
+    cache = DatasetCache(max_bytes=1, disk_dir=str(tmp_path))
+    cache.put("k1", _entry(50))
+    cache.put("k2", _entry(50))
+
+    # k1 fell out of memory but is promoted back from disk
+    entry = cache.get("k1")
+    assert entry is not None
+    assert entry["df"].equals(_entry(50)["df"])
+
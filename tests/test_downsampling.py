@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from visualization.downsampling import downsample_indices, lttb_indices, minmax_indices, resample_series
+from visualization.visual_assets import generate_visualizations
+
+
+def _signal(n=100_000):
+    rng = np.random.default_rng(0)
+    x = np.arange(n, dtype=np.int64)
+    y = np.sin(x / 500) + rng.normal(scale=0.01, size=n)
+    y[n // 3] = 25.0
+    return x, y
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsampling_caps_points_and_keeps_peak(method):
+    x, y = _signal()
+    shuffled = np.random.default_rng(1).permutation(len(x))
+
+    positions = downsample_indices(x[shuffled], y[shuffled], max_points=1000, method=method)
+    kept = x[shuffled][positions]
+
+    assert len(positions) <= 1000
+    assert np.all(np.diff(kept) > 0)
+    assert len(x) // 3 in kept
+
+
+def test_lttb_keeps_endpoints_and_small_inputs():
+    x, y = _signal(5000)
+    selected = lttb_indices(x, y, 100)
+    assert len(selected) == 100 and selected[0] == 0 and selected[-1] == 4999
+    assert len(minmax_indices(x[:10], y[:10], 50)) == 10
+
+
+def test_resample_and_time_series_figure():
+    times = pd.Series(pd.date_range("2024-01-01", periods=10_000, freq="min"))
+    values = pd.Series(np.arange(10_000, dtype=float), name="value")
+
+    buckets, means = resample_series(times, values, "1h")
+    assert len(buckets) == len(means) == 167
+    assert means.iloc[0] == values.iloc[:60].mean()
+
+    df = pd.DataFrame({"ts": times.sample(frac=1, random_state=0), "value": values})
+    trace = generate_visualizations(df, max_points=500)["time_ts"].data[0]
+    assert len(trace.x) <= 500
@@ -0,0 +1,92 @@
+import io
+import json
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from jobs.tasks import visualization_task
+from visualization.exporter import (
+    compact_payload,
+    export_dashboard_compact,
+    export_dashboard_html,
+    iter_dashboard_html,
+    write_dashboard_html,
+)
+from visualization.visual_assets import figure_specs, generate_visualizations
+
+
+def _figures():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(300, 4)), columns=list("abcd"))
+    df["city"] = rng.choice(["Delhi", "Pune"], 300)
+    return generate_visualizations(df)
+
+
+def test_export_is_deterministic_and_identical_across_paths():
+    figures = _figures()
+    serial = export_dashboard_html(figures)
+
+    assert serial == export_dashboard_html(figures)
+    assert serial == export_dashboard_html(figures, n_jobs=2)
+    assert serial == "".join(iter_dashboard_html(figures))
+
+    buffer = io.StringIO()
+    write_dashboard_html(figures, buffer, n_jobs=2)
+    assert buffer.getvalue() == serial
+
+    assert serial.count("class='chart-card'") == len(figures)
+    assert serial.count("cdn.plot.ly") == 1
+
+
+def test_export_does_not_restyle_input_figures():
+    figures = _figures()
+    export_dashboard_html(figures)
+    assert figures["dist_a"].layout.margin.t is None
+
+
+def _decode_payload(payload):
+    raw = zlib.decompress(payload)
+    (length,) = struct.unpack_from("<I", raw)
+    header = json.loads(raw[8:8 + length])
+    data_start = 8 + -(-length // 8) * 8
+    return header, raw[data_start:]
+
+
+def test_compact_payload_shares_arrays_and_templates():
+    x = np.linspace(0, 1, 1000)
+    figures = {
+        "first": go.Figure(go.Scatter(x=x, y=np.sin(x))),
+        "second": go.Figure(go.Scatter(x=x, y=np.cos(x))),
+    }
+    header, buffers = _decode_payload(compact_payload(figures))
+
+    assert len(header["charts"]) == 2
+    assert len(header["templates"]) == 1
+    assert len(header["arrays"]) == 3
+
+    spec = header["arrays"][header["charts"][1]["data"][0]["y"]["$ref"]]
+    values = np.frombuffer(buffers, dtype="<f8", count=spec["length"], offset=spec["offset"])
+    assert np.array_equal(values, np.cos(x))
+
+
+def test_compact_export_is_smaller_and_deterministic():
+    figures = _figures()
+    compact = export_dashboard_compact(figures)
+
+    assert compact == export_dashboard_compact(figures)
+    assert compact.count("class='lazy-chart'") == len(figures)
+    assert len(compact) < len(export_dashboard_html(figures)) / 2
+
+
+def test_visualization_task_streams_into_a_file(tmp_path):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(300, 2)), columns=list("ab"))
+    path = str(tmp_path / "dashboard.html")
+
+    assert visualization_task(df, path) == path
+    with open(path, encoding="utf-8") as fh:
+        page = fh.read()
+    assert page.count("class='chart-card'") == len(figure_specs(df))
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from visualization.registry import FigureRegistry
+from visualization.visual_assets import figure_specs, generate_visualizations
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "amount": rng.normal(size=500),
+        "quantity": rng.integers(1, 10, 500),
+        "city": rng.choice(["Delhi", "Pune"], 500),
+        "day": pd.date_range("2024-01-01", periods=500, freq="h"),
+    })
+
+
+def test_specs_cover_the_eager_figures():
+    df = _frame()
+    specs = figure_specs(df)
+
+    assert [spec.key for spec in specs] == list(generate_visualizations(df))
+    assert [spec.kind for spec in specs] == ["dist", "dist", "count", "correlation", "time"]
+
+
+def test_registry_memoizes_per_dataset_and_evicts():
+    df = _frame()
+    specs = figure_specs(df)
+    registry = FigureRegistry(max_entries=3)
+
+    first = registry.get("raw", df, specs[0])
+    assert registry.get("raw", df, specs[0]) is first
+    assert registry.get("cleaned", df, specs[0]) is not first
+
+    for spec in specs[1:]:
+        registry.get("raw", df, spec)
+    assert len(registry) == 3
+    assert registry.get("raw", df, specs[0]) is not first
+
+    registry.discard_dataset("raw")
+    assert len(registry) == 0
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from profiling.fingerprint import (
+    DuplicateTracker,
+    count_duplicates,
+    drop_duplicate_rows,
+    duplicate_mask,
+    row_fingerprints,
+)
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    rows = 3000
+    df = pd.DataFrame({
+        "a": rng.integers(0, 5, rows),
+        "b": rng.choice(["x", "y", None], rows),
+        "c": rng.choice([1.5, np.nan], rows),
+    })
+    return df
+
+
+def test_fingerprints_match_pandas_duplicates():
+    df = _frame()
+    fingerprints = row_fingerprints(df)
+
+    assert count_duplicates(fingerprints) == int(df.duplicated().sum())
+    assert (duplicate_mask(fingerprints) == df.duplicated().to_numpy()).all()
+    assert drop_duplicate_rows(df, fingerprints).equals(df.drop_duplicates())
+
+
+def test_tracker_dedups_across_chunks():
+    df = _frame()
+    tracker = DuplicateTracker()
+    kept = pd.concat([tracker.filter(df.iloc[i:i + 400]) for i in range(0, len(df), 400)])
+
+    assert kept.equals(df.drop_duplicates())
+    assert tracker.duplicates == int(df.duplicated().sum())
+
+
+def test_int_and_float_chunks_share_fingerprints():
+    ints = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    floats = pd.DataFrame({"a": [1.0, np.nan], "b": ["x", "y"]})
+
+    assert row_fingerprints(ints)[0] == row_fingerprints(floats)[0]
+
+
+def test_large_integer_ids_keep_distinct_fingerprints():
+    df = pd.DataFrame({
+        "event_id": [2**53, 2**53 + 1, 1234567890123456789, 1234567890123456788],
+        "v": ["a", "a", "b", "b"],
+    })
+
+    assert count_duplicates(row_fingerprints(df)) == 0
+    assert row_fingerprints(df.astype({"event_id": "uint64"})).tolist() == row_fingerprints(df).tolist()
@@ -0,0 +1,136 @@
+import gzip
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from data_io.formats import (
+    export_dataset,
+    file_format,
+    iter_dataframes,
+    read_dataset,
+    read_schema,
+    spool_dataset,
+)
+from profiling.profiler import profile_dataset
+from profiling.streaming import profile_chunks
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "year": np.repeat(np.arange(2000, 2010), 500),
+        "amount": rng.normal(size=5000),
+        "city": rng.choice(["Delhi", "Pune", None], 5000),
+        "when": pd.date_range("2024-01-01", periods=5000, freq="h"),
+    })
+
+
+def _columnar(df, fmt):
+    # Small row groups so the year filter can prune whole groups
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        df.to_parquet(buffer, index=False, row_group_size=500)
+    else:
+        buffer.write(export_dataset(df, "feather"))
+    return buffer
+
+
+@pytest.mark.parametrize("fmt, read_fmt", [("parquet", "parquet"), ("feather", "ipc")])
+def test_columnar_round_trip_keeps_types(fmt, read_fmt):
+    df = _frame()
+    upload = io.BytesIO(export_dataset(df, fmt))
+
+    assert file_format(f"cleaned.{fmt}") == read_fmt
+    assert read_schema(upload, read_fmt) == list(df.columns)
+    pd.testing.assert_frame_equal(read_dataset(upload, read_fmt), df)
+
+
+@pytest.mark.parametrize("fmt, read_fmt", [("parquet", "parquet"), ("feather", "ipc")])
+def test_projection_and_filters(fmt, read_fmt):
+    df = _frame()
+    upload = _columnar(df, fmt)
+
+    result = read_dataset(upload, read_fmt, columns=["amount"], filters=[("year", ">=", 2008)])
+    assert list(result.columns) == ["amount"]
+    np.testing.assert_array_equal(result["amount"], df.loc[df["year"] >= 2008, "amount"])
+
+    head = read_dataset(upload, read_fmt, filters=[("year", "==", 2003)], nrows=10)
+    assert len(head) == 10 and (head["year"] == 2003).all()
+
+
+def test_chunked_profile_of_parquet_matches_in_memory_profile():
+    df = _frame()
+    upload = _columnar(df, "parquet")
+
+    chunks = list(iter_dataframes(upload, "parquet", batch_rows=700, columns=["year", "city"]))
+    assert max(len(chunk) for chunk in chunks) <= 700
+
+    assert profile_chunks(chunks) == profile_dataset(df[["year", "city"]])
+
+
+def test_chunked_profile_of_parquet_extension_dtypes():
+    df = pd.DataFrame({
+        "qty": pd.array([1, None, 3] * 500, dtype="Int64"),
+        "city": pd.Categorical(["Delhi", "Pune", "Delhi"] * 500),
+    })
+    upload = io.BytesIO()
+    df.to_parquet(upload, index=False, row_group_size=500)
+
+    streamed = profile_chunks(iter_dataframes(upload, "parquet", batch_rows=400))
+    expected = profile_dataset(df)
+    assert streamed["columns"] == expected["columns"]
+    assert streamed["flags"] == expected["flags"]
+
+
+def test_csv_export_and_unknown_formats():
+    df = _frame()
+    csv = export_dataset(df[["year", "amount"]])
+    pd.testing.assert_frame_equal(read_dataset(io.BytesIO(csv), "csv"), df[["year", "amount"]])
+
+    with pytest.raises(ValueError):
+        file_format("data.xlsx")
+    with pytest.raises(ValueError):
+        read_dataset(io.BytesIO(csv), "csv", filters=[("year", ">", 2000)])
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_chunked_csv_export_matches_to_csv(compression):
+    df = _frame()
+    # The last chunk holds only midnights; it must keep the column's time format
+    df.loc[4000:, "when"] = df.loc[4000:, "when"].dt.normalize()
+    expected = df.to_csv(index=False).encode()
+
+    data = export_dataset(df, compression=compression, chunk_rows=1000)
+    if compression == "gzip":
+        data = gzip.decompress(data)
+    elif compression == "zstd":
+        data = pa.CompressedInputStream(pa.BufferReader(data), "zstd").read()
+
+    assert data == expected
+
+
+@pytest.mark.parametrize("fraction", ["500ms", "250us", "7ns"])
+def test_chunked_csv_export_keeps_sub_second_precision(fraction):
+    # Only the last row has a fraction; every earlier chunk holds midnights
+    # or whole seconds and must still print the column's full precision
+    when = pd.Series(pd.date_range("2024-01-01", periods=3000, freq="D"))
+    when.iloc[1000:2000] += pd.Timedelta("1s")
+    when.iloc[-1] += pd.Timedelta(fraction)
+    when.iloc[5] = pd.NaT
+    df = pd.DataFrame({"when": when, "n": range(3000)})
+
+    assert export_dataset(df, chunk_rows=1000) == df.to_csv(index=False).encode()
+    assert export_dataset(df.iloc[:2000], chunk_rows=700) == df.iloc[:2000].to_csv(index=False).encode()
+
+
+def test_spooled_export_moves_to_disk_and_round_trips():
+    df = _frame()
+    with spool_dataset(df, "parquet", chunk_rows=1000, max_memory=1024) as spool:
+        assert spool._rolled
+        pd.testing.assert_frame_equal(read_dataset(io.BytesIO(spool.read()), "parquet"), df)
+
+    with pytest.raises(ValueError):
+        export_dataset(df, "parquet", compression="gzip")
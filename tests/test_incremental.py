@@ -0,0 +1,94 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from cleaner.cleaner import clean_dataset
+from cleaner.incremental import clean_incremental, cleaned_profile
+from data_io.csv_reader import read_csv
+from profiling.incremental import profile_incremental
+from profiling.profiler import profile_dataset
+
+
+def _frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Amount ": rng.choice(["1", "2.5", "n/a", "3"], n),
+        "qty": rng.integers(0, 5, n),
+        "when": rng.choice(["2024-01-02", "2024-02-03", "?"], n),
+        "City": rng.choice([" Pune", "DELHI", "-"], n),
+        "empty": "na",
+    })
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_appended_rows_match_full_clean(compact):
+    full = _frame(4000)
+    full["code"] = full["qty"].astype(str)
+    # Duplicates of earlier rows; the only float spelling of "code" is in
+    # a dropped duplicate, yet it still makes the column float
+    full.loc[3990] = full.loc[10]
+    full.loc[3991] = full.loc[11]
+    full.loc[3991, "code"] += ".0"
+
+    _, previous = clean_incremental(full.iloc[:3000], compact=compact)
+    cleaned, state = clean_incremental(full, state=previous, compact=compact)
+
+    expected = clean_dataset(full, compact=compact)
+    assert state.reused_rows == 3000
+    pd.testing.assert_frame_equal(cleaned, expected)
+    assert cleaned.attrs["column_types"] == expected.attrs["column_types"]
+    assert cleaned_profile(cleaned, state) == profile_dataset(expected)
+
+
+def test_type_change_falls_back_to_full_clean():
+    full = _frame(400)
+    full.loc[300:, "Amount "] = "unknown"
+    full.loc[300:, "empty"] = "filled"
+
+    _, previous = clean_incremental(full.iloc[:300])
+    cleaned, state = clean_incremental(full, state=previous)
+
+    assert state.reused_rows == 0
+    pd.testing.assert_frame_equal(cleaned, clean_dataset(full))
+
+
+def test_edited_rows_are_not_treated_as_appended():
+    old = _frame(300)
+    new = _frame(400)
+
+    _, previous = clean_incremental(old)
+    cleaned, state = clean_incremental(new, state=previous)
+
+    assert state.reused_rows == 0
+    pd.testing.assert_frame_equal(cleaned, clean_dataset(new))
+
+
+def test_profile_of_appended_rows_matches_full_profile():
+    full = _frame(2000)
+    full["qty"] = full["qty"].astype(float)
+    full.loc[1500:1600, "qty"] = np.nan
+
+    _, previous = profile_incremental(full.iloc[:1500].astype({"qty": "int64"}))
+    metadata, state = profile_incremental(full, state=previous)
+
+    assert state.reused_rows == 1500
+    assert metadata == profile_dataset(full)
+
+
+def test_uploaded_csv_with_text_columns_is_extended():
+    # read_csv gives text columns the Arrow string dtype
+    lines = [f"{i},{' Pune' if i % 3 else 'n/a'},{i * 1.5}" for i in range(300)]
+    first = ("id,City,amount\n" + "\n".join(lines[:200]) + "\n").encode()
+    full = ("id,City,amount\n" + "\n".join(lines) + "\n").encode()
+    old, new = read_csv(io.BytesIO(first)), read_csv(io.BytesIO(full))
+
+    _, profile_state = profile_incremental(old)
+    metadata, profile_state = profile_incremental(new, state=profile_state)
+    assert profile_state.reused_rows == 200
+    assert metadata == profile_dataset(new)
+
+    _, previous = clean_incremental(old)
+    cleaned, _ = clean_incremental(new, state=previous)
+    pd.testing.assert_frame_equal(cleaned, clean_dataset(new))
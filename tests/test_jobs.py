@@ -0,0 +1,61 @@
+import time
+
+from jobs.runner import CANCELLED, DONE, FAILED, JobRunner, is_finished, report_progress
+
+
+def _slow_task(steps):
+    for step in range(steps):
+        report_progress(step / steps, f"step {step}")
+        time.sleep(0.05)
+    return steps
+
+
+def _failing_task():
+    raise ValueError("bad input")
+
+
+def _wait(runner, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while not is_finished(runner.status(job_id)) and time.time() < deadline:
+        time.sleep(0.05)
+    return runner.status(job_id)
+
+
+def test_jobs_report_results_errors_and_cancellation():
+    runner = JobRunner(max_workers=1)
+    try:
+        done = runner.submit(_slow_task, 3)
+        failed = runner.submit(_failing_task)
+        running = runner.submit(_slow_task, 1000)
+
+        assert _wait(runner, done)["state"] == DONE
+        assert runner.result(done) == 3
+
+        status = _wait(runner, failed)
+        assert status["state"] == FAILED
+        assert "bad input" in status["message"]
+
+        # Wait until the long job is reporting progress, then cancel it
+        while runner.status(running)["progress"] == 0.0:
+            time.sleep(0.05)
+        runner.cancel(running)
+        assert _wait(runner, running)["state"] == CANCELLED
+    finally:
+        runner.shutdown()
+
+
+def test_forgotten_jobs_still_stop_and_leave_nothing_behind():
+    runner = JobRunner(max_workers=1)
+    try:
+        running = runner.submit(_slow_task, 1000)
+        while runner.status(running)["progress"] == 0.0:
+            time.sleep(0.05)
+        runner.cancel(running)
+        runner.forget(running)
+
+        # The worker is free again once the cancelled job has stopped
+        assert _wait(runner, runner.submit(_slow_task, 1), timeout=20)["state"] == DONE
+        assert running not in runner._cancelled and running not in runner._progress
+        assert runner.status(running)["state"] is None
+    finally:
+        runner.shutdown()
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from profiling.profiler import generate_profile_report, profile_dataset
+from profiling.report import report_truncated
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    rows = 2000
+    return pd.DataFrame({
+        "amount": rng.normal(size=rows),
+        "quantity": rng.integers(1, 10, rows),
+        "city": rng.choice(["Delhi", "<Pune>"], rows),
+        "day": pd.Timestamp("2024-01-01") + pd.to_timedelta(rng.integers(0, 90, rows), unit="D"),
+    })
+
+
+@pytest.mark.parametrize("tier", ["minimal", "sampled", "full"])
+def test_native_report_tiers(tier):
+    df = _frame()
+    report = generate_profile_report(df, metadata=profile_dataset(df), tier=tier)
+
+    assert report.startswith("<!DOCTYPE html>")
+    assert "&lt;Pune&gt;" in report or tier == "minimal"
+    assert ("Correlations" in report) == (tier == "full")
+
+
+def test_time_budget_skips_column_details():
+    report = generate_profile_report(_frame(), tier="full", time_budget=0)
+
+    assert "time budget reached" in report
+    assert "<svg" not in report
+
+
+def test_only_budget_truncated_reports_are_marked():
+    df = _frame()
+
+    assert report_truncated(generate_profile_report(df, tier="full", time_budget=0))
+    assert not report_truncated(generate_profile_report(df, tier="full"))
+    assert not report_truncated(generate_profile_report(df, tier="minimal", time_budget=0))
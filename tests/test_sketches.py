@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+from profiling.profiler import profile_dataset
+from profiling.sketches import HyperLogLog, SpaceSaving, hash_series
+
+
+def test_hyperloglog_within_error_and_mergeable():
+    left = HyperLogLog.from_error(0.01)
+    right = HyperLogLog.from_error(0.01)
+    left.add(hash_series(pd.Series(np.arange(0, 60_000))))
+    right.add(hash_series(pd.Series(np.arange(40_000, 100_000))))
+    left.merge(right)
+
+    assert abs(left.estimate() - 100_000) <= 3 * left.relative_error * 100_000
+
+
+def test_space_saving_finds_heavy_hitters_across_batches():
+    rng = np.random.default_rng(0)
+    series = pd.Series(rng.zipf(1.5, 200_000))
+    heavy = SpaceSaving(k=10)
+    for start in range(0, len(series), 25_000):
+        heavy.add(series.iloc[start:start + 25_000])
+
+    expected = series.value_counts().head(3)
+    top = heavy.top(3)
+    assert [value for value, _, _ in top] == expected.index.tolist()
+    for value, count, error in top:
+        assert expected[value] <= count <= expected[value] + error
+
+
+def test_sketch_mode_reports_error_bounds_and_keeps_flags():
+    df = pd.DataFrame({
+        "id": np.arange(5000).astype(str),
+        "city": ["a", "b", "c", "a", "a"] * 1000,
+        "constant": 1,
+    })
+    exact = profile_dataset(df)
+    sketched = profile_dataset(df, sketch=True, distinct_error=0.02)
+
+    assert sketched["flags"] == exact["flags"]
+    assert sketched["sketch"]["distinct_relative_error"] == 0.02
+    city = sketched["columns"][1]
+    assert city["sample_values"][0] == "a"
+    assert city["sketch"]["top_values"][0] == ["a", 3000]
+
+
+def test_large_integer_ids_are_counted_distinct():
+    ids = pd.Series(np.arange(1000, dtype=np.int64) + 10 ** 18)
+    assert len(np.unique(hash_series(ids))) == 1000
+
+    # 1 and 1.0 still hash alike
+    assert hash_series(pd.Series([1]))[0] == hash_series(pd.Series([1.0]))[0]
+
+    metadata = profile_dataset(pd.DataFrame({"id": ids}), sketch=True)
+    assert metadata["flags"]["possible_id_columns"] == ["id"]
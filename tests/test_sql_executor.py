@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.profiler import profile_dataset
+from sql.executor import QueryExecutor
+from sql.sql_generator import generate_sql_statements
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        "amount": rng.integers(0, 50, 1000).astype(float),
+        "city": rng.choice(["Delhi", "Pune", None], 1000),
+        "active": rng.choice([True, False], 1000),
+    })
+
+
+def test_generated_queries_run_and_are_cached():
+    df = _frame()
+    statements = generate_sql_statements(profile_dataset(df), dialect="PostgreSQL")[1:]
+    executor = QueryExecutor()
+
+    outcomes = executor.run("key", df, statements)
+    results = {title: result for title, _, result, error in outcomes if error is None}
+
+    assert len(results) == len(statements)
+    assert results["Row count"].iloc[0, 0] == 1000
+    assert results["Missing values in city"].iloc[0, 0] == df["city"].isna().sum()
+
+    again = executor.run("key", df, statements)
+    assert all(a[2] is b[2] for a, b in zip(outcomes, again))
+
+
+def test_failed_statement_reports_error_and_results_are_capped():
+    executor = QueryExecutor(max_result_rows=5)
+    outcomes = executor.run("key", _frame(), [
+        ("broken", "SELECT missing_column FROM dataset;"),
+        ("all rows", "SELECT * FROM dataset;"),
+    ])
+
+    assert outcomes[0][2] is None and outcomes[0][3]
+    assert len(outcomes[1][2]) == 5
+
+
+@pytest.mark.parametrize("mode", ["batched", "approximate"])
+def test_single_scan_runs_with_boolean_columns(mode):
+    df = _frame()
+    statements = generate_sql_statements(profile_dataset(df), dialect="DuckDB", mode=mode)[1:]
+
+    outcomes = QueryExecutor().run("key", df, statements)
+    assert [error for *_, error in outcomes] == [None] * len(outcomes)
+    assert "avg_active" not in outcomes[1][2].columns
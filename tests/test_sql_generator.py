@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from profiling.profiler import profile_dataset
+from sql import sql_generator
+from sql.executor import QueryExecutor
+from sql.sql_generator import generate_sql_queries, generate_sql_statements
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "amount": rng.integers(0, 50, 500).astype(float),
+        "quantity": rng.integers(1, 5, 500).astype(float),
+        "city": rng.choice(["Delhi", "Pune"], 500),
+    })
+    df.loc[::4, "amount"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("dialect", ["ANSI", "PostgreSQL", "MySQL", "DuckDB"])
+def test_batched_mode_uses_one_scan(dialect):
+    statements = generate_sql_statements(profile_dataset(_frame()), dialect=dialect, mode="batched")
+    scans = [title for title, _ in statements if "numeric stats" in title]
+
+    assert scans == ["Missing values and numeric stats (single scan)"]
+    assert not any(title.startswith(("Missing values in", "Stats for", "Row count")) for title, _ in statements)
+    assert ("median_amount" in generate_sql_queries(profile_dataset(_frame()), dialect=dialect, mode="batched")) == (dialect in ("PostgreSQL", "DuckDB"))
+
+
+def test_batched_results_match_per_column_queries():
+    df = _frame()
+    metadata = profile_dataset(df)
+    executor = QueryExecutor()
+
+    batched = executor.run("key", df, generate_sql_statements(metadata, mode="batched")[2:3])[0][2]
+    per_column = {
+        title: result for title, _, result, _ in
+        executor.run("key", df, generate_sql_statements(metadata)[2:])
+    }
+
+    assert batched["row_count"][0] == per_column["Row count"].iloc[0, 0] == 500
+    assert batched["missing_amount"][0] == per_column["Missing values in amount"].iloc[0, 0] == 125
+    assert batched["max_quantity"][0] == per_column["Stats for quantity"].iloc[0, 1]
+
+
+def test_wide_tables_split_into_a_few_scans(monkeypatch):
+    monkeypatch.setattr(sql_generator, "MAX_SELECT_EXPRESSIONS", 4)
+    statements = generate_sql_statements(profile_dataset(_frame()), mode="batched")
+    assert [title for title, _ in statements if "scan" in title][-1].endswith("(scan 3 of 3)")
+
+
+def _typed_frame():
+    return pd.DataFrame({
+        "small": np.arange(10),
+        "large": np.arange(10) * 10 ** 10,
+        "price": np.linspace(0, 1, 10),
+        "city": ["Delhi"] * 9 + ["Thiruvananthapuram"],
+        "active": [True, False] * 5,
+        "day": pd.date_range("2024-01-01", periods=10),
+        "seen": pd.date_range("2024-01-01", periods=10, freq="h"),
+    })
+
+
+@pytest.mark.parametrize("dialect, expected", [
+    ("PostgreSQL", ["SMALLINT", "BIGINT", "DOUBLE PRECISION", "VARCHAR(32)", "BOOLEAN", "DATE", "TIMESTAMP"]),
+    ("MySQL", ["SMALLINT", "BIGINT", "DOUBLE", "VARCHAR(32)", "BOOLEAN", "DATE", "DATETIME"]),
+    ("DuckDB", ["SMALLINT", "BIGINT", "DOUBLE", "VARCHAR", "BOOLEAN", "DATE", "TIMESTAMP"]),
+])
+def test_types_follow_profile_stats(dialect, expected):
+    metadata = profile_dataset(_typed_frame())
+    types = [sql_generator.sql_type(col["dtype"], dialect, col) for col in metadata["columns"]]
+    assert types == expected
+
+
+def test_arrow_backed_columns_are_profiled_and_typed():
+    df = pd.DataFrame({"id": [1, 40_000, None], "amount": [1.5, None, 2.5]}).astype(
+        {"id": "int64[pyarrow]", "amount": "double[pyarrow]"}
+    )
+    metadata = profile_dataset(df)
+
+    assert [(col["min"], col["max"]) for col in metadata["columns"]] == [(1, 40_000), (1.5, 2.5)]
+    types = [sql_generator.sql_type(col["dtype"], "PostgreSQL", col) for col in metadata["columns"]]
+    assert types == ["INTEGER", "DOUBLE PRECISION"]
+
+
+def test_long_text_and_missing_stats_fall_back_to_wide_types():
+    assert sql_generator.sql_type("object", "MySQL", {"max_length": 1000}) == "TEXT"
+    assert sql_generator.sql_type("object", "PostgreSQL", {"max_length": 10_000}) == "TEXT"
+    assert sql_generator.sql_type("object", "PostgreSQL") == "TEXT"
+    assert sql_generator.sql_type("int64", "ANSI") == "BIGINT"
+
+
+def test_bulk_load_statements_per_dialect():
+    metadata = profile_dataset(_typed_frame())
+
+    copy = generate_sql_queries(metadata, dialect="PostgreSQL", load_file="cleaned.csv")
+    assert "COPY dataset (small, large, price, city, active, day, seen)" in copy
+
+    duckdb_copy = generate_sql_queries(metadata, dialect="DuckDB", load_file="cleaned.csv")
+    assert "FROM 'cleaned.csv'\n(FORMAT csv, HEADER true, NULLSTR '');" in duckdb_copy
+
+    load = generate_sql_queries(metadata, dialect="MySQL", load_file="cleaned.csv")
+    assert "LOAD DATA LOCAL INFILE 'cleaned.csv'" in load
+    assert "small = NULLIF(@v0, '')" in load
+    assert "active = CASE WHEN LOWER(TRIM(@v4)) IN ('true', '1') THEN 1" in load
+    # The last field loses the carriage return of CRLF lines
+    assert "seen = NULLIF(TRIM(TRAILING '\\r' FROM @v6), '')" in load
+
+    assert "Bulk load" not in generate_sql_queries(metadata, load_file="cleaned.csv")
+
+
+@pytest.mark.parametrize("dialect, sample", [
+    ("ANSI", "TABLESAMPLE SYSTEM (5)"),
+    ("PostgreSQL", "TABLESAMPLE SYSTEM (5)"),
+    ("MySQL", "WHERE RAND() < 0.05"),
+    ("DuckDB", "TABLESAMPLE 5% (bernoulli)"),
+])
+def test_approximate_mode_samples_and_skips_id_columns(dialect, sample):
+    df = _frame().assign(order_id=[f"o{i}" for i in range(500)])
+    metadata = profile_dataset(df)
+    assert "order_id" in metadata["flags"]["possible_id_columns"]
+
+    statements = generate_sql_statements(metadata, dialect=dialect, mode="approximate", sample_percent=5)
+    queries = [sql for _, sql in statements[2:]]
+
+    assert all(sample in sql for sql in queries)
+    assert not any("GROUP BY order_id" in sql for sql in queries)
+    assert "GROUP BY city ORDER BY frequency DESC LIMIT 20;" in queries[-1]
+    # Sketch aggregates are DuckDB extensions; the other dialects stay standard
+    assert ("APPROX_COUNT_DISTINCT(city)" in queries[0]) == (dialect == "DuckDB")
+    assert ("COUNT(DISTINCT city)" in queries[0]) == (dialect != "DuckDB")
+    assert ("APPROX_QUANTILE(amount, 0.5)" in queries[0]) == (dialect == "DuckDB")
+
+
+@pytest.mark.parametrize("dialect", ["ANSI", "DuckDB"])
+def test_approximate_queries_run_on_a_sample(dialect):
+    df = pd.concat([_frame()] * 40, ignore_index=True)
+    metadata = profile_dataset(df)
+    statements = generate_sql_statements(metadata, dialect=dialect, mode="approximate", sample_percent=10)
+
+    outcomes = QueryExecutor().run("key", df, statements[2:])
+    assert all(error is None for *_, error in outcomes)
+
+    profile, frequencies = outcomes[0][2], outcomes[1][2]
+    assert 0 < profile.loc[0, "sampled_rows"] < len(df) / 2
+    assert profile.loc[0, "distinct_city"] == 2
+    assert len(frequencies) == 2
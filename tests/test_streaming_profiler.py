@@ -0,0 +1,54 @@
+import io
+
+import numpy as np
+import pandas as pd
+from profiling.profiler import profile_dataset
+from profiling.streaming import ProfileAccumulator, profile_csv_in_chunks
+
+
+def _csv():
+    rng = np.random.default_rng(0)
+    n = 5000
+    df = pd.DataFrame({
+        "id": np.arange(n),
+        "amount": rng.integers(0, 50, n).astype(float),
+        "city": rng.choice(["x", "y", None], n),
+        "constant": 1,
+    })
+    # Leading NaNs make the first chunks float64 while later ones are int-like
+    df.loc[5:2500, "amount"] = np.nan
+    df = pd.concat([df, df.head(120)])
+    return df.to_csv(index=False)
+
+
+def test_chunked_profile_matches_in_memory_profile():
+    text = _csv()
+    expected = profile_dataset(pd.read_csv(io.StringIO(text)))
+    streamed = profile_csv_in_chunks(io.StringIO(text), chunksize=700)
+
+    assert streamed == expected
+
+
+def test_accumulators_merge_across_partitions():
+    df = pd.read_csv(io.StringIO(_csv()))
+    left, right = ProfileAccumulator(), ProfileAccumulator()
+    left.update(df.iloc[:3000])
+    right.update(df.iloc[3000:])
+    left.merge(right)
+
+    result = left.finalize()
+    assert result["dataset"]["duplicate_rows"] == 120
+    assert result["flags"]["constant_columns"] == ["constant"]
+
+
+def test_memory_usage_counts_the_index_like_profile_dataset():
+    # 5200 data bytes round to 0.0 MB; with the 132-byte RangeIndex, 0.01 MB
+    df = pd.DataFrame({"amount": np.arange(650, dtype=float)})
+    accumulator = ProfileAccumulator()
+    for start in range(0, len(df), 200):
+        accumulator.update(df.iloc[start:start + 200])
+
+    assert accumulator.finalize() == profile_dataset(df)
+
+    labelled = df.set_index(df.index * 2)
+    assert accumulator.finalize(labelled.index) == profile_dataset(labelled)
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from visualization.visual_assets import MAX_HISTOGRAM_BINS, generate_visualizations, histogram_bins
+
+
+def test_preaggregated_histogram_matches_raw_counts():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({"amount": rng.normal(size=50_000), "city": rng.choice(["a", "b"], 50_000)})
+    df.loc[::10, "amount"] = np.nan
+
+    fig = generate_visualizations(df)["dist_amount"]
+    bar = fig.data[0]
+
+    assert bar.type == "bar"
+    assert len(bar.y) <= MAX_HISTOGRAM_BINS
+    assert int(np.sum(bar.y)) == df["amount"].notna().sum()
+
+
+def test_fixed_bins_and_constant_column():
+    counts, edges = histogram_bins(np.arange(100.0), bins=10)
+    assert len(counts) == 10 and counts.sum() == 100
+
+    counts, _ = histogram_bins(np.ones(10))
+    assert counts.sum() == 10
@@ -0,0 +1,110 @@
+'''
+Point-count reduction for line charts.
+Largest-Triangle-Three-Buckets keeps the visual shape of a series, min/max
+bucketing keeps every peak and trough, and optional time-bucket resampling
+aggregates before either runs. All methods return row positions, so the
+caller can slice the original columns without copying the frame.
+'''
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_MAX_POINTS = 2000
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+# LTTB runs on a min/max preselection of this many points per output point,
+# so the full series never has to be sorted
+PRESELECT_RATIO = 4
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Positions of the minimum and maximum y in each of n_buckets equal-width
+    x ranges, ordered by x. x does not need to be sorted.
+    """
+
+    x = x.astype("float64")
+    lo, hi = x.min(), x.max()
+    if hi > lo:
+        bucket = ((x - lo) / (hi - lo) * n_buckets).astype(np.int64)
+        np.minimum(bucket, n_buckets - 1, out=bucket)
+    else:
+        bucket = np.zeros(len(x), dtype=np.int64)
+
+    grouped = pd.Series(y).groupby(bucket, sort=False)
+    positions = np.unique(np.concatenate([
+        grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()
+    ]))
+    return positions[np.argsort(x[positions], kind="stable")]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets on x-sorted arrays.
+    Returns the positions of the n_out selected points.
+    """
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = x.astype("float64")
+    y = y.astype("float64")
+
+    # First and last points are always kept; the rest are split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+
+    anchor = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+
+        if i + 2 < len(edges):
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+
+        area = np.abs(
+            (x[anchor] - next_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (next_y - y[anchor])
+        )
+        anchor = start + int(area.argmax())
+        selected[i + 1] = anchor
+
+    return selected
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, max_points=DEFAULT_MAX_POINTS,
+                       method="lttb") -> np.ndarray:
+    """
+    Positions of at most max_points points, ordered by x, that preserve the
+    shape of y over x. method is "lttb", "minmax" or None (keep every point).
+    """
+
+    if method is not None and method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"method must be one of {DOWNSAMPLE_METHODS} or None")
+
+    if method is None or len(x) <= max_points:
+        return np.argsort(x, kind="stable")
+
+    if method == "minmax":
+        return minmax_indices(x, y, max(max_points // 2, 1))
+
+    if len(x) > max_points * PRESELECT_RATIO:
+        candidates = minmax_indices(x, y, max_points * PRESELECT_RATIO // 2)
+    else:
+        candidates = np.argsort(x, kind="stable")
+
+    return candidates[lttb_indices(x[candidates], y[candidates], max_points)]
+
+
+def resample_series(x: pd.Series, y: pd.Series, freq: str, how="mean"):
+    """
+    Aggregate y into fixed time buckets of x (e.g. freq="1h").
+    Returns (bucket starts, aggregated values) with empty buckets dropped.
+    """
+
+    aggregated = y.groupby(x.dt.floor(freq)).agg(how).dropna()
+    return pd.Series(aggregated.index), aggregated.reset_index(drop=True)
@@ -1,15 +1,25 @@
-from plotly.io import to_html
+'''
+Standalone HTML dashboard export.
+Figures can be serialized in a process pool and the page is streamed out
+part by part; the output is byte-identical for any number of workers.
+The compact format stores all chart data once in a shared compressed
+payload and draws each chart when it scrolls into view.
+'''
+import base64
+import hashlib
+import json
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
 
+import plotly.graph_objects as go
+from plotly.io import to_html, to_json
+from plotly.offline import get_plotlyjs_version
 
-def export_dashboard_html(figures: dict) -> str:
-    """
-    Export multiple Plotly figures into a styled, standalone HTML dashboard.
-    """
+from jobs.runner import resolve_workers
 
-    html_parts = []
 
-    # ---------- HTML HEADER ----------
-    html_parts.append("""
+PAGE_HEADER = """
     <html>
     <head>
         <title>Data Visualization Dashboard</title>
@@ -62,40 +72,255 @@ def export_dashboard_html(figures: dict) -> str:
     <body>
         <h1>Automated Data Visualization Dashboard</h1>
         <div class="dashboard">
-    """)
-
-    # ---------- CHARTS ----------
-    first = True
-    for name, fig in figures.items():
-        fig.update_layout(
-            template="plotly_white",
-            colorway=[
-                "#1f77b4", "#ff7f0e", "#2ca02c",
-                "#d62728", "#9467bd", "#8c564b"
-            ],
-            margin=dict(t=60, b=40, l=40, r=40),
-        )
-
-        html_parts.append("<div class='chart-card'>")
-        html_parts.append(
-            to_html(
-                fig,
-                include_plotlyjs="cdn" if first else False,
-                full_html=False
-            )
-        )
-        html_parts.append("</div>")
-
-        first = False
+    """
 
-    # ---------- FOOTER ----------
-    html_parts.append("""
+PAGE_FOOTER = """
         </div>
         <footer>
             Generated by Automated Data Analysis Tool By Vishank Tyagi
         </footer>
     </body>
     </html>
-    """)
+    """
+
+CHART_LAYOUT = dict(
+    template="plotly_white",
+    colorway=[
+        "#1f77b4", "#ff7f0e", "#2ca02c",
+        "#d62728", "#9467bd", "#8c564b"
+    ],
+    margin=dict(t=60, b=40, l=40, r=40),
+)
+
+
+def _chart_html(position, fig) -> str:
+    # Style a copy so shared figures are never mutated; a fixed div id
+    # keeps the output deterministic
+    fig = go.Figure(fig).update_layout(**CHART_LAYOUT)
+    return to_html(
+        fig,
+        include_plotlyjs="cdn" if position == 0 else False,
+        full_html=False,
+        div_id=f"chart-{position}",
+    )
+
+
+def _iter_charts(figures: dict, n_jobs=1):
+    charts = list(figures.values())
+    workers = min(resolve_workers(n_jobs), len(charts))
+
+    if workers <= 1:
+        yield from map(_chart_html, range(len(charts)), charts)
+        return
+
+    # pool.map yields in submission order, so the page streams out in order
+    chunksize = max(len(charts) // (workers * 4), 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_chart_html, range(len(charts)), charts, chunksize=chunksize)
+
+
+def iter_dashboard_html(figures: dict, n_jobs=1):
+    """
+    Yield the dashboard page in parts, one chart at a time.
+    With n_jobs > 1 (or -1 for all cores) charts are serialized in a process pool.
+    """
+
+    yield PAGE_HEADER
+
+    for chart in _iter_charts(figures, n_jobs):
+        yield "\n<div class='chart-card'>\n"
+        yield chart
+        yield "\n</div>"
+
+    yield "\n" + PAGE_FOOTER
+
+
+def write_dashboard_html(figures: dict, fh, n_jobs=1):
+    """
+    Stream the dashboard into a text file-like object without building
+    the whole page in memory.
+    """
+
+    for part in iter_dashboard_html(figures, n_jobs=n_jobs):
+        fh.write(part)
+
+
+def export_dashboard_html(figures: dict, n_jobs=1) -> str:
+    """
+    Export multiple Plotly figures into a styled, standalone HTML dashboard.
+    """
+
+    return "".join(iter_dashboard_html(figures, n_jobs=n_jobs))
+
+
+# ---------- COMPACT FORMAT ----------
+
+COMPACT_CHART_HEIGHT = 450
+
+# Decompresses the shared payload once, then draws each chart on first view.
+# Arrays are referenced as {"$ref": n} and become typed-array views on the
+# decompressed buffer, so duplicated columns are stored and decoded once.
+COMPACT_SCRIPT = """
+<script>
+(async function () {
+    const encoded = document.getElementById("dashboard-payload").textContent.trim();
+    const bytes = Uint8Array.from(atob(encoded), c => c.charCodeAt(0));
+    const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("deflate"));
+    const buffer = await new Response(stream).arrayBuffer();
+
+    const headerLength = new DataView(buffer).getUint32(0, true);
+    const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, headerLength)));
+    const dataStart = 8 + Math.ceil(headerLength / 8) * 8;
+    const types = {
+        f8: Float64Array, f4: Float32Array, i1: Int8Array, u1: Uint8Array,
+        i2: Int16Array, u2: Uint16Array, i4: Int32Array, u4: Uint32Array
+    };
+
+    function array(ref) {
+        const spec = header.arrays[ref];
+        const values = new types[spec.dtype](buffer, dataStart + spec.offset, spec.length);
+        if (!spec.shape) return values;
+        const columns = spec.shape[spec.shape.length - 1];
+        return Array.from({length: spec.length / columns},
+                          (_, row) => values.subarray(row * columns, (row + 1) * columns));
+    }
+
+    function resolve(node) {
+        if (Array.isArray(node)) return node.map(resolve);
+        if (node === null || typeof node !== "object") return node;
+        if ("$ref" in node) return array(node["$ref"]);
+        const out = {};
+        for (const key in node) out[key] = resolve(node[key]);
+        return out;
+    }
+
+    const observer = new IntersectionObserver(entries => {
+        for (const entry of entries) {
+            if (!entry.isIntersecting) continue;
+            observer.unobserve(entry.target);
+            const chart = header.charts[Number(entry.target.dataset.index)];
+            const layout = resolve(chart.layout);
+            layout.template = header.templates[chart.template];
+            Plotly.newPlot(entry.target, resolve(chart.data), layout, {responsive: true});
+        }
+    }, {rootMargin: "300px"});
+
+    document.querySelectorAll(".lazy-chart").forEach(el => observer.observe(el));
+})();
+</script>
+"""
+
+
+class _ArrayTable:
+    """
+    Deduplicating store of typed-array buffers for the compact payload.
+    """
+
+    def __init__(self):
+        self.specs = []
+        self.buffers = []
+        self.size = 0
+        self._refs = {}
+
+    def add(self, node: dict) -> dict:
+        data = base64.b64decode(node["bdata"])
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        key = (node["dtype"], node.get("shape"), digest)
+
+        if key not in self._refs:
+            spec = {"dtype": node["dtype"], "offset": self.size,
+                    "length": len(data) // int(node["dtype"][1:])}
+            if "shape" in node:
+                spec["shape"] = [int(n) for n in node["shape"].split(",")]
+
+            # 8-byte alignment so every typed array can view the buffer directly
+            padding = -len(data) % 8
+            self.buffers.append(data + b"\0" * padding)
+            self.size += len(data) + padding
+
+            self._refs[key] = len(self.specs)
+            self.specs.append(spec)
+
+        return {"$ref": self._refs[key]}
+
+    def replace(self, node):
+        # Swap every plotly typed-array spec in a figure JSON tree for a reference
+        if isinstance(node, list):
+            return [self.replace(item) for item in node]
+        if isinstance(node, dict):
+            if "bdata" in node and "dtype" in node:
+                return self.add(node)
+            return {key: self.replace(value) for key, value in node.items()}
+        return node
+
+
+def compact_payload(figures: dict) -> bytes:
+    """
+    Pack styled figures into one zlib-compressed payload: a JSON header of
+    charts, shared layout templates and array specs, followed by the
+    deduplicated, 8-byte aligned array buffers.
+    """
+
+    arrays = _ArrayTable()
+    templates, template_ids, charts = [], {}, []
+
+    for fig in figures.values():
+        fig = go.Figure(fig).update_layout(**CHART_LAYOUT)
+        spec = json.loads(to_json(fig, validate=False))
+        layout = spec.get("layout", {})
+
+        template = json.dumps(layout.pop("template", {}), sort_keys=True)
+        if template not in template_ids:
+            template_ids[template] = len(templates)
+            templates.append(json.loads(template))
+
+        charts.append({
+            "data": arrays.replace(spec.get("data", [])),
+            "layout": arrays.replace(layout),
+            "template": template_ids[template],
+        })
+
+    header = {"charts": charts, "templates": templates, "arrays": arrays.specs}
+    header_bytes = json.dumps(header, separators=(",", ":")).encode("utf-8")
+
+    # Layout: header length, 4 spare bytes, header padded to 8 bytes, buffers
+    raw = b"".join([
+        struct.pack("<II", len(header_bytes), 0),
+        header_bytes,
+        b" " * (-len(header_bytes) % 8),
+        *arrays.buffers,
+    ])
+    return zlib.compress(raw, 9)
+
+
+def iter_dashboard_compact(figures: dict):
+    """
+    Yield the compact dashboard page: empty chart cards, the shared
+    payload and the hydration script.
+    """
+
+    yield PAGE_HEADER
+
+    for position in range(len(figures)):
+        yield (
+            f"\n<div class='chart-card'><div id='chart-{position}' class='lazy-chart' "
+            f"data-index='{position}' style='height:{COMPACT_CHART_HEIGHT}px'></div></div>"
+        )
+
+    yield (
+        f'\n<script charset="utf-8" src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js">'
+        "</script>\n"
+        '<script type="application/octet-stream" id="dashboard-payload">'
+    )
+    yield base64.b64encode(compact_payload(figures)).decode("ascii")
+    yield "</script>"
+    yield COMPACT_SCRIPT
+    yield "\n" + PAGE_FOOTER
+
+
+def export_dashboard_compact(figures: dict) -> str:
+    """
+    Export figures as a compact dashboard whose charts load on scroll.
+    """
 
-    return "\n".join(html_parts)
+    return "".join(iter_dashboard_compact(figures))
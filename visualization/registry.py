@@ -0,0 +1,54 @@
+'''
+Lazy, memoized figure registry.
+The dashboard lists figure specs up front and asks the registry for a figure
+only when its panel is opened or exported. Built figures are cached per
+(dataset key, column, chart type, options) with least-recently-used eviction,
+so reruns and other sessions on the same dataset reuse them.
+'''
+import threading
+from collections import OrderedDict
+
+from visualization.visual_assets import build_figure
+
+
+class FigureRegistry:
+    """
+    LRU cache of built figures shared across sessions.
+    Returned figures are shared; callers must not mutate them.
+    """
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+    def get(self, dataset_key, df, spec):
+        key = (dataset_key, spec.column, spec.kind, spec.options)
+
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                return self._figures[key]
+
+        # Build outside the lock so one slow figure does not block other panels
+        figure = build_figure(df, spec)
+
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+
+        return figure
+
+    def discard_dataset(self, dataset_key):
+        with self._lock:
+            for key in [k for k in self._figures if k[0] == dataset_key]:
+                del self._figures[key]
+
+    def clear(self):
+        with self._lock:
+            self._figures.clear()
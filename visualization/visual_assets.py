@@ -1,42 +1,222 @@
+from dataclasses import dataclass
+
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import pandas as pd
 
+from profiling.correlation import correlation_matrix, focus_block
+from visualization.downsampling import DEFAULT_MAX_POINTS, downsample_indices, resample_series
+
+
+# Upper bound on histogram bins so outliers cannot blow up Freedman–Diaconis
+MAX_HISTOGRAM_BINS = 200
+DEFAULT_HISTOGRAM_BINS = 30
+
+# Heatmaps show at most this many columns; cell labels only on small ones
+MAX_HEATMAP_COLUMNS = 25
+MAX_LABELLED_COLUMNS = 12
+
+
+def histogram_bins(values: np.ndarray, bins="fd"):
+    """
+    Vectorized histogram of finite values. Returns (counts, edges).
+
+    bins is "fd" for the Freedman–Diaconis rule or a fixed bin count.
+    Falls back to DEFAULT_HISTOGRAM_BINS when the interquartile range is zero.
+    """
+
+    if bins == "fd":
+        q25, q75 = np.percentile(values, [25, 75])
+        span = values.max() - values.min()
+        width = 2 * (q75 - q25) / np.cbrt(len(values))
+        bins = int(np.ceil(span / width)) if width > 0 else DEFAULT_HISTOGRAM_BINS
+        bins = min(max(bins, 1), MAX_HISTOGRAM_BINS)
+
+    return np.histogram(values, bins=bins)
+
+
+def histogram_figure(series: pd.Series, title: str, bins="fd") -> go.Figure:
+    """
+    Histogram built from pre-aggregated counts, so the figure holds one
+    bar per bin instead of every raw value.
+    """
+
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    values = values[np.isfinite(values)]
+
+    fig = go.Figure()
+    if len(values):
+        counts, edges = histogram_bins(values, bins)
+        fig.add_bar(
+            x=(edges[:-1] + edges[1:]) / 2,
+            y=counts,
+            width=np.diff(edges),
+            customdata=np.column_stack([edges[:-1], edges[1:]]),
+            hovertemplate="%{customdata[0]:.4g} – %{customdata[1]:.4g}<br>count=%{y}<extra></extra>",
+        )
+
+    fig.update_layout(title=title, bargap=0, xaxis_title=series.name, yaxis_title="count")
+    return fig
+
+
+def timeseries_figure(x: pd.Series, y, title: str, max_points=DEFAULT_MAX_POINTS,
+                      downsample="lttb", resample=None) -> go.Figure:
+    """
+    Line chart of y over the datetime series x with at most max_points points.
+
+    resample (e.g. "1h") first aggregates y into time buckets; downsample is
+    "lttb", "minmax" or None. Without a y column, rows per timestamp are plotted.
+    """
+
+    if y is None:
+        x = x.dropna()
+        y = pd.Series(1, index=x.index, name="rows")
+        how = "count"
+    else:
+        mask = x.notna() & y.notna()
+        x, y = x[mask], y[mask]
+        how = "mean"
+
+    if resample is not None:
+        x, y = resample_series(x, y, resample, how=how)
+    elif how == "count":
+        counts = x.value_counts(sort=False)
+        x, y = pd.Series(counts.index), pd.Series(counts.to_numpy(), name="rows")
+
+    fig = go.Figure()
+    if len(x):
+        positions = downsample_indices(
+            pd.DatetimeIndex(x).asi8, y.to_numpy(dtype="float64"),
+            max_points=max_points, method=downsample,
+        )
+        fig.add_scatter(x=x.iloc[positions], y=y.iloc[positions], mode="lines")
+
+    fig.update_layout(title=title, xaxis_title=x.name, yaxis_title=y.name)
+    return fig
+
 
-def generate_visualizations(df: pd.DataFrame) -> dict:
-    figures = {}
+def heatmap_figure(numeric: pd.DataFrame, title: str, method="pearson",
+                   sample_rows=200_000) -> go.Figure:
+    """
+    Correlation heatmap computed on a row sample and limited to the most
+    strongly correlated block of columns.
+    """
+
+    corr = correlation_matrix(numeric, method=method, sample_rows=sample_rows)
+    block = focus_block(corr, max_columns=MAX_HEATMAP_COLUMNS)
+    if len(block) < len(corr):
+        title += f" (strongest {len(block)} of {len(corr)} columns)"
+    return px.imshow(
+        block.round(2),
+        text_auto=len(block) <= MAX_LABELLED_COLUMNS,
+        zmin=-1, zmax=1, color_continuous_scale="RdBu_r",
+        title=title,
+    )
+
+
+@dataclass(frozen=True)
+class FigureSpec:
+    """
+    Description of one dashboard figure. Specs are cheap to enumerate;
+    the figure itself is only built by build_figure.
+    """
+
+    kind: str
+    column: object
+    title: str
+    options: tuple = ()
+
+    @property
+    def key(self) -> str:
+        if self.kind == "correlation":
+            return "correlation"
+        return f"{self.kind}_{self.column}"
+
+
+def figure_specs(df: pd.DataFrame, preaggregate=True, bins="fd",
+                 max_points=DEFAULT_MAX_POINTS, downsample="lttb",
+                 resample=None, correlation_method="pearson",
+                 correlation_sample_rows=200_000) -> list:
+    """
+    Enumerate the dashboard figures for df from its dtypes alone.
+
+    With preaggregate=True numeric distributions are binned in NumPy and
+    drawn as bar traces, so figure size scales with bins rather than rows.
+    Time series are capped at max_points points per trace (see timeseries_figure).
+    The correlation heatmap is computed on a row sample and limited to the
+    most strongly correlated block of columns.
+    """
+
+    specs = []
 
     numeric_cols = df.select_dtypes(include="number").columns
-    categorical_cols = df.select_dtypes(include="object").columns
+    categorical_cols = df.select_dtypes(include=["object", "string", "category"]).columns
     datetime_cols = df.select_dtypes(include="datetime").columns
 
     # Numeric distributions
     for col in numeric_cols:
-        figures[f"dist_{col}"] = px.histogram(
-            df, x=col, title=f"Distribution of {col}"
-        )
+        specs.append(FigureSpec(
+            "dist", col, f"Distribution of {col}",
+            (("bins", bins), ("preaggregate", preaggregate)),
+        ))
 
     # Categorical frequencies
     for col in categorical_cols:
-        figures[f"count_{col}"] = px.bar(
-            df[col].value_counts().head(20),
-            title=f"Top Categories in {col}",
-        )
+        specs.append(FigureSpec("count", col, f"Top Categories in {col}"))
 
     # Correlation heatmap
     if len(numeric_cols) > 1:
-        corr = df[numeric_cols].corr()
-        figures["correlation"] = px.imshow(
-            corr, text_auto=True, title="Correlation Heatmap"
-        )
+        specs.append(FigureSpec(
+            "correlation", None, "Correlation Heatmap",
+            (("method", correlation_method), ("sample_rows", correlation_sample_rows)),
+        ))
 
     # Time series
     for col in datetime_cols:
-        figures[f"time_{col}"] = px.line(
-            df.sort_values(col),
-            x=col,
-            y=numeric_cols[0] if len(numeric_cols) else None,
-            title=f"Trend over {col}",
+        specs.append(FigureSpec(
+            "time", col, f"Trend over {col}",
+            (
+                ("y", numeric_cols[0] if len(numeric_cols) else None),
+                ("max_points", max_points),
+                ("downsample", downsample),
+                ("resample", resample),
+            ),
+        ))
+
+    return specs
+
+
+def build_figure(df: pd.DataFrame, spec: FigureSpec) -> go.Figure:
+    options = dict(spec.options)
+
+    if spec.kind == "dist":
+        if options["preaggregate"]:
+            return histogram_figure(df[spec.column], title=spec.title, bins=options["bins"])
+        return px.histogram(df, x=spec.column, title=spec.title)
+
+    if spec.kind == "count":
+        return px.bar(df[spec.column].value_counts().head(20), title=spec.title)
+
+    if spec.kind == "correlation":
+        return heatmap_figure(
+            df.select_dtypes(include="number"), title=spec.title,
+            method=options["method"], sample_rows=options["sample_rows"],
         )
 
-    return figures
+    if spec.kind == "time":
+        y = options.pop("y")
+        return timeseries_figure(
+            df[spec.column], df[y] if y is not None else None, title=spec.title, **options
+        )
+
+    raise ValueError(f"Unknown figure kind: {spec.kind}")
+
+
+def generate_visualizations(df: pd.DataFrame, **options) -> dict:
+    """
+    Build every dashboard figure eagerly, keyed by spec key.
+    options are passed to figure_specs.
+    """
+
+    return {spec.key: build_figure(df, spec) for spec in figure_specs(df, **options)}